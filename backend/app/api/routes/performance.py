@@ -69,14 +69,17 @@ async def analyze_performance(
             CProfileParser(tmp_path) if suffix == ".prof" else PySpyParser(tmp_path)
         )
 
+        module_performance = parser.parse()
+
         request = AnalyzePerformanceRequest(graph=graph, weights=weights)
         analyzer = PerformanceAnalyzer(
-            module_performance=parser.parse(),
+            module_performance=module_performance,
             dependency_graph=request.graph,
             profiler_type=parser.get_profiler_type(),
             total_execution_time=parser.get_total_execution_time(),
             total_samples=parser.get_total_samples(),
             weights=request.weights,
+            significant_modules=parser.significant_modules,
         )
 
         return analyzer.analyze()
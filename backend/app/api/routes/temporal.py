@@ -1,5 +1,3 @@
-import json
-
 from fastapi import APIRouter, Request
 from sse_starlette.sse import EventSourceResponse
 
@@ -10,7 +8,7 @@ from app.core.models import (
     TemporalAnalysisResponse,
 )
 from app.middleware.error_handler import stream_with_error_handling
-from app.services import TemporalOrchestratorService
+from app.services import TemporalOrchestratorService, build_sse_frame
 
 router = APIRouter()
 temporal_orchestrator = TemporalOrchestratorService()
@@ -34,13 +32,10 @@ async def start_temporal_analysis(
         Server-Sent Events stream with progress updates
     """
 
-    async def temporal_error_event(error: ErrorResponse) -> dict:
-        return {
-            "event": "message",
-            "data": json.dumps(
-                {"type": "error", "error": error.model_dump(exclude_none=True)}
-            ),
-        }
+    def temporal_error_event(error: ErrorResponse) -> bytes:
+        return build_sse_frame(
+            {"type": "error", "error": error.model_dump(exclude_none=True)}
+        )
 
     async def generate():
         async for event in stream_with_error_handling(
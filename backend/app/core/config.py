@@ -47,5 +47,10 @@ class Settings(BaseSettings):
     # HTTP client settings
     http_timeout_seconds: int = 30
 
+    # Parse cache (optional - persists tree-sitter extraction and parsed
+    # cProfile dumps across runs)
+    parse_cache_dir: str | None = None
+    profile_cache_max_entries: int = 256
+
 
 settings = Settings()
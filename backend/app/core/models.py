@@ -694,7 +694,12 @@ class SaveResultResponse(BaseModel):
 
 
 class TemporalGraphNode(BaseModel):
-    """Node snapshot for temporal graph visualization."""
+    """Node snapshot for temporal graph visualization.
+
+    Frozen: unchanged nodes are shared between consecutive snapshots.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     id: str
     type: Literal["internal", "third_party"]
@@ -705,11 +710,16 @@ class TemporalGraphNode(BaseModel):
 
 
 class TemporalGraphEdge(BaseModel):
-    """Edge snapshot for temporal graph visualization."""
+    """Edge snapshot for temporal graph visualization.
+
+    Frozen: unchanged edges are shared between consecutive snapshots.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     source: str
     target: str
-    imports: list[str]
+    imports: tuple[str, ...]
     weight: int
 
 
@@ -1011,6 +1021,8 @@ ImportType = Literal["internal", "third_party", "stdlib"]
 # Performance Profiling Models
 # ============================================================================
 
+PerformanceSeverity = Literal["critical", "high", "medium", "low", "normal"]
+
 
 class FunctionProfile(BaseModel):
     """Performance profile for a single function."""
@@ -1086,8 +1098,8 @@ class ModulePerformance(BaseModel):
     is_io_bottleneck: bool = Field(
         default=False, description="Identified as I/O bottleneck"
     )
-    performance_severity: Literal["critical", "high", "medium", "low", "normal"] = (
-        Field(default="normal", description="Performance issue severity")
+    performance_severity: PerformanceSeverity = Field(
+        default="normal", description="Performance issue severity"
     )
 
 
@@ -1,5 +1,5 @@
 import logging
-from collections.abc import AsyncIterator, Awaitable, Callable
+from collections.abc import AsyncIterator, Callable
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
@@ -161,14 +161,14 @@ async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONR
     )
 
 
-ErrorEventFactory = Callable[[ErrorResponse], Awaitable[str | dict]]
+ErrorEventFactory = Callable[[ErrorResponse], str | bytes | dict]
 
 
 async def stream_with_error_handling(
-    stream: AsyncIterator[str | dict],
+    stream: AsyncIterator[str | bytes | dict],
     on_error: ErrorEventFactory,
     path: str | None = None,
-) -> AsyncIterator[str | dict]:
+) -> AsyncIterator[str | bytes | dict]:
     """Wrap SSE generators to emit unified errors on failure."""
     try:
         async for event in stream:
@@ -181,7 +181,7 @@ async def stream_with_error_handling(
             details=exc.details,
             path=path,
         )
-        yield await on_error(payload)
+        yield on_error(payload)
     except ValidationError as exc:
         errors = list(exc.errors())
         normalized_errors: list[dict[str, object]] = [dict(error) for error in errors]
@@ -193,7 +193,7 @@ async def stream_with_error_handling(
             details=normalized_errors,
             path=path,
         )
-        yield await on_error(payload)
+        yield on_error(payload)
     except Exception:
         payload = _build_error_payload(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -201,4 +201,4 @@ async def stream_with_error_handling(
             message="An unexpected error occurred",
             path=path,
         )
-        yield await on_error(payload)
+        yield on_error(payload)
@@ -3,6 +3,7 @@ from app.core.models import DependencyAnalysis
 
 # Level 1: Infrastructure services (no internal service dependencies)
 from app.services.infrastructure import (
+    build_sse_frame,
     GitHubService,
     ProgressTracker,
     SessionService,
@@ -65,6 +66,7 @@ __all__ = [
     "apply_layout",
     "build_graph",
     "build_networkx_graph",
+    "build_sse_frame",
     "circular_layout_3d",
     "ClusteringService",
     "ComplexityService",
@@ -1,11 +1,10 @@
 from collections import defaultdict
-from pathlib import Path
 
 from app.core import get_logger
 from app.core.models import FileInput, Language
 from app.core.models import DependencyAnalysis, ModuleMetadata
 from app.services.analysis.complexity import ComplexityService
-from app.services.analysis.multi_language import analyze_files_multi_language
+from app.services.analysis.multi_language import MultiLanguageAnalyzer
 from app.services.parsers import ParserRegistry
 from app.utils.ast_parser import parse_file, filepath_to_module
 from app.utils.import_resolver import ImportResolver
@@ -15,7 +14,7 @@ logger = get_logger(__name__)
 
 def _has_multi_language_files(files: list[FileInput]) -> bool:
     for file in files:
-        parser = ParserRegistry.get_parser_for_file(Path(file.path))
+        parser = ParserRegistry.get_parser_for_file(file.path)
         if parser and parser.language != Language.PYTHON:
             return True
     return False
@@ -37,12 +36,19 @@ async def analyze_files(
     Returns:
         DependencyAnalysis with validated, type-safe data
     """
+    return analyze_files_sync(files, project_name)
+
+
+def analyze_files_sync(
+    files: list[FileInput], project_name: str = "project"
+) -> DependencyAnalysis:
+    """Blocking body of ``analyze_files``, for callers running in a worker thread."""
     if _has_multi_language_files(files):
         logger.info(
             "Multi-language files detected, using MultiLanguageAnalyzer for %d files",
             len(files),
         )
-        return await analyze_files_multi_language(files, project_name)
+        return MultiLanguageAnalyzer().analyze(files, project_name)
 
     logger.info(
         "Starting analysis of %d files for project '%s'", len(files), project_name
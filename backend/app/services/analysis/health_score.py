@@ -33,8 +33,8 @@ class HealthScoreService:
     def __init__(self, graph: nx.DiGraph, global_metrics: GlobalMetrics):
         self.graph = graph
         self.global_metrics = global_metrics
-        self.total_nodes = len(
-            [n for n in graph.nodes if graph.nodes[n].get("type") == "internal"]
+        self.total_nodes = sum(
+            1 for _, t in graph.nodes(data="type") if t == "internal"
         )
 
     def calculate_health_score(self) -> HealthScoreResponse:
@@ -115,12 +115,10 @@ class MetricsCalculator:
     def _calculate_global_metrics(self) -> GlobalMetrics:
         """Calculate global project metrics."""
         internal_nodes = [
-            n for n in self.graph.nodes if self.graph.nodes[n].get("type") == "internal"
+            n for n, t in self.graph.nodes(data="type") if t == "internal"
         ]
         third_party_nodes = [
-            n
-            for n in self.graph.nodes
-            if self.graph.nodes[n].get("type") == "third_party"
+            n for n, t in self.graph.nodes(data="type") if t == "third_party"
         ]
 
         # Calculate averages
@@ -104,7 +104,9 @@ class MultiLanguageAnalyzer:
         # Second pass: parse and analyze
         for language, lang_files in files_by_language.items():
             try:
-                parser = ParserRegistry.get_parser(language)
+                # A fresh instance per analysis: project modules and context
+                # below are per-project state
+                parser = ParserRegistry.create_parser(language)
             except ValueError as e:
                 logger.warning("No parser for %s: %s", language, e)
                 continue
@@ -125,28 +127,20 @@ class MultiLanguageAnalyzer:
                 )
             )
 
-            for file in lang_files:
+            # Only the module nodes' imports feed the dependency graph
+            module_nodes = parser.parse_modules(
+                [(Path(file.path), file.content) for file in lang_files],
+                return_exceptions=True,
+            )
+            for file, module_node in zip(lang_files, module_nodes):
                 module_id = self._file_to_module_id(file.path, language)
 
-                try:
-                    nodes = parser.parse_file(Path(file.path), file.content)
-                except Exception as e:
-                    error_msg = f"Parse error in {file.path}: {e}"
+                if isinstance(module_node, Exception):
+                    error_msg = f"Parse error in {file.path}: {module_node}"
                     logger.error(error_msg)
                     all_errors.append(error_msg)
                     continue
 
-                module_node = next(
-                    (
-                        n
-                        for n in nodes
-                        if n.id == module_id or n.name == Path(file.path).stem
-                    ),
-                    None,
-                )
-                if not module_node:
-                    continue
-
                 import_infos = []
                 for parsed_import in module_node.imports:
                     import_infos.append(
@@ -336,7 +330,7 @@ class MultiLanguageAnalyzer:
         result: dict[Language, list[FileInput]] = defaultdict(list)
 
         for file in files:
-            parser = ParserRegistry.get_parser_for_file(Path(file.path))
+            parser = ParserRegistry.get_parser_for_file(file.path)
             if not parser:
                 continue
             result[parser.language].append(file)
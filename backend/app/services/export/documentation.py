@@ -95,15 +95,13 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             node_data = self.graph.nodes[node_id]
             metrics = node_data.get("metrics", {})
 
-            imports = list(self.graph.successors(node_id))
-            imported_by = list(self.graph.predecessors(node_id))
+            imports = len(self.graph.succ[node_id])
+            imported_by = len(self.graph.pred[node_id])
             coupling = metrics.get("afferent_coupling", 0) + metrics.get(
                 "efferent_coupling", 0
             )
 
-            lines.append(
-                f"| `{node_id}` | {len(imports)} | {len(imported_by)} | {coupling} |"
-            )
+            lines.append(f"| `{node_id}` | {imports} | {imported_by} | {coupling} |")
 
         return "\n".join(lines)
 
@@ -192,9 +190,8 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             for node_id in sorted(circular_nodes):
                 lines.append(f"- `{node_id}`")
                 # Show immediate circular dependencies
-                successors = list(self.graph.successors(node_id))
-                for successor in successors:
-                    if self.graph.has_edge(successor, node_id):
+                for successor in self.graph.succ[node_id]:
+                    if node_id in self.graph.succ[successor]:
                         lines.append(f"  - `{successor}` (mutual dependency)")
         else:
             lines.append("[OK] No circular dependencies detected.")
@@ -205,19 +202,16 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         """Generate third-party library usage audit."""
         lines = ["## Third-Party Library Usage", ""]
 
-        third_party_nodes = [
-            node_id
-            for node_id in self.graph.nodes
-            if self.graph.nodes[node_id].get("type") == "third_party"
-        ]
+        node_types = dict(self.graph.nodes(data="type"))
+        third_party_nodes = [n for n, t in node_types.items() if t == "third_party"]
 
         if third_party_nodes:
             # Count usage of each library
             library_usage = defaultdict(list)
-            for node_id in self.graph.nodes:
-                if self.graph.nodes[node_id].get("type") == "internal":
-                    for successor in self.graph.successors(node_id):
-                        if successor in third_party_nodes:
+            for node_id, node_type in node_types.items():
+                if node_type == "internal":
+                    for successor in self.graph.succ[node_id]:
+                        if node_types[successor] == "third_party":
                             library_usage[successor].append(node_id)
 
             lines.append(f"Total Third-Party Libraries: {len(third_party_nodes)}")
@@ -1,5 +1,10 @@
+import sys
 import networkx as nx
-from collections import defaultdict
+import numpy as np
+from collections import Counter
+from collections.abc import Iterator
+from itertools import chain, islice
+from operator import attrgetter
 
 from app.core import get_logger
 from app.core.models import (
@@ -10,6 +15,36 @@ from app.core.models import (
 
 logger = get_logger(__name__)
 
+# Circular dependencies are listed in full by the graph metrics; refactoring
+# suggestions only need a bounded sample of them
+_MAX_CYCLE_SUGGESTIONS = 50
+
+# Suggestions are listed most severe first, then by module name
+_SEVERITY_ORDER = ("critical", "warning", "info")
+_by_module = attrgetter("module")
+
+
+def _sort_suggestions(
+    suggestions: list[RefactoringSuggestion],
+) -> list[RefactoringSuggestion]:
+    """
+    Order suggestions by severity rank, then module name.
+
+    Severities form a small closed set, so suggestions are bucketed by
+    severity and each bucket is sorted with a C-level attrgetter key
+    instead of building a (rank, module) tuple per suggestion.
+    """
+    buckets: dict[str, list[RefactoringSuggestion]] = {
+        severity: [] for severity in _SEVERITY_ORDER
+    }
+    for suggestion in suggestions:
+        buckets.setdefault(suggestion.severity, []).append(suggestion)
+    return [
+        suggestion
+        for bucket in buckets.values()
+        for suggestion in sorted(bucket, key=_by_module)
+    ]
+
 
 class RefactoringService:
     """Analyzes code structure and suggests refactoring opportunities."""
@@ -22,39 +57,141 @@ class RefactoringService:
             graph: NetworkX directed graph with node attributes
         """
         self.graph = graph
+        self._suggestions: list[RefactoringSuggestion] | None = None
 
     def analyze_refactoring_opportunities(self) -> list[RefactoringSuggestion]:
         """
         Analyze the graph and generate refactoring suggestions.
 
+        The graph is not expected to change for the lifetime of the service,
+        so the analysis runs once and later calls (e.g. get_summary_stats)
+        reuse its result.
+
         Returns:
             List of refactoring suggestions with severity, pattern, and recommendations
         """
-        suggestions: list[RefactoringSuggestion] = []
+        if self._suggestions is not None:
+            return list(self._suggestions)
+
+        # Only analyze internal nodes, read from the graph once
+        self._build_node_index()
+
+        # Detect various anti-patterns. The detectors are pure-Python loops over
+        # the node index, so under the GIL a thread pool only takes turns, and a
+        # process pool would pickle the whole graph per task; they run serially
+        detectors = (
+            self._detect_god_objects,
+            self._detect_feature_envy,
+            self._detect_inappropriate_intimacy,
+            self._detect_unused_modules,
+            self._detect_hub_modules,
+            self._suggest_circular_dependency_fixes,
+            self._detect_unstable_dependencies,
+        )
+        suggestions = list(chain.from_iterable(detect() for detect in detectors))
+
+        # Sort by severity
+        suggestions = _sort_suggestions(suggestions)
+
+        self._suggestions = suggestions
+        return list(suggestions)
+
+    def _build_node_index(self) -> None:
+        """
+        Materialize what the detectors read about internal nodes in one pass.
+
+        The whole graph is laid out once as CSR arrays over node positions:
+        successors of position ``p`` are ``self._indices[self._indptr[p]:
+        self._indptr[p + 1]]``, and ``self._node_code`` holds each node's
+        module as an integer code (-1 for none). Degrees fall out of the
+        CSR directly: out-degree is the row length, in-degree a bincount.
+
+        Row ``i`` of each array/list below describes ``self._internal[i]``
+        (graph position ``self._rows[i]``): its afferent and efferent
+        coupling, successors and instability I = efferent / (afferent +
+        efferent). Detectors pick rows with vectorized threshold masks
+        instead of re-querying NetworkX. ``self._metrics`` holds the row
+        values as Python numbers, and ``self._node_module`` flattens every
+        node's module attribute.
+        """
+        # One pass over the node data: order, module and internal rows
+        nodes: list[str] = []
+        self._node_module: dict[str, str] = {}
+        self._internal: list[str] = []
+        for node, data in self.graph.nodes(data=True):
+            nodes.append(node)
+            # Interned so the per-module sets and code lookups compare by identity
+            module = data.get("module")
+            self._node_module[node] = sys.intern(module) if module else ""
+            if data.get("type") == "internal":
+                self._internal.append(node)
+        position = {node: p for p, node in enumerate(nodes)}
+        self._nodes = nodes
+        self._internal_set = frozenset(self._internal)
+
+        # Adjacency as CSR; edges() yields each node's successors in node order
+        out_degree = np.fromiter(
+            (d for _, d in self.graph.out_degree()), dtype=np.int64, count=len(nodes)
+        )
+        self._indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(out_degree, out=self._indptr[1:])
+        self._indices = np.fromiter(
+            (position[v] for _, v in self.graph.edges()),
+            dtype=np.int64,
+            count=int(self._indptr[-1]),
+        )
+        in_degree = np.bincount(self._indices, minlength=len(nodes))
+
+        module_codes: dict[str, int] = {}
+        self._node_code = np.fromiter(
+            (
+                module_codes.setdefault(module, len(module_codes)) if module else -1
+                for module in map(self._node_module.__getitem__, nodes)
+            ),
+            dtype=np.int64,
+            count=len(nodes),
+        )
+        self._module_names = list(module_codes)
 
-        # Only analyze internal nodes
-        internal_nodes = [
-            n for n in self.graph.nodes if self.graph.nodes[n].get("type") == "internal"
+        count = len(self._internal)
+        self._rows = np.fromiter(
+            map(position.__getitem__, self._internal), dtype=np.int64, count=count
+        )
+        self._aff = in_degree[self._rows]
+        self._eff = out_degree[self._rows]
+
+        successor_names = list(map(nodes.__getitem__, self._indices.tolist()))
+        self._succ = [
+            successor_names[start:end]
+            for start, end in zip(
+                self._indptr[self._rows].tolist(), self._indptr[self._rows + 1].tolist()
+            )
         ]
 
-        # Detect various anti-patterns
-        suggestions.extend(self._detect_god_objects(internal_nodes))
-        suggestions.extend(self._detect_feature_envy(internal_nodes))
-        suggestions.extend(self._detect_inappropriate_intimacy(internal_nodes))
-        suggestions.extend(self._detect_unused_modules(internal_nodes))
-        suggestions.extend(self._detect_hub_modules(internal_nodes))
-        suggestions.extend(self._suggest_circular_dependency_fixes())
-        suggestions.extend(self._detect_unstable_dependencies(internal_nodes))
+        total = self._aff + self._eff
+        self._inst = np.divide(
+            self._eff, total, out=np.zeros(count, dtype=np.float64), where=total > 0
+        )
+        # Per-row (afferent, efferent, instability) as plain Python numbers,
+        # shared by every detector that reports them
+        self._metrics = list(
+            zip(self._aff.tolist(), self._eff.tolist(), self._inst.tolist())
+        )
 
-        # Sort by severity
-        severity_order = {"critical": 0, "warning": 1, "info": 2}
-        suggestions.sort(key=lambda x: (severity_order.get(x.severity, 3), x.module))
+    def _candidate_edges(self, candidates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the CSR slices of the given internal rows into flat arrays.
 
-        return suggestions
+        Returns the owning row and the target position of every outgoing edge
+        of ``candidates``, row by row in adjacency order.
+        """
+        lengths = self._eff[candidates]
+        starts = self._indptr[self._rows[candidates]]
+        offsets = np.cumsum(lengths) - lengths
+        edges = np.arange(int(lengths.sum())) + np.repeat(starts - offsets, lengths)
+        return np.repeat(candidates, lengths), self._indices[edges]
 
-    def _detect_god_objects(
-        self, internal_nodes: list[str]
-    ) -> list[RefactoringSuggestion]:
+    def _detect_god_objects(self) -> Iterator[RefactoringSuggestion]:
         """
         Detect God Objects - modules with excessive dependencies.
 
@@ -62,421 +199,396 @@ class RefactoringService:
         - Very high efferent coupling (many outgoing dependencies)
         - Likely violates Single Responsibility Principle
         """
-        suggestions: list[RefactoringSuggestion] = []
-
-        for node in internal_nodes:
-            efferent = self.graph.out_degree(node)
-
-            # Threshold for God Object: 15+ dependencies
-            if efferent >= 15:
-                afferent = self.graph.in_degree(node)
-
-                # Get list of dependencies
-                dependencies = list(self.graph.successors(node))
-                dep_modules = set()
-                for dep in dependencies[:10]:  # Show first 10
-                    module = self.graph.nodes[dep].get("module", "")
-                    if module:
-                        dep_modules.add(module)
-
-                suggestions.append(
-                    RefactoringSuggestion(
-                        module=node,
-                        severity="critical" if efferent >= 25 else "warning",
-                        pattern="God Object",
-                        description=(
-                            f"Module has {efferent} dependencies, violating Single Responsibility Principle."
-                        ),
-                        metrics=RefactoringSuggestionMetrics(
-                            efferent_coupling=efferent,
-                            afferent_coupling=afferent,
-                            total_coupling=efferent + afferent,
-                        ),
-                        recommendation=(
-                            "Consider applying the Facade pattern or splitting into smaller, focused modules."
-                        ),
-                        details=(
-                            f"High efferent coupling ({efferent} dependencies) suggests this module is doing too much. "
-                            "Consider:\n"
-                            "1. Apply Facade Pattern - Create a simplified interface to group related dependencies\n"
-                            "2. Split Module - Extract distinct responsibilities into separate modules\n"
-                            "3. Dependency Injection - Use DI to reduce direct dependencies\n"
-                            f"Affected modules: {', '.join(list(dep_modules)[:5])}{'...' if len(dep_modules) > 5 else ''}"
-                        ),
-                        suggested_refactoring="Facade Pattern + Module Split",
-                    )
+        # Threshold for God Object: 15+ dependencies
+        for i in np.flatnonzero(self._eff >= 15).tolist():
+            node = self._internal[i]
+            afferent, efferent, _ = self._metrics[i]
+
+            # Modules of the first 10 dependencies, skipping unnamed ones
+            dep_modules = set(
+                filter(
+                    None, map(self._node_module.__getitem__, islice(self._succ[i], 10))
                 )
-
-        return suggestions
-
-    def _detect_feature_envy(
-        self, internal_nodes: list[str]
-    ) -> list[RefactoringSuggestion]:
+            )
+
+            yield RefactoringSuggestion(
+                module=node,
+                severity="critical" if efferent >= 25 else "warning",
+                pattern="God Object",
+                description=(
+                    f"Module has {efferent} dependencies, violating Single Responsibility Principle."
+                ),
+                metrics=RefactoringSuggestionMetrics(
+                    efferent_coupling=efferent,
+                    afferent_coupling=afferent,
+                    total_coupling=efferent + afferent,
+                ),
+                recommendation=(
+                    "Consider applying the Facade pattern or splitting into smaller, focused modules."
+                ),
+                details=(
+                    f"High efferent coupling ({efferent} dependencies) suggests this module is doing too much. "
+                    "Consider:\n"
+                    "1. Apply Facade Pattern - Create a simplified interface to group related dependencies\n"
+                    "2. Split Module - Extract distinct responsibilities into separate modules\n"
+                    "3. Dependency Injection - Use DI to reduce direct dependencies\n"
+                    f"Affected modules: {', '.join(islice(dep_modules, 5))}{'...' if len(dep_modules) > 5 else ''}"
+                ),
+                suggested_refactoring="Facade Pattern + Module Split",
+            )
+
+    def _detect_feature_envy(self) -> Iterator[RefactoringSuggestion]:
         """
         Detect Feature Envy - modules that heavily depend on a specific other module.
 
         Feature Envy occurs when a module uses another module's functionality
         more than its own, suggesting the code might belong in the other module.
         """
-        suggestions: list[RefactoringSuggestion] = []
-
-        for node in internal_nodes:
-            successors = list(self.graph.successors(node))
-            if len(successors) < 3:
-                continue
-
-            # Count dependencies per module
-            module_deps = defaultdict(int)
-            for dep in successors:
-                dep_module = self.graph.nodes[dep].get("module", "")
-                if dep_module:
-                    module_deps[dep_module] += 1
-
-            # Check if one module dominates (>50% of dependencies)
-            total_deps = len(successors)
-            for module, count in module_deps.items():
-                ratio = count / total_deps
-
-                if ratio >= 0.5 and count >= 5:
-                    suggestions.append(
-                        RefactoringSuggestion(
-                            module=node,
-                            severity="warning",
-                            pattern="Feature Envy",
-                            description=(
-                                f"Module heavily depends on '{module}' ({count}/{total_deps} dependencies, {ratio * 100:.1f}%)."
-                            ),
-                            metrics=RefactoringSuggestionMetrics(
-                                target_module=module,
-                                dependency_ratio=ratio,
-                                dependency_count=count,
-                                total_dependencies=total_deps,
-                            ),
-                            recommendation=(
-                                "Consider moving functionality to the target module or creating a new module."
-                            ),
-                            details=(
-                                f"This module uses '{module}' extensively. Consider:\n"
-                                f"1. Move Method - Relocate methods that primarily use '{module}' data\n"
-                                "2. Extract Class - Create a new class/module that bridges both\n"
-                                "3. Introduce Parameter Object - Encapsulate frequently passed data\n"
-                                f"Dependency ratio: {ratio * 100:.1f}% ({count} out of {total_deps} imports)"
-                            ),
-                            suggested_refactoring="Move Method / Extract Class",
-                        )
-                    )
-
-        return suggestions
-
-    def _detect_inappropriate_intimacy(
-        self, internal_nodes: list[str]
-    ) -> list[RefactoringSuggestion]:
+        modules = len(self._module_names)
+        if not modules:
+            return
+
+        # A dominating module needs 5+ dependencies, so smaller rows can't match
+        edge_rows, targets = self._candidate_edges(np.flatnonzero(self._eff >= 5))
+        edge_codes = self._node_code[targets]
+
+        # Count dependencies per (row, module); unnamed modules are skipped.
+        # return_index gives each pair's first edge, which restores
+        # row-major, first-seen order once the matches are sorted by it.
+        named = edge_codes >= 0
+        keys, first, counts = np.unique(
+            edge_rows[named] * modules + edge_codes[named],
+            return_index=True,
+            return_counts=True,
+        )
+        rows = keys // modules
+
+        # Check if one module dominates (>50% of dependencies)
+        hits = (counts >= 5) & (counts * 2 >= self._eff[rows])
+        order = np.argsort(first[hits], kind="stable")
+        for i, code, count in zip(
+            rows[hits][order].tolist(),
+            (keys % modules)[hits][order].tolist(),
+            counts[hits][order].tolist(),
+        ):
+            node = self._internal[i]
+            module = self._module_names[code]
+            total_deps = self._metrics[i][1]
+            ratio = count / total_deps
+
+            yield RefactoringSuggestion(
+                module=node,
+                severity="warning",
+                pattern="Feature Envy",
+                description=(
+                    f"Module heavily depends on '{module}' ({count}/{total_deps} dependencies, {ratio * 100:.1f}%)."
+                ),
+                metrics=RefactoringSuggestionMetrics(
+                    target_module=module,
+                    dependency_ratio=ratio,
+                    dependency_count=count,
+                    total_dependencies=total_deps,
+                ),
+                recommendation=(
+                    "Consider moving functionality to the target module or creating a new module."
+                ),
+                details=(
+                    f"This module uses '{module}' extensively. Consider:\n"
+                    f"1. Move Method - Relocate methods that primarily use '{module}' data\n"
+                    "2. Extract Class - Create a new class/module that bridges both\n"
+                    "3. Introduce Parameter Object - Encapsulate frequently passed data\n"
+                    f"Dependency ratio: {ratio * 100:.1f}% ({count} out of {total_deps} imports)"
+                ),
+                suggested_refactoring="Move Method / Extract Class",
+            )
+
+    def _detect_inappropriate_intimacy(self) -> Iterator[RefactoringSuggestion]:
         """
         Detect Inappropriate Intimacy - bidirectional dependencies between modules.
 
         This violates the Acyclic Dependencies Principle and creates tight coupling.
         """
-        suggestions: list[RefactoringSuggestion] = []
-        seen_pairs = set()
-
-        for node in internal_nodes:
-            for successor in self.graph.successors(node):
-                # Check if there's a back-edge
-                if self.graph.has_edge(successor, node):
-                    # Avoid duplicate suggestions
-                    pair = tuple(sorted([node, successor]))
-                    if pair in seen_pairs:
-                        continue
-                    seen_pairs.add(pair)
-
-                    # Get edge weights if available
-                    edge1_data = self.graph[node][successor]
-                    edge2_data = self.graph[successor][node]
-
-                    suggestions.append(
-                        RefactoringSuggestion(
-                            module=node,
-                            severity="critical",
-                            pattern="Inappropriate Intimacy",
-                            description=(
-                                f"Bidirectional dependency with '{successor}'."
-                            ),
-                            metrics=RefactoringSuggestionMetrics(
-                                coupled_module=successor,
-                                forward_imports=len(edge1_data.get("imports", [])),
-                                backward_imports=len(edge2_data.get("imports", [])),
-                            ),
-                            recommendation=(
-                                "Break the circular dependency by extracting a common interface or using Dependency Inversion."
-                            ),
-                            details=(
-                                f"Modules '{node}' and '{successor}' depend on each other, creating tight coupling. Consider:\n"
-                                "1. Extract Interface - Create a common interface that both can depend on\n"
-                                "2. Dependency Inversion - Introduce abstractions to break the cycle\n"
-                                "3. Merge Modules - If truly inseparable, consider merging\n"
-                                "4. Move Method - Relocate functionality to break the dependency\n"
-                                f"Forward imports: {len(edge1_data.get('imports', []))}, "
-                                f"Backward imports: {len(edge2_data.get('imports', []))}"
-                            ),
-                            suggested_refactoring="Extract Interface + Dependency Inversion",
-                        )
-                    )
-
-        return suggestions
-
-    def _detect_unused_modules(
-        self, internal_nodes: list[str]
-    ) -> list[RefactoringSuggestion]:
+        nodes = self._nodes
+        size = len(nodes)
+        internal = np.zeros(size, dtype=bool)
+        internal[self._rows] = True
+
+        # Every edge as (source, target) positions, in adjacency order
+        sources = np.repeat(np.arange(size), np.diff(self._indptr))
+        targets = self._indices
+
+        # An edge has a back-edge when its reversed key is also an edge key. A
+        # pair of internal modules is reported once, from whichever comes
+        # first in node order; third-party partners are always reported.
+        back = np.isin(targets * size + sources, sources * size + targets)
+        hits = np.flatnonzero(
+            back & internal[sources] & (~internal[targets] | (targets >= sources))
+        )
+
+        for source, target in zip(sources[hits].tolist(), targets[hits].tolist()):
+            node = nodes[source]
+            successor = nodes[target]
+            # Get edge weights if available
+            forward = len(self.graph.succ[node][successor].get("imports", ()))
+            backward = len(self.graph.pred[node][successor].get("imports", ()))
+
+            yield RefactoringSuggestion(
+                module=node,
+                severity="critical",
+                pattern="Inappropriate Intimacy",
+                description=(f"Bidirectional dependency with '{successor}'."),
+                metrics=RefactoringSuggestionMetrics(
+                    coupled_module=successor,
+                    forward_imports=forward,
+                    backward_imports=backward,
+                ),
+                recommendation=(
+                    "Break the circular dependency by extracting a common interface or using Dependency Inversion."
+                ),
+                details=(
+                    f"Modules '{node}' and '{successor}' depend on each other, creating tight coupling. Consider:\n"
+                    "1. Extract Interface - Create a common interface that both can depend on\n"
+                    "2. Dependency Inversion - Introduce abstractions to break the cycle\n"
+                    "3. Merge Modules - If truly inseparable, consider merging\n"
+                    "4. Move Method - Relocate functionality to break the dependency\n"
+                    f"Forward imports: {forward}, "
+                    f"Backward imports: {backward}"
+                ),
+                suggested_refactoring="Extract Interface + Dependency Inversion",
+            )
+
+    def _detect_unused_modules(self) -> Iterator[RefactoringSuggestion]:
         """
         Detect unused or dead code - internal modules with no incoming dependencies.
         """
-        suggestions: list[RefactoringSuggestion] = []
-
-        for node in internal_nodes:
-            in_degree = self.graph.in_degree(node)
-            out_degree = self.graph.out_degree(node)
-
-            # Module with no incoming dependencies might be dead code
-            # Exception: entry points (modules with no dependencies at all or high out_degree)
-            if in_degree == 0 and out_degree > 0:
-                suggestions.append(
-                    RefactoringSuggestion(
-                        module=node,
-                        severity="info",
-                        pattern="Potential Dead Code",
-                        description=(
-                            f"Module has no incoming dependencies but {out_degree} outgoing dependencies."
-                        ),
-                        metrics=RefactoringSuggestionMetrics(
-                            afferent_coupling=in_degree,
-                            efferent_coupling=out_degree,
-                        ),
-                        recommendation=(
-                            "Verify if this is an entry point or unused code that can be removed."
-                        ),
-                        details=(
-                            "This module is not imported by any other internal module. Consider:\n"
-                            "1. If Entry Point - Mark it clearly as an application entry point\n"
-                            "2. If Unused - Remove the module to reduce code clutter\n"
-                            "3. If API - Document as public API endpoint\n"
-                            f"Outgoing dependencies: {out_degree}"
-                        ),
-                        suggested_refactoring="Verify Usage / Remove Dead Code",
-                    )
-                )
-
-        return suggestions
-
-    def _detect_hub_modules(
-        self, internal_nodes: list[str]
-    ) -> list[RefactoringSuggestion]:
+        # Module with no incoming dependencies might be dead code
+        # Exception: entry points (modules with no dependencies at all or high out_degree)
+        for i in np.flatnonzero((self._aff == 0) & (self._eff > 0)).tolist():
+            node = self._internal[i]
+            in_degree = 0
+            out_degree = self._metrics[i][1]
+
+            yield RefactoringSuggestion(
+                module=node,
+                severity="info",
+                pattern="Potential Dead Code",
+                description=(
+                    f"Module has no incoming dependencies but {out_degree} outgoing dependencies."
+                ),
+                metrics=RefactoringSuggestionMetrics(
+                    afferent_coupling=in_degree,
+                    efferent_coupling=out_degree,
+                ),
+                recommendation=(
+                    "Verify if this is an entry point or unused code that can be removed."
+                ),
+                details=(
+                    "This module is not imported by any other internal module. Consider:\n"
+                    "1. If Entry Point - Mark it clearly as an application entry point\n"
+                    "2. If Unused - Remove the module to reduce code clutter\n"
+                    "3. If API - Document as public API endpoint\n"
+                    f"Outgoing dependencies: {out_degree}"
+                ),
+                suggested_refactoring="Verify Usage / Remove Dead Code",
+            )
+
+    def _detect_hub_modules(self) -> Iterator[RefactoringSuggestion]:
         """
         Detect Hub Modules - modules with very high afferent coupling.
 
         High afferent coupling means many modules depend on this one,
         making it a critical stability point.
         """
-        suggestions: list[RefactoringSuggestion] = []
-
-        for node in internal_nodes:
-            afferent = self.graph.in_degree(node)
-            efferent = self.graph.out_degree(node)
-
-            # Threshold for hub: 10+ incoming dependencies
-            if afferent >= 10:
-                # Calculate instability: I = efferent / (afferent + efferent)
-                total = afferent + efferent
-                instability = efferent / total if total > 0 else 0
-
-                # Get dependents
-                dependents = list(self.graph.predecessors(node))
-                dependent_modules = set()
-                for dep in dependents[:10]:
-                    module = self.graph.nodes[dep].get("module", "")
-                    if module:
-                        dependent_modules.add(module)
-
-                severity = "warning" if afferent >= 15 else "info"
-
-                suggestions.append(
-                    RefactoringSuggestion(
-                        module=node,
-                        severity=severity,
-                        pattern="Hub Module",
-                        description=(
-                            f"Module is heavily depended upon by {afferent} other modules."
-                        ),
-                        metrics=RefactoringSuggestionMetrics(
-                            afferent_coupling=afferent,
-                            efferent_coupling=efferent,
-                            instability=instability,
-                            abstractness_needed=1 - instability,
-                        ),
-                        recommendation=(
-                            "Ensure module is stable and well-tested. Consider applying Stable Dependencies Principle."
-                        ),
-                        details=(
-                            f"This hub module is critical to the system ({afferent} dependents). Consider:\n"
-                            "1. Stability - Ensure comprehensive test coverage (critical path)\n"
-                            "2. Interface Segregation - Split into smaller, focused interfaces\n"
-                            "3. Stable Abstractions - High stability should pair with high abstractness\n"
-                            "4. API Versioning - Implement versioning for breaking changes\n"
-                            f"Instability: {instability:.2f} (lower is more stable)\n"
-                            f"Dependent modules: {', '.join(list(dependent_modules)[:5])}{'...' if len(dependent_modules) > 5 else ''}"
-                        ),
-                        suggested_refactoring="Interface Segregation + Stability Hardening",
-                    )
+        # Threshold for hub: 10+ incoming dependencies
+        for i in np.flatnonzero(self._aff >= 10).tolist():
+            node = self._internal[i]
+
+            # Instability: I = efferent / (afferent + efferent)
+            afferent, efferent, instability = self._metrics[i]
+
+            # Get dependents
+            dependent_modules = set(
+                filter(
+                    None,
+                    map(
+                        self._node_module.__getitem__, islice(self.graph.pred[node], 10)
+                    ),
                 )
+            )
+
+            severity = "warning" if afferent >= 15 else "info"
+
+            yield RefactoringSuggestion(
+                module=node,
+                severity=severity,
+                pattern="Hub Module",
+                description=(
+                    f"Module is heavily depended upon by {afferent} other modules."
+                ),
+                metrics=RefactoringSuggestionMetrics(
+                    afferent_coupling=afferent,
+                    efferent_coupling=efferent,
+                    instability=instability,
+                    abstractness_needed=1 - instability,
+                ),
+                recommendation=(
+                    "Ensure module is stable and well-tested. Consider applying Stable Dependencies Principle."
+                ),
+                details=(
+                    f"This hub module is critical to the system ({afferent} dependents). Consider:\n"
+                    "1. Stability - Ensure comprehensive test coverage (critical path)\n"
+                    "2. Interface Segregation - Split into smaller, focused interfaces\n"
+                    "3. Stable Abstractions - High stability should pair with high abstractness\n"
+                    "4. API Versioning - Implement versioning for breaking changes\n"
+                    f"Instability: {instability:.2f} (lower is more stable)\n"
+                    f"Dependent modules: {', '.join(islice(dependent_modules, 5))}{'...' if len(dependent_modules) > 5 else ''}"
+                ),
+                suggested_refactoring="Interface Segregation + Stability Hardening",
+            )
+
+    def _iter_internal_cycles(self) -> Iterator[list[str]]:
+        """
+        Lazily yield internal-only cycles of 2-5 modules.
 
-        return suggestions
-
-    def _suggest_circular_dependency_fixes(self) -> list[RefactoringSuggestion]:
+        Cycles are found one strongly connected component at a time; a cycle
+        never spans two components, and trivial ones hold no cycle at all.
+        Third-party members are dropped before enumerating, so every cycle
+        produced is internal.
         """
-        Suggest fixes for circular dependencies already detected.
+        # Healthy codebases are usually acyclic; a single topological pass
+        # is cheaper than splitting the graph into components
+        if nx.is_directed_acyclic_graph(self.graph):
+            return
+        for scc in nx.strongly_connected_components(self.graph):
+            members = scc & self._internal_set
+            if len(members) < 2:
+                continue
+            # Only cycles of up to 5 modules are reported, so don't let
+            # the enumeration explore longer circuits at all
+            for cycle in nx.simple_cycles(self.graph.subgraph(members), length_bound=5):
+                # Self-imports are single-node cycles, not worth reporting
+                if len(cycle) >= 2:
+                    yield cycle
+
+    def _suggest_circular_dependency_fixes(self) -> Iterator[RefactoringSuggestion]:
         """
-        suggestions: list[RefactoringSuggestion] = []
+        Suggest fixes for circular dependencies already detected.
 
-        # Find all cycles
+        At most _MAX_CYCLE_SUGGESTIONS cycles are reported; enumeration stops
+        as soon as that many have been found.
+        """
         try:
-            cycles = list(nx.simple_cycles(self.graph))
+            cycles = list(islice(self._iter_internal_cycles(), _MAX_CYCLE_SUGGESTIONS))
         except nx.NetworkXError as e:
             logger.warning("Failed to detect cycles for refactoring analysis: %s", e)
             cycles = []
 
-        # Filter to internal-only cycles
-        internal_cycles = []
         for cycle in cycles:
-            if all(self.graph.nodes[n].get("type") == "internal" for n in cycle):
-                internal_cycles.append(cycle)
-
-        # Only report cycles of reasonable size (2-5 modules)
-        for cycle in internal_cycles:
-            if 2 <= len(cycle) <= 5:
-                cycle_str = " → ".join(cycle) + f" → {cycle[0]}"
-
-                suggestions.append(
-                    RefactoringSuggestion(
-                        module=cycle[0],
-                        severity="critical",
-                        pattern="Circular Dependency",
-                        description=(
-                            f"Circular dependency detected involving {len(cycle)} modules."
-                        ),
-                        metrics=RefactoringSuggestionMetrics(
-                            cycle_length=len(cycle),
-                            modules_in_cycle=cycle,
-                        ),
-                        recommendation=(
-                            "Break the cycle by extracting a common interface or inverting dependencies."
-                        ),
-                        details=(
-                            f"Circular dependency cycle: {cycle_str}\n\n"
-                            "Refactoring strategies:\n"
-                            "1. Extract Interface - Create common abstractions (e.g., create module C with interfaces A and B depend on)\n"
-                            "2. Dependency Inversion Principle - Depend on abstractions, not concretions\n"
-                            "3. Move Method - Relocate functionality to break the cycle\n"
-                            "4. Introduce Mediator - Create a mediator object to coordinate\n"
-                            "Example: If A imports B and B imports A, extract shared code into C, then A→C and B→C"
-                        ),
-                        suggested_refactoring="Extract Interface + Dependency Inversion",
-                    )
-                )
-
-        return suggestions
-
-    def _detect_unstable_dependencies(
-        self, internal_nodes: list[str]
-    ) -> list[RefactoringSuggestion]:
+            cycle_str = " → ".join(cycle) + f" → {cycle[0]}"
+
+            yield RefactoringSuggestion(
+                module=cycle[0],
+                severity="critical",
+                pattern="Circular Dependency",
+                description=(
+                    f"Circular dependency detected involving {len(cycle)} modules."
+                ),
+                metrics=RefactoringSuggestionMetrics(
+                    cycle_length=len(cycle),
+                    modules_in_cycle=cycle,
+                ),
+                recommendation=(
+                    "Break the cycle by extracting a common interface or inverting dependencies."
+                ),
+                details=(
+                    f"Circular dependency cycle: {cycle_str}\n\n"
+                    "Refactoring strategies:\n"
+                    "1. Extract Interface - Create common abstractions (e.g., create module C with interfaces A and B depend on)\n"
+                    "2. Dependency Inversion Principle - Depend on abstractions, not concretions\n"
+                    "3. Move Method - Relocate functionality to break the cycle\n"
+                    "4. Introduce Mediator - Create a mediator object to coordinate\n"
+                    "Example: If A imports B and B imports A, extract shared code into C, then A→C and B→C"
+                ),
+                suggested_refactoring="Extract Interface + Dependency Inversion",
+            )
+
+    def _detect_unstable_dependencies(self) -> Iterator[RefactoringSuggestion]:
         """
         Detect violations of Stable Dependencies Principle.
 
         A module should only depend on modules more stable than itself.
         Instability I = efferent / (afferent + efferent)
         """
-        suggestions: list[RefactoringSuggestion] = []
-
-        # Calculate instability for all nodes
-        instability = {}
-        for node in internal_nodes:
-            afferent = self.graph.in_degree(node)
-            efferent = self.graph.out_degree(node)
-            total = afferent + efferent
-            instability[node] = efferent / total if total > 0 else 0
-
-        # Check if stable modules depend on unstable ones
-        for node in internal_nodes:
-            node_instability = instability[node]
-
-            # Only check stable modules (instability < 0.5)
-            if node_instability >= 0.5:
-                continue
-
-            # Check dependencies
-            violations = []
-            for successor in self.graph.successors(node):
-                if successor in instability:
-                    dep_instability = instability[successor]
-
-                    # Violation: stable depends on unstable
-                    if (
-                        dep_instability > node_instability + 0.3
-                    ):  # Significant difference
-                        violations.append((successor, dep_instability))
-
-            if violations:
-                violations.sort(key=lambda x: x[1], reverse=True)
-                worst_dep, worst_instability = violations[0]
-
-                suggestions.append(
-                    RefactoringSuggestion(
-                        module=node,
-                        severity="warning",
-                        pattern="Unstable Dependency",
-                        description=(
-                            f"Stable module (I={node_instability:.2f}) depends on unstable modules."
-                        ),
-                        metrics=RefactoringSuggestionMetrics(
-                            module_instability=node_instability,
-                            worst_dependency=worst_dep,
-                            worst_dependency_instability=worst_instability,
-                            violation_count=len(violations),
-                        ),
-                        recommendation=(
-                            "Apply Dependency Inversion - depend on abstractions instead of unstable concretions."
-                        ),
-                        details=(
-                            f"This stable module (I={node_instability:.2f}) depends on unstable modules, violating SDP. Consider:\n"
-                            "1. Dependency Inversion - Introduce interfaces/abstractions\n"
-                            "2. Stabilize Dependencies - Reduce coupling of dependent modules\n"
-                            "3. Move Functionality - Relocate code to reduce dependency\n"
-                            f"Worst violation: '{worst_dep}' (I={worst_instability:.2f})\n"
-                            f"Total violations: {len(violations)}"
-                        ),
-                        suggested_refactoring="Dependency Inversion Principle",
-                    )
-                )
-
-        return suggestions
+        # Instability per graph position; NaN for non-internal nodes, which
+        # never compare greater and so are never counted as violations
+        instability = np.full(len(self._nodes), np.nan)
+        instability[self._rows] = self._inst
+
+        # Check if stable modules depend on unstable ones; only stable modules
+        # (instability < 0.5) can violate the principle
+        edge_rows, targets = self._candidate_edges(np.flatnonzero(self._inst < 0.5))
+        dep_instability = instability[targets]
+
+        # Violation: stable depends on unstable (significant difference)
+        violating = dep_instability > self._inst[edge_rows] + 0.3
+        edge_rows = edge_rows[violating]
+        targets = targets[violating]
+        dep_instability = dep_instability[violating]
+
+        # Edges are grouped by row already; the worst violation is the first
+        # dependency with the highest instability
+        rows, starts, counts = np.unique(
+            edge_rows, return_index=True, return_counts=True
+        )
+        for i, start, violation_count in zip(
+            rows.tolist(), starts.tolist(), counts.tolist()
+        ):
+            node = self._internal[i]
+            node_instability = self._metrics[i][2]
+            end = start + violation_count
+            worst = start + int(np.argmax(dep_instability[start:end]))
+            worst_dep = self._nodes[int(targets[worst])]
+            worst_instability = float(dep_instability[worst])
+
+            yield RefactoringSuggestion(
+                module=node,
+                severity="warning",
+                pattern="Unstable Dependency",
+                description=(
+                    f"Stable module (I={node_instability:.2f}) depends on unstable modules."
+                ),
+                metrics=RefactoringSuggestionMetrics(
+                    module_instability=node_instability,
+                    worst_dependency=worst_dep,
+                    worst_dependency_instability=worst_instability,
+                    violation_count=violation_count,
+                ),
+                recommendation=(
+                    "Apply Dependency Inversion - depend on abstractions instead of unstable concretions."
+                ),
+                details=(
+                    f"This stable module (I={node_instability:.2f}) depends on unstable modules, violating SDP. Consider:\n"
+                    "1. Dependency Inversion - Introduce interfaces/abstractions\n"
+                    "2. Stabilize Dependencies - Reduce coupling of dependent modules\n"
+                    "3. Move Functionality - Relocate code to reduce dependency\n"
+                    f"Worst violation: '{worst_dep}' (I={worst_instability:.2f})\n"
+                    f"Total violations: {violation_count}"
+                ),
+                suggested_refactoring="Dependency Inversion Principle",
+            )
 
     def get_summary_stats(self) -> RefactoringSummary:
         """Get summary statistics for the analysis."""
-        internal_nodes = [
-            n for n in self.graph.nodes if self.graph.nodes[n].get("type") == "internal"
-        ]
-
         suggestions = self.analyze_refactoring_opportunities()
 
-        # Count by severity
-        severity_counts = {"critical": 0, "warning": 0, "info": 0}
-        pattern_counts = defaultdict(int)
-
-        for sugg in suggestions:
-            severity_counts[sugg.severity] = severity_counts.get(sugg.severity, 0) + 1
-            pattern_counts[sugg.pattern] += 1
+        # Every known severity is reported, even with a zero count
+        severity_counts = dict.fromkeys(_SEVERITY_ORDER, 0)
+        severity_counts.update(Counter(map(attrgetter("severity"), suggestions)))
+        pattern_counts = Counter(map(attrgetter("pattern"), suggestions))
 
         return RefactoringSummary(
             total_suggestions=len(suggestions),
             by_severity=severity_counts,
             by_pattern=dict(pattern_counts),
-            modules_analyzed=len(internal_nodes),
+            modules_analyzed=len(self._internal),
         )
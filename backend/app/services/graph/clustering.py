@@ -38,7 +38,7 @@ class ClusteringService:
 
         # Only cluster internal nodes
         internal_nodes = [
-            n for n in self.graph.nodes if self.graph.nodes[n].get("type") == "internal"
+            n for n, t in self.graph.nodes(data="type") if t == "internal"
         ]
 
         # Create subgraph with only internal nodes
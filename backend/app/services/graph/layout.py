@@ -20,12 +20,8 @@ def hierarchical_layout_3d(graph: nx.DiGraph) -> nx.DiGraph:
         Graph with position attributes
     """
     # Separate internal and third-party nodes
-    internal_nodes = [
-        n for n in graph.nodes if graph.nodes[n].get("type") == "internal"
-    ]
-    third_party_nodes = [
-        n for n in graph.nodes if graph.nodes[n].get("type") == "third_party"
-    ]
+    internal_nodes = [n for n, t in graph.nodes(data="type") if t == "internal"]
+    third_party_nodes = [n for n, t in graph.nodes(data="type") if t == "third_party"]
 
     # Position third-party nodes in a circle at the bottom
     radius = 80
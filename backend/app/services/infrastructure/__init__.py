@@ -1,5 +1,5 @@
 from app.services.infrastructure.github import GitHubService
-from app.services.infrastructure.progress import ProgressTracker
+from app.services.infrastructure.progress import ProgressTracker, build_sse_frame
 from app.services.infrastructure.session import Session, SessionService
 
 __all__ = [
@@ -7,4 +7,5 @@ __all__ = [
     "ProgressTracker",
     "Session",
     "SessionService",
+    "build_sse_frame",
 ]
@@ -103,7 +103,11 @@ class GitHubService:
                 return data.get("default_branch", "main")
 
     async def fetch_repository(
-        self, url: str, ref: str | None = None, token: str | None = None
+        self,
+        url: str,
+        ref: str | None = None,
+        token: str | None = None,
+        blob_cache: dict[str, str] | None = None,
     ) -> FetchResult:
         """
         Fetch all supported source files from a GitHub repository.
@@ -114,6 +118,8 @@ class GitHubService:
             url: GitHub repository URL (e.g., https://github.com/owner/repo)
             ref: Git reference (branch, tag, or commit SHA)
             token: Optional GitHub token for private repos / higher rate limits
+            blob_cache: Optional blob SHA -> content map shared between fetches;
+                files whose blob is already cached are not downloaded again
 
         Returns:
             FetchResult with files and failure statistics
@@ -138,8 +144,14 @@ class GitHubService:
         sem = asyncio.Semaphore(100)
 
         async def fetch_one(
-            session: aiohttp.ClientSession, path: str
+            session: aiohttp.ClientSession, item: dict
         ) -> FileInput | None:
+            path = item["path"]
+            blob_sha = item.get("sha")
+            # Blob SHAs are content hashes, so a cached blob is this file as-is
+            if blob_cache is not None and blob_sha in blob_cache:
+                return FileInput(path=path, content=blob_cache[blob_sha])
+
             async with sem:
                 try:
                     content = await self._fetch_file_content(
@@ -148,7 +160,11 @@ class GitHubService:
                 except Exception as exc:
                     logger.warning("Failed to fetch %s: %s", path, exc)
                     return None
-                return FileInput(path=path, content=content) if content else None
+                if not content:
+                    return None
+                if blob_cache is not None and blob_sha:
+                    blob_cache[blob_sha] = content
+                return FileInput(path=path, content=content)
 
         connector = aiohttp.TCPConnector(limit=100, limit_per_host=50)
         headers = {"Authorization": f"token {token}"} if token else {}
@@ -156,7 +172,7 @@ class GitHubService:
         async with aiohttp.ClientSession(
             connector=connector, headers=headers, timeout=timeout
         ) as session:
-            tasks = [fetch_one(session, f["path"]) for f in source_files]
+            tasks = [fetch_one(session, f) for f in source_files]
             results = await asyncio.gather(*tasks)
 
         files = [r for r in results if r is not None]
@@ -244,7 +260,11 @@ class GitHubService:
         return commits
 
     async def fetch_repository_at_commit(
-        self, url: str, commit_sha: str, token: str | None = None
+        self,
+        url: str,
+        commit_sha: str,
+        token: str | None = None,
+        blob_cache: dict[str, str] | None = None,
     ) -> FetchResult:
         """
         Fetch repository files at a specific commit.
@@ -253,11 +273,14 @@ class GitHubService:
             url: GitHub repository URL
             commit_sha: Commit SHA
             token: Optional GitHub token for authentication
+            blob_cache: Optional blob SHA -> content map shared between commits
 
         Returns:
             FetchResult with files and failure statistics
         """
-        return await self.fetch_repository(url, ref=commit_sha, token=token)
+        return await self.fetch_repository(
+            url, ref=commit_sha, token=token, blob_cache=blob_cache
+        )
 
     def _parse_github_url(self, url: str) -> tuple[str, str]:
         """
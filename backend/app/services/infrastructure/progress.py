@@ -1,10 +1,18 @@
 from collections.abc import AsyncIterator
-import asyncio
 import json
 
 from app.core.models import ErrorResponse
 
 
+def build_sse_frame(payload: dict) -> bytes:
+    """Encode a payload as a complete SSE ``data:`` frame.
+
+    Bytes pass through the SSE response untouched, so each event is
+    serialized and encoded exactly once.
+    """
+    return b"data: " + json.dumps(payload, separators=(",", ":")).encode() + b"\n\n"
+
+
 class ProgressTracker:
     """Track and emit progress updates via Server-Sent Events."""
 
@@ -19,19 +27,26 @@ class ProgressTracker:
             ("Complete!", 100),
         ]
         self.current_step = 0
+        # The steps never change, so their frames are built once up front
+        self._step_frames = [
+            build_sse_frame({"message": message, "progress": percentage})
+            for message, percentage in self.steps
+        ]
 
-    async def emit_progress(self) -> AsyncIterator[str]:
+    async def emit_progress(self) -> AsyncIterator[bytes]:
         """
-        Emit progress updates as SSE events.
+        Emit progress updates as SSE events, back to back.
+
+        Live pipelines pace progress themselves by calling ``emit_step`` as
+        each stage completes, so no artificial delay is added here.
 
         Yields:
-            SSE formatted strings
+            SSE formatted frames
         """
-        for message, percentage in self.steps:
-            yield f"data: {json.dumps({'message': message, 'progress': percentage})}\n\n"
-            await asyncio.sleep(0.1)  # Small delay for smooth updates
+        for frame in self._step_frames:
+            yield frame
 
-    async def emit_step(self, step_index: int) -> str:
+    def emit_step(self, step_index: int) -> bytes:
         """
         Emit a specific step update.
 
@@ -39,16 +54,13 @@ class ProgressTracker:
             step_index: Index of the step to emit
 
         Returns:
-            SSE formatted string
+            SSE formatted frame
         """
-        if 0 <= step_index < len(self.steps):
-            message, percentage = self.steps[step_index]
-            return (
-                f"data: {json.dumps({'message': message, 'progress': percentage})}\n\n"
-            )
-        return ""
-
-    async def emit_result(self, result: dict) -> str:
+        if 0 <= step_index < len(self._step_frames):
+            return self._step_frames[step_index]
+        return b""
+
+    def emit_result(self, result: dict) -> bytes:
         """
         Emit the final result.
 
@@ -56,11 +68,11 @@ class ProgressTracker:
             result: Analysis result dictionary
 
         Returns:
-            SSE formatted string
+            SSE formatted frame
         """
-        return f"data: {json.dumps({'type': 'result', 'data': result})}\n\n"
+        return build_sse_frame({"type": "result", "data": result})
 
-    async def emit_error(self, error: str) -> str:
+    def emit_error(self, error: str) -> bytes:
         """
         Emit an error message.
 
@@ -68,11 +80,11 @@ class ProgressTracker:
             error: Error message
 
         Returns:
-            SSE formatted string
+            SSE formatted frame
         """
-        return f"data: {json.dumps({'type': 'error', 'message': error})}\n\n"
+        return build_sse_frame({"type": "error", "message": error})
 
-    async def emit_error_response(self, error: ErrorResponse) -> str:
+    def emit_error_response(self, error: ErrorResponse) -> bytes:
         """
         Emit a structured error response.
 
@@ -80,6 +92,6 @@ class ProgressTracker:
             error: ErrorResponse payload
 
         Returns:
-            SSE formatted string
+            SSE formatted frame
         """
-        return f"data: {json.dumps({'type': 'error', 'message': error.detail})}\n\n"
+        return build_sse_frame({"type": "error", "message": error.detail})
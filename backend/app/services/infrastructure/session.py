@@ -1,8 +1,8 @@
+import heapq
 import secrets
+import time
 from dataclasses import dataclass
 
-from cachetools import TTLCache
-
 from app.core.config import settings
 from app.core.models import GitHubUser, GitHubRepo
 
@@ -16,11 +16,22 @@ class Session:
 
 
 class SessionService:
+    """
+    In-memory session store with a fixed lifetime per session.
+
+    Sessions are kept as ``session_id -> (expires_at, session)`` so the
+    per-request lookup is a dict read and one monotonic-clock comparison.
+    Expired entries are dropped lazily: on lookup, and from a min-heap of
+    expiry times when new sessions are created. When the store is full the
+    session closest to expiring (the oldest one) is evicted.
+    """
+
     def __init__(self):
-        self._sessions: TTLCache[str, Session] = TTLCache(
-            maxsize=settings.session_max_count,
-            ttl=settings.session_expiry_hours * 3600,
-        )
+        self._max_count = settings.session_max_count
+        self._ttl = settings.session_expiry_hours * 3600
+        self._sessions: dict[str, tuple[float, Session]] = {}
+        # (expires_at, session_id); may hold entries for deleted sessions
+        self._expiry_heap: list[tuple[float, str]] = []
 
     def create(
         self, github_token: str, user: GitHubUser, repos: list[GitHubRepo]
@@ -29,11 +40,22 @@ class SessionService:
         session = Session(
             session_id=session_id, github_token=github_token, user=user, repos=repos
         )
-        self._sessions[session_id] = session
+        now = time.monotonic()
+        self._evict(now)
+        expires_at = now + self._ttl
+        self._sessions[session_id] = (expires_at, session)
+        heapq.heappush(self._expiry_heap, (expires_at, session_id))
         return session
 
     def get(self, session_id: str) -> Session | None:
-        return self._sessions.get(session_id)
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        expires_at, session = entry
+        if time.monotonic() < expires_at:
+            return session
+        del self._sessions[session_id]
+        return None
 
     def delete(self, session_id: str) -> bool:
         return self._sessions.pop(session_id, None) is not None
@@ -43,3 +65,24 @@ class SessionService:
             return None
         session = self.get(session_id)
         return session.github_token if session else None
+
+    def _evict(self, now: float) -> None:
+        """Drop expired sessions, then the oldest ones while the store is full."""
+        heap = self._expiry_heap
+        sessions = self._sessions
+
+        while heap and (heap[0][0] <= now or len(sessions) >= self._max_count):
+            expires_at, session_id = heapq.heappop(heap)
+            entry = sessions.get(session_id)
+            # Skip heap entries whose session was deleted or already dropped
+            if entry is not None and entry[0] == expires_at:
+                del sessions[session_id]
+
+        # Deleted sessions leave stale heap entries behind; rebuild the heap
+        # from live sessions before those can pile up
+        if len(heap) > 2 * self._max_count:
+            self._expiry_heap = [
+                (expires_at, session_id)
+                for session_id, (expires_at, _) in sessions.items()
+            ]
+            heapq.heapify(self._expiry_heap)
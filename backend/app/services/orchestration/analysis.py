@@ -192,16 +192,16 @@ class AnalysisOrchestratorService:
     @staticmethod
     async def perform_analysis(
         request: AnalyzeRequest, tracker: ProgressTracker
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Perform code analysis and yield progress updates."""
-        yield await tracker.emit_step(0)
+        yield tracker.emit_step(0)
 
         # Handle import case - data field is guaranteed to exist by discriminated union
         match request:
             case ImportAnalyzeRequest(data=data):
                 logger.info("Importing previously analyzed data")
                 result = data.model_dump()
-                yield await tracker.emit_result(result)
+                yield tracker.emit_result(result)
                 return
             case _:
                 pass  # Continue with normal analysis flow
@@ -214,15 +214,15 @@ class AnalysisOrchestratorService:
             "Starting analysis for project '%s' with %d files", project_name, len(files)
         )
 
-        yield await tracker.emit_step(1)
+        yield tracker.emit_step(1)
         dependency_data = await analyze_files(files, project_name)
 
-        yield await tracker.emit_step(2)
+        yield tracker.emit_step(2)
 
-        yield await tracker.emit_step(3)
+        yield tracker.emit_step(3)
         graph = build_graph(dependency_data)
 
-        yield await tracker.emit_step(4)
+        yield tracker.emit_step(4)
         metrics_calc = MetricsCalculator(graph)
         global_metrics = metrics_calc.calculate_all()
 
@@ -238,7 +238,7 @@ class AnalysisOrchestratorService:
             refactoring_service,
         )
 
-        yield await tracker.emit_step(5)
+        yield tracker.emit_step(5)
         graph = apply_layout(graph, "hierarchical")
 
         nodes, edges = AnalysisOrchestratorService.build_nodes_and_edges(
@@ -255,5 +255,5 @@ class AnalysisOrchestratorService:
             "warnings": all_warnings,
         }
 
-        yield await tracker.emit_step(6)
-        yield await tracker.emit_result(result)
+        yield tracker.emit_step(6)
+        yield tracker.emit_result(result)
@@ -1,8 +1,8 @@
-import json
 from collections.abc import AsyncGenerator
 
 from app.core.exceptions import NotFoundError
 from app.core.models import TemporalAnalysisRequest, TemporalAnalysisResponse
+from app.services.infrastructure import build_sse_frame
 from app.services.temporal import TemporalAnalysisService
 
 
@@ -14,11 +14,12 @@ class TemporalOrchestratorService:
 
     async def start_temporal_analysis(
         self, request: TemporalAnalysisRequest
-    ) -> AsyncGenerator[dict, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
         Start temporal analysis with SSE-formatted progress updates.
 
-        Yields SSE-formatted events for streaming to the client.
+        Yields complete SSE frames for streaming to the client; each event is
+        serialized once, straight to the bytes the response writes.
         """
         async for event in self.temporal_service.analyze_repository_history_streaming(
             repo_url=request.repository_url,
@@ -26,7 +27,7 @@ class TemporalOrchestratorService:
             end_date=request.end_date,
             sample_strategy=request.sample_strategy,
         ):
-            yield {"event": "message", "data": json.dumps(event)}
+            yield build_sse_frame(event)
 
     def get_temporal_analysis(self, analysis_id: str) -> TemporalAnalysisResponse:
         """
@@ -2,6 +2,7 @@ from app.services.parsers.base import (
     BaseParser,
     ImportResolution,
     LanguageParser,
+    ParsedFile,
     ParsedImport,
     ParsedNode,
     ProjectContext,
@@ -29,6 +30,7 @@ __all__ = [
     "JavaScriptImportResolver",
     "JavaScriptParser",
     "LanguageParser",
+    "ParsedFile",
     "ParsedImport",
     "ParsedNode",
     "ProjectContext",
@@ -1,10 +1,16 @@
+import os
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Protocol, runtime_checkable
+from typing import Protocol, TypeVar, runtime_checkable
 
 from app.core.models import Language, NodeType
 
+_T = TypeVar("_T")
+
 
 @dataclass(frozen=True, slots=True)
 class ImportResolution:
@@ -15,6 +21,48 @@ class ImportResolution:
     package_name: str | None = None
     version: str | None = None
 
+    # Resolutions are immutable and a project resolves to a small set of
+    # targets, so the common shapes are built once and shared
+
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def stdlib(
+        cls, resolved_path: str, package_name: str | None = None
+    ) -> "ImportResolution":
+        return cls(
+            resolved_path=resolved_path,
+            is_internal=False,
+            is_external=False,
+            is_stdlib=True,
+            package_name=package_name,
+        )
+
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def internal(
+        cls, resolved_path: str, package_name: str | None = None
+    ) -> "ImportResolution":
+        return cls(
+            resolved_path=resolved_path,
+            is_internal=True,
+            is_external=False,
+            is_stdlib=False,
+            package_name=package_name,
+        )
+
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def external(
+        cls, resolved_path: str, package_name: str | None = None
+    ) -> "ImportResolution":
+        return cls(
+            resolved_path=resolved_path,
+            is_internal=False,
+            is_external=True,
+            is_stdlib=False,
+            package_name=package_name,
+        )
+
 
 @dataclass(slots=True)
 class ParsedImport:
@@ -40,6 +88,69 @@ class ParsedNode:
     metadata: dict = field(default_factory=dict)
 
 
+class ParsedFile(Sequence[ParsedNode]):
+    """Nodes parsed from one file: the module node first, then its members.
+
+    The module node, which carries the imports, is built eagerly. Member
+    nodes (types, functions) are built on first access past it, so consumers
+    that only read the module's imports never allocate them. Compares equal
+    to a list of the same nodes and, like a list, is unhashable.
+    """
+
+    __slots__ = ("_build", "_members", "_nodes", "module")
+
+    def __init__(
+        self,
+        module: ParsedNode,
+        members: Sequence[ParsedNode] | Callable[[], list[ParsedNode]] = (),
+    ):
+        self.module = module
+        self._build: Callable[[], list[ParsedNode]] | None = None
+        self._members: Sequence[ParsedNode] = ()
+        if isinstance(members, Sequence):
+            self._members = members
+        else:
+            self._build = members
+        self._nodes: list[ParsedNode] | None = None
+
+    @property
+    def nodes(self) -> list[ParsedNode]:
+        if self._nodes is None:
+            members = self._build() if self._build is not None else self._members
+            self._nodes = [self.module, *members]
+            self._build = None
+            self._members = ()
+        return self._nodes
+
+    def __iter__(self) -> Iterator[ParsedNode]:
+        yield self.module
+        yield from self.nodes[1:]
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.module
+        return self.nodes[index]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ParsedFile):
+            return self.nodes == other.nodes
+        if isinstance(other, list):
+            return self.nodes == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ParsedFile({self.nodes!r})"
+
+    def __reduce__(self):
+        # A pending member builder is a closure; pickle the built nodes
+        return (ParsedFile, (self.module, self.nodes[1:]))
+
+
 @dataclass(frozen=True, slots=True)
 class ProjectContext:
     project_root: Path
@@ -50,12 +161,19 @@ class ProjectContext:
 
 @runtime_checkable
 class LanguageParser(Protocol):
+    """Interface every language parser implements.
+
+    ``parse_file`` returns a ``ParsedFile``: the file's module node, which
+    carries its imports, followed by its type and function nodes.
+    ``parse_module`` returns just that module node.
+    """
+
     language: Language
     file_extensions: tuple[str, ...]
 
-    def parse_file(
-        self, path: Path, content: str | None = None
-    ) -> list[ParsedNode]: ...
+    def parse_file(self, path: Path, content: str | None = None) -> ParsedFile: ...
+
+    def parse_module(self, path: Path, content: str | None = None) -> ParsedNode: ...
 
     def resolve_import(
         self,
@@ -76,7 +194,7 @@ class BaseParser(ABC):
     file_extensions: tuple[str, ...]
 
     @abstractmethod
-    def parse_file(self, path: Path, content: str | None = None) -> list[ParsedNode]:
+    def parse_file(self, path: Path, content: str | None = None) -> ParsedFile:
         pass
 
     @abstractmethod
@@ -92,9 +210,74 @@ class BaseParser(ABC):
     def detect_project(self, path: Path) -> bool:
         pass
 
-    def parse_content(self, content: str, file_path: str) -> list[ParsedNode]:
+    def parse_content(self, content: str, file_path: str) -> ParsedFile:
         return self.parse_file(Path(file_path), content)
 
+    def parse_module(self, path: Path, content: str | None = None) -> ParsedNode:
+        """Parse just the module node, which carries the file's imports.
+
+        Parsers that can skip the type and function extraction override this.
+        """
+        return self.parse_file(path, content).module
+
+    def parse_files(
+        self,
+        files: Sequence[tuple[Path, str | None]],
+        workers: int | None = None,
+        return_exceptions: bool = False,
+    ) -> list[ParsedFile | Exception]:
+        """Parse ``(path, content)`` pairs on a thread pool, preserving order.
+
+        A ``None`` content reads the file from disk. tree-sitter releases the
+        GIL while parsing, so threads overlap the C portion of the work. The
+        largest files are submitted first to keep a long file from landing
+        last and stretching the tail. With ``return_exceptions``, a file that
+        fails to parse yields its exception in place instead of aborting the
+        batch.
+        """
+        return self._map_files(self.parse_file, files, workers, return_exceptions)
+
+    def parse_modules(
+        self,
+        files: Sequence[tuple[Path, str | None]],
+        workers: int | None = None,
+        return_exceptions: bool = False,
+    ) -> list[ParsedNode | Exception]:
+        """Like ``parse_files``, but returns only each file's module node."""
+        return self._map_files(self.parse_module, files, workers, return_exceptions)
+
+    def _map_files(
+        self,
+        parse_one: Callable[[Path, str | None], _T],
+        files: Sequence[tuple[Path, str | None]],
+        workers: int | None,
+        return_exceptions: bool,
+    ) -> list[_T | Exception]:
+        def size(index: int) -> int:
+            path, content = files[index]
+            if content is not None:
+                return len(content)
+            try:
+                return os.stat(path).st_size
+            except OSError:
+                return 0
+
+        def parse(index: int) -> _T | Exception:
+            try:
+                return parse_one(*files[index])
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        order = sorted(range(len(files)), key=size, reverse=True)
+        # Threads rather than processes: this parser carries the analysis'
+        # project modules and context, which worker processes would not see,
+        # and pickling every ParsedFile back costs more than the C parse saves
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = dict(zip(order, pool.map(parse, order)))
+        return [results[index] for index in range(len(files))]
+
     def set_project_modules(self, modules: set[str]) -> None:
         """Optional hook for parsers that need project module context."""
         pass
@@ -6,13 +6,14 @@ from app.core import GO_EXTENSIONS
 from app.core.models import Language, NodeType
 from app.services.parsers.base import (
     ImportResolution,
+    ParsedFile,
     ParsedImport,
     ParsedNode,
     ProjectContext,
 )
 from app.services.parsers.go.import_resolver import GoImportResolver
 from app.services.parsers.registry import ParserRegistry
-from app.services.parsers.tree_sitter_base import TreeSitterParser
+from app.services.parsers.tree_sitter_base import Captures, Source, TreeSitterParser
 
 
 @ParserRegistry.register
@@ -60,66 +61,65 @@ class GoParser(TreeSitterParser):
     def detect_project(self, path: Path) -> bool:
         return (path / "go.mod").exists()
 
-    def parse_file(self, path: Path, content: str | None = None) -> list[ParsedNode]:
-        source = content.encode("utf-8") if content else path.read_bytes()
-        tree = self.parse_source(source)
-
-        imports = self.extract_imports(tree, source)
-        structs = self.extract_classes(tree, source)
-        functions = self.extract_functions(tree, source)
+    def _build_parsed_file(self, path: Path, extracted: dict) -> ParsedFile:
+        imports = extracted["imports"]
+        structs = extracted["classes"]
+        functions = extracted["functions"]
 
         module_id = self._path_to_module_id(path)
-        nodes = []
 
         parsed_imports = [
             ParsedImport(module=imp["path"], names=[], is_relative=False)
             for imp in imports
         ]
 
-        nodes.append(
-            ParsedNode(
-                id=module_id,
-                name=path.stem,
-                node_type=NodeType.MODULE,
-                language=self.language,
-                file_path=str(path),
-                start_line=1,
-                end_line=tree.root_node.end_point[0] + 1,
-                imports=parsed_imports,
-                exports=[],
-            )
+        module = ParsedNode(
+            id=module_id,
+            name=path.stem,
+            node_type=NodeType.MODULE,
+            language=self.language,
+            file_path=str(path),
+            start_line=1,
+            end_line=extracted["end_line"],
+            imports=parsed_imports,
+            exports=[],
         )
 
-        for struct in structs:
-            node_type = (
-                NodeType.INTERFACE if struct.get("is_interface") else NodeType.CLASS
-            )
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{struct['name']}",
-                    name=struct["name"],
-                    node_type=node_type,
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=struct["start_line"],
-                    end_line=struct["end_line"],
+        def build_members() -> list[ParsedNode]:
+            nodes = []
+
+            for struct in structs:
+                node_type = (
+                    NodeType.INTERFACE if struct.get("is_interface") else NodeType.CLASS
                 )
-            )
-
-        for func in functions:
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{func['name']}",
-                    name=func["name"],
-                    node_type=NodeType.FUNCTION,
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=func["start_line"],
-                    end_line=func["end_line"],
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{struct['name']}",
+                        name=struct["name"],
+                        node_type=node_type,
+                        language=self.language,
+                        file_path=str(path),
+                        start_line=struct["start_line"],
+                        end_line=struct["end_line"],
+                    )
                 )
-            )
 
-        return nodes
+            for func in functions:
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{func['name']}",
+                        name=func["name"],
+                        node_type=NodeType.FUNCTION,
+                        language=self.language,
+                        file_path=str(path),
+                        start_line=func["start_line"],
+                        end_line=func["end_line"],
+                    )
+                )
+
+            return nodes
+
+        return ParsedFile(module, build_members)
 
     def resolve_import(
         self,
@@ -138,7 +138,9 @@ class GoParser(TreeSitterParser):
         if self._resolver:
             self._resolver.set_context(context)
 
-    def _process_import_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_import_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
         seen = set()
 
@@ -153,7 +155,7 @@ class GoParser(TreeSitterParser):
 
         return results
 
-    def _process_class_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_class_captures(self, captures: Captures, source: Source) -> list[dict]:
         results = []
         seen = set()
 
@@ -193,7 +195,9 @@ class GoParser(TreeSitterParser):
 
         return results
 
-    def _process_function_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_function_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
         seen = set()
 
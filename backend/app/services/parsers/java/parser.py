@@ -6,13 +6,14 @@ from app.core import JAVA_EXTENSIONS
 from app.core.models import Language, NodeType
 from app.services.parsers.base import (
     ImportResolution,
+    ParsedFile,
     ParsedImport,
     ParsedNode,
     ProjectContext,
 )
 from app.services.parsers.java.import_resolver import JavaImportResolver
 from app.services.parsers.registry import ParserRegistry
-from app.services.parsers.tree_sitter_base import TreeSitterParser
+from app.services.parsers.tree_sitter_base import Captures, Source, TreeSitterParser
 
 
 @ParserRegistry.register
@@ -54,16 +55,12 @@ class JavaParser(TreeSitterParser):
         indicators = ("pom.xml", "build.gradle", "build.gradle.kts")
         return any((path / ind).exists() for ind in indicators)
 
-    def parse_file(self, path: Path, content: str | None = None) -> list[ParsedNode]:
-        source = content.encode("utf-8") if content else path.read_bytes()
-        tree = self.parse_source(source)
-
-        imports = self.extract_imports(tree, source)
-        classes = self.extract_classes(tree, source)
-        functions = self.extract_functions(tree, source)
+    def _build_parsed_file(self, path: Path, extracted: dict) -> ParsedFile:
+        imports = extracted["imports"]
+        classes = extracted["classes"]
+        functions = extracted["functions"]
 
         module_id = self._path_to_module_id(path)
-        nodes = []
 
         parsed_imports = [
             ParsedImport(
@@ -74,48 +71,51 @@ class JavaParser(TreeSitterParser):
             for imp in imports
         ]
 
-        nodes.append(
-            ParsedNode(
-                id=module_id,
-                name=path.stem,
-                node_type=NodeType.MODULE,
-                language=self.language,
-                file_path=str(path),
-                start_line=1,
-                end_line=tree.root_node.end_point[0] + 1,
-                imports=parsed_imports,
-                exports=[],
-            )
+        module = ParsedNode(
+            id=module_id,
+            name=path.stem,
+            node_type=NodeType.MODULE,
+            language=self.language,
+            file_path=str(path),
+            start_line=1,
+            end_line=extracted["end_line"],
+            imports=parsed_imports,
+            exports=[],
         )
 
-        for cls in classes:
-            node_type = cls.get("node_type", NodeType.CLASS)
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{cls['name']}",
-                    name=cls["name"],
-                    node_type=node_type,
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=cls["start_line"],
-                    end_line=cls["end_line"],
+        def build_members() -> list[ParsedNode]:
+            nodes = []
+
+            for cls in classes:
+                node_type = NodeType(cls.get("node_type", NodeType.CLASS))
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{cls['name']}",
+                        name=cls["name"],
+                        node_type=node_type,
+                        language=self.language,
+                        file_path=str(path),
+                        start_line=cls["start_line"],
+                        end_line=cls["end_line"],
+                    )
                 )
-            )
 
-        for func in functions:
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{func['name']}",
-                    name=func["name"],
-                    node_type=NodeType.FUNCTION,
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=func["start_line"],
-                    end_line=func["end_line"],
+            for func in functions:
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{func['name']}",
+                        name=func["name"],
+                        node_type=NodeType.FUNCTION,
+                        language=self.language,
+                        file_path=str(path),
+                        start_line=func["start_line"],
+                        end_line=func["end_line"],
+                    )
                 )
-            )
 
-        return nodes
+            return nodes
+
+        return ParsedFile(module, build_members)
 
     def resolve_import(
         self,
@@ -134,7 +134,9 @@ class JavaParser(TreeSitterParser):
         if self._resolver:
             self._resolver.set_context(context)
 
-    def _process_import_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_import_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
         seen = set()
 
@@ -160,7 +162,7 @@ class JavaParser(TreeSitterParser):
 
         return results
 
-    def _extract_import_path(self, node, source: bytes) -> str:
+    def _extract_import_path(self, node, source: Source) -> str:
         """Extract the full import path from an import_declaration node."""
         parts = []
         has_wildcard = False
@@ -178,7 +180,7 @@ class JavaParser(TreeSitterParser):
             result = result + ".*" if result else "*"
         return result
 
-    def _flatten_scoped_identifier(self, node, source: bytes) -> str:
+    def _flatten_scoped_identifier(self, node, source: Source) -> str:
         """Recursively flatten a scoped_identifier to a dotted path."""
         parts = []
         for child in node.children:
@@ -188,7 +190,7 @@ class JavaParser(TreeSitterParser):
                 parts.append(self.get_node_text(child, source))
         return ".".join(parts)
 
-    def _process_class_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_class_captures(self, captures: Captures, source: Source) -> list[dict]:
         results = []
         seen = set()
 
@@ -222,14 +224,16 @@ class JavaParser(TreeSitterParser):
 
         return results
 
-    def _process_function_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_function_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
-        seen = set()
+        seen: set[tuple[int, str]] = set()
 
         for node, capture_name in captures:
             if capture_name == "name":
                 name = self.get_node_text(node, source)
-                key = f"{node.start_point[0]}:{name}"
+                key = (node.start_point[0], name)
                 if key in seen:
                     continue
                 seen.add(key)
@@ -1,18 +1,17 @@
 from pathlib import Path
 
-from tree_sitter import Query
-
 from app.core import JAVASCRIPT_EXTENSIONS, TYPESCRIPT_EXTENSIONS
 from app.core.models import Language, NodeType
 from app.services.parsers.base import (
     ImportResolution,
+    ParsedFile,
     ParsedImport,
     ParsedNode,
     ProjectContext,
 )
 from app.services.parsers.javascript.import_resolver import JavaScriptImportResolver
 from app.services.parsers.registry import ParserRegistry
-from app.services.parsers.tree_sitter_base import TreeSitterParser
+from app.services.parsers.tree_sitter_base import Captures, Source, TreeSitterParser
 
 
 class BaseJavaScriptParser(TreeSitterParser):
@@ -67,23 +66,19 @@ class BaseJavaScriptParser(TreeSitterParser):
         self._export_query = None
         self._project_context: ProjectContext | None = None
         if self.EXPORT_QUERY:
-            self._export_query = Query(self.ts_language, self.EXPORT_QUERY)
+            self._export_query = self._compile(self.EXPORT_QUERY)
 
     def detect_project(self, path: Path) -> bool:
         indicators = ("package.json", "node_modules")
         return any((path / indicator).exists() for indicator in indicators)
 
-    def parse_file(self, path: Path, content: str | None = None) -> list[ParsedNode]:
-        source = content.encode("utf-8") if content else path.read_bytes()
-        tree = self.parse_source(source)
-
-        imports = self.extract_imports(tree, source)
-        classes = self.extract_classes(tree, source)
-        functions = self.extract_functions(tree, source)
-        exports = self._extract_exports(tree, source)
+    def _build_parsed_file(self, path: Path, extracted: dict) -> ParsedFile:
+        imports = extracted["imports"]
+        classes = extracted["classes"]
+        functions = extracted["functions"]
+        exports = [export["name"] for export in extracted["exports"]]
 
         module_id = self._path_to_module_id(path)
-        nodes = []
 
         parsed_imports = [
             ParsedImport(
@@ -94,50 +89,55 @@ class BaseJavaScriptParser(TreeSitterParser):
             for imp in imports
         ]
 
-        nodes.append(
-            ParsedNode(
-                id=module_id,
-                name=path.stem,
-                node_type=self._determine_node_type(path, source),
-                language=self.language,
-                file_path=str(path),
-                start_line=1,
-                end_line=tree.root_node.end_point[0] + 1,
-                imports=parsed_imports,
-                exports=exports,
-            )
+        module = ParsedNode(
+            id=module_id,
+            name=path.stem,
+            node_type=self._determine_node_type(path, extracted["hints"]),
+            language=self.language,
+            file_path=str(path),
+            start_line=1,
+            end_line=extracted["end_line"],
+            imports=parsed_imports,
+            exports=exports,
         )
 
-        for cls in classes:
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{cls['name']}",
-                    name=cls["name"],
-                    node_type=NodeType.CLASS,
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=cls["start_line"],
-                    end_line=cls["end_line"],
+        def build_members() -> list[ParsedNode]:
+            nodes = []
+
+            for cls in classes:
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{cls['name']}",
+                        name=cls["name"],
+                        node_type=NodeType.CLASS,
+                        language=self.language,
+                        file_path=str(path),
+                        start_line=cls["start_line"],
+                        end_line=cls["end_line"],
+                    )
                 )
-            )
 
-        for func in functions:
-            node_type = (
-                NodeType.HOOK if func["name"].startswith("use") else NodeType.FUNCTION
-            )
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{func['name']}",
-                    name=func["name"],
-                    node_type=node_type,
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=func["start_line"],
-                    end_line=func["end_line"],
+            for func in functions:
+                node_type = (
+                    NodeType.HOOK
+                    if func["name"].startswith("use")
+                    else NodeType.FUNCTION
+                )
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{func['name']}",
+                        name=func["name"],
+                        node_type=node_type,
+                        language=self.language,
+                        file_path=str(path),
+                        start_line=func["start_line"],
+                        end_line=func["end_line"],
+                    )
                 )
-            )
 
-        return nodes
+            return nodes
+
+        return ParsedFile(module, build_members)
 
     def resolve_import(
         self,
@@ -157,7 +157,9 @@ class BaseJavaScriptParser(TreeSitterParser):
         if self._resolver:
             self._resolver.set_context(context)
 
-    def _process_import_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_import_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
         seen_sources = set()
 
@@ -180,7 +182,7 @@ class BaseJavaScriptParser(TreeSitterParser):
 
         return results
 
-    def _process_class_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_class_captures(self, captures: Captures, source: Source) -> list[dict]:
         results = []
         for node, capture_name in captures:
             if capture_name == "name":
@@ -198,7 +200,9 @@ class BaseJavaScriptParser(TreeSitterParser):
                 )
         return results
 
-    def _process_function_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_function_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
         seen_names = set()
 
@@ -230,11 +234,20 @@ class BaseJavaScriptParser(TreeSitterParser):
                 )
         return results
 
-    def _extract_exports(self, tree, source: bytes) -> list[str]:
+    def extract_module(self, tree, source: Source) -> dict:
+        """Add exports and node type hints, so cache hits need no source."""
+        extracted = super().extract_module(tree, source)
+        extracted["exports"] = [
+            {"name": name} for name in self._extract_exports(tree, source)
+        ]
+        extracted["hints"] = self._content_hints(source)
+        return extracted
+
+    def _extract_exports(self, tree, source: Source) -> list[str]:
         if not self._export_query:
             return []
 
-        captures = self._run_query(self._export_query, tree.root_node)
+        captures = self._iter_captures(self._export_query, tree.root_node)
         exports = []
         seen = set()
 
@@ -247,22 +260,22 @@ class BaseJavaScriptParser(TreeSitterParser):
 
         return exports
 
-    def _determine_node_type(self, path: Path, source: bytes) -> NodeType:
-        name = path.stem.lower()
-        content = source.decode("utf-8", errors="ignore")
-
-        if (
-            name.startswith("use")
-            or "export function use" in content
-            or "export const use" in content
-        ):
+    def _content_hints(self, source: Source) -> dict[str, bool]:
+        """Content checks behind ``_determine_node_type``, cached with the parse."""
+        content = str(source, "utf-8", errors="ignore")
+        jsx_indicators = ("<", "React", "jsx", "tsx", "return (")
+        return {
+            "hook": "export function use" in content or "export const use" in content,
+            "jsx": any(ind in content for ind in jsx_indicators),
+            "exported": "export default" in content or "export function" in content,
+        }
+
+    def _determine_node_type(self, path: Path, hints: dict[str, bool]) -> NodeType:
+        if path.stem.lower().startswith("use") or hints["hook"]:
             return NodeType.HOOK
 
-        jsx_indicators = ("<", "React", "jsx", "tsx", "return (")
-        if path.suffix in (".jsx", ".tsx") or any(
-            ind in content for ind in jsx_indicators
-        ):
-            if "export default" in content or "export function" in content:
+        if path.suffix in (".jsx", ".tsx") or hints["jsx"]:
+            if hints["exported"]:
                 return NodeType.COMPONENT
 
         return NodeType.MODULE
@@ -1,4 +1,7 @@
-from functools import lru_cache
+import os
+import sys
+from bisect import bisect_left
+from collections.abc import Iterable
 from pathlib import Path
 
 from app.services.parsers.base import ImportResolution, ParsedImport
@@ -212,17 +215,21 @@ STDLIB_MODULES = frozenset(
 )
 
 
-@lru_cache(maxsize=1024)
+_STDLIB_PREFIX = "stdlib:"
+_EXTERNAL_PREFIX = "external:"
+
+
 def is_stdlib(module_name: str) -> bool:
-    if not module_name:
-        return False
-    return module_name.split(".")[0] in STDLIB_MODULES
+    # Only the top-level package decides; partition avoids building a list
+    return module_name.partition(".")[0] in STDLIB_MODULES
 
 
 class PythonImportResolver:
     def __init__(self, project_root: Path, project_modules: set[str] | None = None):
         self.project_root = project_root
         self.project_modules = project_modules or set()
+        root = os.fspath(project_root)
+        self._root_prefix = "" if root == os.curdir else root.rstrip(os.sep) + os.sep
 
     def resolve(
         self,
@@ -232,40 +239,34 @@ class PythonImportResolver:
         resolved = self._resolve_relative(import_stmt, from_file)
 
         if is_stdlib(resolved):
-            return ImportResolution(
-                resolved_path=f"stdlib:{resolved}",
-                is_internal=False,
-                is_external=False,
-                is_stdlib=True,
-            )
+            return ImportResolution.stdlib(_STDLIB_PREFIX + resolved)
 
         internal_match = self._find_internal(resolved, from_file)
         if internal_match:
-            return ImportResolution(
-                resolved_path=internal_match,
-                is_internal=True,
-                is_external=False,
-                is_stdlib=False,
-            )
-
-        return ImportResolution(
-            resolved_path=f"external:{resolved}",
-            is_internal=False,
-            is_external=True,
-            is_stdlib=False,
-            package_name=resolved.split(".")[0],
+            return ImportResolution.internal(internal_match)
+
+        return ImportResolution.external(
+            _EXTERNAL_PREFIX + resolved, resolved.partition(".")[0]
         )
 
     def _resolve_relative(self, import_stmt: ParsedImport, from_file: Path) -> str:
         if not import_stmt.is_relative or import_stmt.level == 0:
             return import_stmt.module
 
-        try:
-            relative = from_file.relative_to(self.project_root)
-        except ValueError:
-            relative = from_file
+        package_dir = self._package_dir(from_file)
+        if import_stmt.level == 1 and package_dir:
+            # Single-dot imports dominate: trim one directory off the string
+            # instead of splitting, slicing and re-joining the parts
+            cut = package_dir.rfind(os.sep)
+            base = package_dir[:cut].replace(os.sep, ".") if cut != -1 else ""
+            if base and import_stmt.module:
+                return sys.intern(f"{base}.{import_stmt.module}")
+            return sys.intern(base or import_stmt.module)
 
-        parts = list(relative.parent.parts)
+        if package_dir is None:
+            parts = list(from_file.parent.parts)
+        else:
+            parts = package_dir.split(os.sep) if package_dir else []
 
         if import_stmt.level > len(parts):
             return import_stmt.module
@@ -275,36 +276,79 @@ class PythonImportResolver:
         if import_stmt.module:
             base_parts.append(import_stmt.module)
 
-        return ".".join(base_parts)
+        return sys.intern(".".join(base_parts))
+
+    @property
+    def project_modules(self) -> frozenset[str]:
+        # Frozen so the sorted index below cannot go stale; reassign to change
+        return self._project_modules
+
+    @project_modules.setter
+    def project_modules(self, modules: Iterable[str]) -> None:
+        self._project_modules = frozenset(modules)
+        self._sorted_modules = sorted(self._project_modules)
+
+    def _has_submodule(self, package: str) -> bool:
+        """Whether any project module lives below ``package`` (binary search)."""
+        prefix = package + "."
+        modules = self._sorted_modules
+        idx = bisect_left(modules, prefix)
+        return idx < len(modules) and modules[idx].startswith(prefix)
 
     def _find_internal(self, resolved: str, from_file: Path) -> str | None:
         if resolved in self.project_modules:
             return resolved
 
-        if any(m.startswith(resolved + ".") for m in self.project_modules):
+        if self._has_submodule(resolved):
             return resolved
 
-        for module in self.project_modules:
-            if resolved.startswith(module + "."):
-                return module
+        # Longest project module that is a package prefix of the import, so
+        # pkg.sub.models.User resolves to pkg.sub.models rather than pkg.sub
+        cut = resolved.rfind(".")
+        while cut != -1:
+            prefix = resolved[:cut]
+            if prefix in self.project_modules:
+                return prefix
+            cut = resolved.rfind(".", 0, cut)
 
-        try:
-            relative = from_file.relative_to(self.project_root)
-            current_parts = list(relative.parent.parts)
+        current_parts = self._package_parts(from_file)
+        if current_parts is None:
+            return None
 
-            for depth in range(1, len(current_parts) + 1):
-                parent = ".".join(current_parts[:depth])
-                candidate = f"{parent}.{resolved}"
+        for depth in range(1, len(current_parts) + 1):
+            parent = ".".join(current_parts[:depth])
+            candidate = f"{parent}.{resolved}"
 
-                if candidate in self.project_modules:
-                    return candidate
+            if candidate in self.project_modules:
+                return candidate
 
-                if any(m.startswith(candidate + ".") for m in self.project_modules):
-                    return candidate
-        except ValueError:
-            pass
+            if self._has_submodule(candidate):
+                return candidate
 
         return None
 
+    def _package_dir(self, from_file: Path) -> str | None:
+        """Directory of ``from_file`` relative to the project root.
+
+        Works on the string form to avoid building intermediate PurePath
+        objects; returns None when the file lies outside the root.
+        """
+        path = os.fspath(from_file)
+        if self._root_prefix:
+            if not path.startswith(self._root_prefix):
+                return None
+            path = path[len(self._root_prefix) :]
+        elif os.path.isabs(path):
+            return None
+        cut = path.rfind(os.sep)
+        return path[:cut] if cut != -1 else ""
+
+    def _package_parts(self, from_file: Path) -> list[str] | None:
+        """Directory components of ``from_file`` below the project root."""
+        package_dir = self._package_dir(from_file)
+        if package_dir is None:
+            return None
+        return package_dir.split(os.sep) if package_dir else []
+
     def set_project_modules(self, modules: set[str]):
         self.project_modules = modules
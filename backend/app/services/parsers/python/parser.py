@@ -1,11 +1,26 @@
+from functools import lru_cache
 from pathlib import Path
 
 from app.core import PYTHON_EXTENSIONS
 from app.core.models import Language, NodeType
-from app.services.parsers.base import ImportResolution, ParsedImport, ParsedNode
+from app.services.parsers.base import (
+    ImportResolution,
+    ParsedFile,
+    ParsedImport,
+    ParsedNode,
+)
 from app.services.parsers.python.import_resolver import PythonImportResolver
 from app.services.parsers.registry import ParserRegistry
-from app.services.parsers.tree_sitter_base import TreeSitterParser
+from app.services.parsers.tree_sitter_base import Captures, Source, TreeSitterParser
+
+
+@lru_cache(maxsize=16384)
+def _parts_to_module_id(parts: tuple[str, ...]) -> str:
+    if parts and parts[-1].endswith(".py"):
+        parts = (*parts[:-1], parts[-1][:-3])
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
 
 
 @ParserRegistry.register
@@ -36,21 +51,18 @@ class PythonParser(TreeSitterParser):
     def __init__(self):
         super().__init__()
         self._resolver: PythonImportResolver | None = None
+        self._project_modules: set[str] = set()
 
     def detect_project(self, path: Path) -> bool:
         indicators = ("pyproject.toml", "setup.py", "requirements.txt", "setup.cfg")
         return any((path / indicator).exists() for indicator in indicators)
 
-    def parse_file(self, path: Path, content: str | None = None) -> list[ParsedNode]:
-        source = content.encode("utf-8") if content else path.read_bytes()
-        tree = self.parse_source(source)
-
-        imports = self.extract_imports(tree, source)
-        classes = self.extract_classes(tree, source)
-        functions = self.extract_functions(tree, source)
+    def _build_parsed_file(self, path: Path, extracted: dict) -> ParsedFile:
+        imports = extracted["imports"]
+        classes = extracted["classes"]
+        functions = extracted["functions"]
 
         module_id = self._path_to_module_id(path)
-        nodes = []
 
         parsed_imports: list[ParsedImport] = []
         for imp in imports:
@@ -80,46 +92,49 @@ class PythonParser(TreeSitterParser):
                 )
             )
 
-        nodes.append(
-            ParsedNode(
-                id=module_id,
-                name=path.stem,
-                node_type=NodeType.MODULE,
-                language=Language.PYTHON,
-                file_path=str(path),
-                start_line=1,
-                end_line=tree.root_node.end_point[0] + 1,
-                imports=parsed_imports,
-            )
+        module_node = ParsedNode(
+            id=module_id,
+            name=path.stem,
+            node_type=NodeType.MODULE,
+            language=Language.PYTHON,
+            file_path=str(path),
+            start_line=1,
+            end_line=extracted["end_line"],
+            imports=parsed_imports,
         )
 
-        for cls in classes:
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{cls['name']}",
-                    name=cls["name"],
-                    node_type=NodeType.CLASS,
-                    language=Language.PYTHON,
-                    file_path=str(path),
-                    start_line=cls["start_line"],
-                    end_line=cls["end_line"],
+        def build_members() -> list[ParsedNode]:
+            nodes = []
+
+            for cls in classes:
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{cls['name']}",
+                        name=cls["name"],
+                        node_type=NodeType.CLASS,
+                        language=Language.PYTHON,
+                        file_path=str(path),
+                        start_line=cls["start_line"],
+                        end_line=cls["end_line"],
+                    )
                 )
-            )
 
-        for func in functions:
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}.{func['name']}",
-                    name=func["name"],
-                    node_type=NodeType.FUNCTION,
-                    language=Language.PYTHON,
-                    file_path=str(path),
-                    start_line=func["start_line"],
-                    end_line=func["end_line"],
+            for func in functions:
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}.{func['name']}",
+                        name=func["name"],
+                        node_type=NodeType.FUNCTION,
+                        language=Language.PYTHON,
+                        file_path=str(path),
+                        start_line=func["start_line"],
+                        end_line=func["end_line"],
+                    )
                 )
-            )
 
-        return nodes
+            return nodes
+
+        return ParsedFile(module_node, build_members)
 
     def resolve_import(
         self,
@@ -128,22 +143,23 @@ class PythonParser(TreeSitterParser):
         project_root: Path,
     ) -> ImportResolution:
         if not self._resolver or self._resolver.project_root != project_root:
-            self._resolver = PythonImportResolver(project_root)
+            self._resolver = PythonImportResolver(project_root, self._project_modules)
         return self._resolver.resolve(import_stmt, from_file)
 
     def set_project_modules(self, modules: set[str]):
+        self._project_modules = modules
         if self._resolver:
             self._resolver.set_project_modules(modules)
 
-    def _process_import_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_import_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
+        get_text = self.get_node_text
 
-        i = 0
-        while i < len(captures):
-            node, capture_name = captures[i]
-
+        for node, capture_name in captures:
             if capture_name == "module":
-                module_text = self.get_node_text(node, source)
+                module_text = get_text(node, source)
                 parent = node.parent
 
                 names = []
@@ -152,13 +168,11 @@ class PythonParser(TreeSitterParser):
                         if child.type == "import_list":
                             for name_node in child.children:
                                 if name_node.type == "dotted_name":
-                                    names.append(self.get_node_text(name_node, source))
+                                    names.append(get_text(name_node, source))
                                 elif name_node.type == "aliased_import":
                                     for sub in name_node.children:
                                         if sub.type == "dotted_name":
-                                            names.append(
-                                                self.get_node_text(sub, source)
-                                            )
+                                            names.append(get_text(sub, source))
                                             break
 
                 results.append(
@@ -178,9 +192,9 @@ class PythonParser(TreeSitterParser):
 
                 for child in node.children:
                     if child.type == "import_prefix":
-                        level = self.get_node_text(child, source).count(".")
+                        level = get_text(child, source).count(".")
                     elif child.type == "dotted_name":
-                        module_text = self.get_node_text(child, source)
+                        module_text = get_text(child, source)
 
                 names = []
                 if parent:
@@ -188,7 +202,7 @@ class PythonParser(TreeSitterParser):
                         if child.type == "import_list":
                             for name_node in child.children:
                                 if name_node.type == "dotted_name":
-                                    names.append(self.get_node_text(name_node, source))
+                                    names.append(get_text(name_node, source))
 
                 results.append(
                     {
@@ -200,11 +214,9 @@ class PythonParser(TreeSitterParser):
                     }
                 )
 
-            i += 1
-
         return results
 
-    def _process_class_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_class_captures(self, captures: Captures, source: Source) -> list[dict]:
         results = []
         for node, capture_name in captures:
             if capture_name == "name":
@@ -222,7 +234,9 @@ class PythonParser(TreeSitterParser):
                 )
         return results
 
-    def _process_function_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_function_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
         for node, capture_name in captures:
             if capture_name == "name":
@@ -241,9 +255,4 @@ class PythonParser(TreeSitterParser):
         return results
 
     def _path_to_module_id(self, path: Path) -> str:
-        parts = list(path.parts)
-        if parts and parts[-1].endswith(".py"):
-            parts[-1] = parts[-1][:-3]
-        if parts and parts[-1] == "__init__":
-            parts = parts[:-1]
-        return ".".join(parts) if parts else path.stem
+        return _parts_to_module_id(path.parts) or path.stem
@@ -1,32 +1,77 @@
+import os
 from pathlib import Path
 from typing import ClassVar
 
 from app.core.models import Language
 from app.services.parsers.base import BaseParser
 
+# Vendored, generated and VCS directories never hold project sources
+_DETECT_SKIP_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "bower_components",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        "site-packages",
+        "target",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+
 
 class ParserRegistry:
     _parsers: ClassVar[dict[Language, type[BaseParser]]] = {}
     _extension_map: ClassVar[dict[str, Language]] = {}
+    _instances: ClassVar[dict[Language, BaseParser]] = {}
+    # Extension map as (suffix, language) pairs, longest suffix first
+    _ext_pairs: ClassVar[tuple[tuple[str, Language], ...]] = ()
 
     @classmethod
     def register(cls, parser_class: type[BaseParser]) -> type[BaseParser]:
         cls._parsers[parser_class.language] = parser_class
+        cls._instances.pop(parser_class.language, None)
         for ext in parser_class.file_extensions:
             cls._extension_map[ext] = parser_class.language
+        cls._ext_pairs = tuple(
+            sorted(cls._extension_map.items(), key=lambda pair: -len(pair[0]))
+        )
         return parser_class
 
     @classmethod
     def get_parser(cls, language: Language) -> BaseParser:
+        """Return the shared parser for ``language``.
+
+        The instance is reused across callers, so it must only be used for
+        stateless parsing. Callers that set project modules or context need
+        their own instance from ``create_parser``.
+        """
+        if language not in cls._parsers:
+            raise ValueError(f"No parser registered for {language}")
+        parser = cls._instances.get(language)
+        if parser is None:
+            parser = cls._instances[language] = cls._parsers[language]()
+        return parser
+
+    @classmethod
+    def create_parser(cls, language: Language) -> BaseParser:
+        """Build a fresh parser for ``language`` with no project state."""
         if language not in cls._parsers:
             raise ValueError(f"No parser registered for {language}")
         return cls._parsers[language]()
 
     @classmethod
-    def get_parser_for_file(cls, path: Path) -> BaseParser | None:
-        ext = path.suffix.lower()
-        if ext in cls._extension_map:
-            return cls.get_parser(cls._extension_map[ext])
+    def get_parser_for_file(cls, path: Path | str) -> BaseParser | None:
+        name = (path.name if isinstance(path, Path) else os.path.basename(path)).lower()
+        for ext, language in cls._ext_pairs:
+            if name.endswith(ext) and len(name) > len(ext):
+                return cls.get_parser(language)
         return None
 
     @classmethod
@@ -48,9 +93,22 @@ class ParserRegistry:
                     detected.add(lang)
                     break
 
-        for path in project_path.rglob("*"):
-            if path.is_file() and path.suffix.lower() in cls._extension_map:
-                detected.add(cls._extension_map[path.suffix.lower()])
+        total = len(cls._parsers)
+        stack = [os.fspath(project_path)]
+        while stack and len(detected) < total:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _DETECT_SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            ext = os.path.splitext(entry.name)[1].lower()
+                            lang = cls._extension_map.get(ext)
+                            if lang is not None:
+                                detected.add(lang)
+            except OSError:
+                continue
 
         return list(detected)
 
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import re
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
+if sys.version_info >= (3, 11):
+    import tomllib
+
 from app.services.parsers.base import ImportResolution, ParsedImport, ProjectContext
 
 # Regex to match: name = "value" or name = 'value' (with optional whitespace)
@@ -20,6 +25,9 @@ RUST_STDLIB = frozenset(
     }
 )
 
+# Leading path segments that refer to the current crate
+_INTERNAL_ROOTS = frozenset({"crate", "super", "self"})
+
 
 @dataclass
 class RustImportResolver:
@@ -44,6 +52,21 @@ class RustImportResolver:
         except OSError:
             return
 
+        if sys.version_info >= (3, 11):
+            try:
+                package = tomllib.loads(content).get("package", {})
+            except tomllib.TOMLDecodeError:
+                pass
+            else:
+                name = package.get("name") if isinstance(package, dict) else None
+                if isinstance(name, str):
+                    self.crate_name = name
+                return
+
+        self._scan_cargo_toml(content)
+
+    def _scan_cargo_toml(self, content: str) -> None:
+        """Line-based fallback for Cargo.toml files tomllib cannot read."""
         in_package = False
         for line in content.splitlines():
             stripped = line.strip()
@@ -67,44 +90,20 @@ class RustImportResolver:
 
     def resolve(self, import_stmt: ParsedImport, from_file: Path) -> ImportResolution:
         """Resolve a Rust use path."""
-        use_path = import_stmt.module
-
-        # Handle crate-relative paths
-        if use_path.startswith("crate::"):
-            return ImportResolution(
-                resolved_path=use_path,
-                is_internal=True,
-                is_external=False,
-                is_stdlib=False,
-                package_name=self.crate_name or "crate",
-            )
-
-        # Handle super/self paths (relative imports)
-        if use_path.startswith("super::") or use_path.startswith("self::"):
-            return ImportResolution(
-                resolved_path=use_path,
-                is_internal=True,
-                is_external=False,
-                is_stdlib=False,
-                package_name=self.crate_name or "crate",
-            )
-
-        # Check if standard library
-        root_crate = use_path.split("::")[0]
-        if root_crate in RUST_STDLIB:
-            return ImportResolution(
-                resolved_path=use_path,
-                is_internal=False,
-                is_external=False,
-                is_stdlib=True,
-                package_name=root_crate,
-            )
-
-        # External crate
-        return ImportResolution(
-            resolved_path=use_path,
-            is_internal=False,
-            is_external=True,
-            is_stdlib=False,
-            package_name=root_crate,
-        )
+        return _classify_use_path(import_stmt.module, self.crate_name)
+
+
+@lru_cache(maxsize=8192)
+def _classify_use_path(use_path: str, crate_name: str) -> ImportResolution:
+    """Classify a use path by its first segment; results are immutable and shared."""
+    root_crate, sep, _ = use_path.partition("::")
+
+    # crate/super/self paths are internal (crate-relative or relative imports)
+    if sep and root_crate in _INTERNAL_ROOTS:
+        return ImportResolution.internal(use_path, crate_name or "crate")
+
+    if root_crate in RUST_STDLIB:
+        return ImportResolution.stdlib(use_path, root_crate)
+
+    # External crate
+    return ImportResolution.external(use_path, root_crate)
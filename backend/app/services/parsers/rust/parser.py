@@ -1,20 +1,43 @@
 from __future__ import annotations
 
+import os
+import re
 from pathlib import Path
 
-from tree_sitter import Query
+from cachetools import LRUCache
+from tree_sitter import Node, Query
 
 from app.core import RUST_EXTENSIONS
 from app.core.models import Language, NodeType
 from app.services.parsers.base import (
     ImportResolution,
+    ParsedFile,
     ParsedImport,
     ParsedNode,
     ProjectContext,
 )
 from app.services.parsers.registry import ParserRegistry
 from app.services.parsers.rust.import_resolver import RustImportResolver
-from app.services.parsers.tree_sitter_base import TreeSitterParser
+from app.services.parsers.tree_sitter_base import Captures, Source, TreeSitterParser
+
+# Leaf node types that contribute a segment to a flattened use path
+_SCOPED_ATOMS = frozenset({"identifier", "type_identifier", "crate", "super", "self"})
+
+# Distinct project roots whose resolvers are kept alive at once
+_MAX_CACHED_RESOLVERS = 8
+
+# Files that stand for their directory's module rather than a child of it
+_MODULE_ROOT_STEMS = frozenset({"mod", "lib", "main"})
+
+# Both path separators become Rust's "::" in a single pass
+_SEP_TABLE = str.maketrans({"/": "::", "\\": "::"})
+
+# Node type of a captured type name, keyed by its parent item; others are classes
+_PARENT_NODE_TYPES = {
+    "trait_item": NodeType.INTERFACE,
+    "enum_item": NodeType.CLASS,
+    "impl_item": NodeType.CLASS,
+}
 
 
 @ParserRegistry.register
@@ -38,61 +61,91 @@ class RustParser(TreeSitterParser):
 
     CLASS_QUERY = """
     (struct_item
-      name: (type_identifier) @name)
+      name: (type_identifier) @type_name)
     (enum_item
-      name: (type_identifier) @name)
+      name: (type_identifier) @type_name)
     (trait_item
-      name: (type_identifier) @name)
+      name: (type_identifier) @type_name)
     (impl_item
-      type: (type_identifier) @name)
+      type: (type_identifier) @type_name)
     """
 
     FUNCTION_QUERY = """
     (function_item
-      name: (identifier) @name)
+      name: (identifier) @fn_name)
     """
 
+    # All of the above in one query so a file is traversed once; capture
+    # names are distinct per pattern so matches can be routed back
+    COMBINED_QUERY = USE_QUERY + MODULE_DECL_QUERY + CLASS_QUERY + FUNCTION_QUERY
+
+    # Every pattern above needs one of these keywords as a whole token;
+    # comment-only stubs, empty mod.rs files and const tables are answered
+    # without a parse. Identifiers such as `refund` or `model` do not match.
+    DECLARATION_PATTERN = re.compile(rb"\b(?:use|mod|struct|enum|trait|impl|fn)\b")
+
     def __init__(self) -> None:
         super().__init__()
         self._resolver: RustImportResolver | None = None
+        # Resolvers for recently seen roots; reading Cargo.toml is only paid
+        # once per root when a batch alternates between projects
+        self._resolvers: LRUCache[Path, RustImportResolver] = LRUCache(
+            maxsize=_MAX_CACHED_RESOLVERS
+        )
         self._project_context: ProjectContext | None = None
         # Compile separate queries for use declarations and module declarations
         self._use_query: Query | None = None
         self._module_decl_query: Query | None = None
         if self.USE_QUERY:
-            self._use_query = Query(self.ts_language, self.USE_QUERY)
+            self._use_query = self._compile(self.USE_QUERY)
         if self.MODULE_DECL_QUERY:
-            self._module_decl_query = Query(self.ts_language, self.MODULE_DECL_QUERY)
+            self._module_decl_query = self._compile(self.MODULE_DECL_QUERY)
+        self._combined_query = self._compile(self.COMBINED_QUERY)
 
     def detect_project(self, path: Path) -> bool:
         return (path / "Cargo.toml").exists()
 
-    def extract_imports(self, tree, source: bytes) -> list[dict]:
+    def extract_all(self, tree, source: Source) -> dict:
+        """Extract imports, types and functions in a single query pass."""
+        captures: dict[str, list[tuple[Node, str]]] = {
+            "use": [],
+            "mod_name": [],
+            "type_name": [],
+            "fn_name": [],
+        }
+        for capture in self._iter_captures(self._combined_query, tree.root_node):
+            captures[capture[1]].append(capture)
+
+        return {
+            "imports": self._process_use_captures(captures["use"], source)
+            + self._process_module_decl_captures(captures["mod_name"], source),
+            "classes": self._process_class_captures(captures["type_name"], source),
+            "functions": self._process_function_captures(captures["fn_name"], source),
+            "end_line": tree.root_node.end_point[0] + 1,
+        }
+
+    def extract_imports(self, tree, source: Source) -> list[dict]:
         """Extract both use declarations and module declarations."""
         results = []
 
         # Extract use declarations (actual imports)
         if self._use_query:
-            use_captures = self._run_query(self._use_query, tree.root_node)
+            use_captures = self._iter_captures(self._use_query, tree.root_node)
             results.extend(self._process_use_captures(use_captures, source))
 
         # Extract module declarations (file references)
         if self._module_decl_query:
-            mod_captures = self._run_query(self._module_decl_query, tree.root_node)
+            mod_captures = self._iter_captures(self._module_decl_query, tree.root_node)
             results.extend(self._process_module_decl_captures(mod_captures, source))
 
         return results
 
-    def parse_file(self, path: Path, content: str | None = None) -> list[ParsedNode]:
-        source = content.encode("utf-8") if content else path.read_bytes()
-        tree = self.parse_source(source)
-
-        imports = self.extract_imports(tree, source)
-        types = self.extract_classes(tree, source)
-        functions = self.extract_functions(tree, source)
+    def _build_parsed_file(self, path: Path, extracted: dict) -> ParsedFile:
+        imports = extracted["imports"]
+        types = extracted["classes"]
+        functions = extracted["functions"]
 
         module_id = self._path_to_module_id(path)
-        nodes = []
 
         parsed_imports = [
             ParsedImport(
@@ -115,47 +168,51 @@ class RustParser(TreeSitterParser):
                     )
                 )
 
-        nodes.append(
-            ParsedNode(
-                id=module_id,
-                name=path.stem,
-                node_type=NodeType.MODULE,
-                language=self.language,
-                file_path=str(path),
-                start_line=1,
-                end_line=tree.root_node.end_point[0] + 1,
-                imports=parsed_imports,
-                exports=[],
-            )
+        file_path = str(path)
+        module = ParsedNode(
+            id=module_id,
+            name=path.stem,
+            node_type=NodeType.MODULE,
+            language=self.language,
+            file_path=file_path,
+            start_line=1,
+            end_line=extracted["end_line"],
+            imports=parsed_imports,
+            exports=[],
         )
 
-        for type_def in types:
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}::{type_def['name']}",
-                    name=type_def["name"],
-                    node_type=type_def.get("node_type", NodeType.CLASS),
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=type_def["start_line"],
-                    end_line=type_def["end_line"],
+        def build_members() -> list[ParsedNode]:
+            nodes = []
+
+            for type_def in types:
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}::{type_def['name']}",
+                        name=type_def["name"],
+                        node_type=NodeType(type_def.get("node_type", NodeType.CLASS)),
+                        language=self.language,
+                        file_path=file_path,
+                        start_line=type_def["start_line"],
+                        end_line=type_def["end_line"],
+                    )
                 )
-            )
 
-        for func in functions:
-            nodes.append(
-                ParsedNode(
-                    id=f"{module_id}::{func['name']}",
-                    name=func["name"],
-                    node_type=NodeType.FUNCTION,
-                    language=self.language,
-                    file_path=str(path),
-                    start_line=func["start_line"],
-                    end_line=func["end_line"],
+            for func in functions:
+                nodes.append(
+                    ParsedNode(
+                        id=f"{module_id}::{func['name']}",
+                        name=func["name"],
+                        node_type=NodeType.FUNCTION,
+                        language=self.language,
+                        file_path=file_path,
+                        start_line=func["start_line"],
+                        end_line=func["end_line"],
+                    )
                 )
-            )
 
-        return nodes
+            return nodes
+
+        return ParsedFile(module, build_members)
 
     def resolve_import(
         self,
@@ -163,33 +220,43 @@ class RustParser(TreeSitterParser):
         from_file: Path,
         project_root: Path,
     ) -> ImportResolution:
-        if not self._resolver or self._resolver.project_root != project_root:
-            self._resolver = RustImportResolver(project_root)
-            if self._project_context:
-                self._resolver.set_context(self._project_context)
-        return self._resolver.resolve(import_stmt, from_file)
+        resolver = self._resolver
+        if not resolver or resolver.project_root != project_root:
+            resolver = self._resolvers.get(project_root)
+            if resolver is None:
+                resolver = RustImportResolver(project_root)
+                if self._project_context:
+                    resolver.set_context(self._project_context)
+                self._resolvers[project_root] = resolver
+            self._resolver = resolver
+        return resolver.resolve(import_stmt, from_file)
 
     def set_project_context(self, context: ProjectContext) -> None:
         self._project_context = context
-        if self._resolver:
-            self._resolver.set_context(context)
+        for resolver in self._resolvers.values():
+            resolver.set_context(context)
 
-    def _process_import_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_import_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         """Not used - see _process_use_captures and _process_module_decl_captures."""
         return []
 
-    def _process_use_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_use_captures(self, captures: Captures, source: Source) -> list[dict]:
         """Process use declaration captures."""
         results = []
         seen: set[str] = set()
 
+        append = results.append
+        extract_use_path = self._extract_use_path
+
         for node, capture_name in captures:
             if capture_name == "use":
-                path = self._extract_use_path(node, source)
+                path = extract_use_path(node, source)
                 if path and path not in seen:
                     seen.add(path)
                     is_relative = path.startswith(("super::", "self::", "crate::"))
-                    results.append(
+                    append(
                         {
                             "type": "use",
                             "path": path,
@@ -201,15 +268,17 @@ class RustParser(TreeSitterParser):
         return results
 
     def _process_module_decl_captures(
-        self, captures: list, source: bytes
+        self, captures: Captures, source: Source
     ) -> list[dict]:
         """Process module declaration captures (mod foo;)."""
         results = []
+        get_text = self.get_node_text
         seen: set[str] = set()
+        append = results.append
 
         for node, capture_name in captures:
             if capture_name == "mod_name":
-                mod_name = self.get_node_text(node, source)
+                mod_name = get_text(node, source)
                 parent = node.parent
                 if parent and parent.type == "mod_item":
                     # Only include mod declarations without body (mod foo;)
@@ -219,7 +288,7 @@ class RustParser(TreeSitterParser):
                     )
                     if not has_body and mod_name not in seen:
                         seen.add(mod_name)
-                        results.append(
+                        append(
                             {
                                 "type": "mod",
                                 "path": mod_name,
@@ -230,112 +299,116 @@ class RustParser(TreeSitterParser):
 
         return results
 
-    def _extract_use_path(self, node, source: bytes) -> str:
+    def _extract_use_path(self, node, source: Source) -> str:
         """Extract the use path from a use_declaration node."""
         for child in node.children:
-            if child.type == "scoped_identifier":
+            ctype = child.type
+            if ctype == "scoped_identifier":
                 return self._flatten_scoped_identifier(child, source)
-            elif child.type == "identifier":
+            elif ctype == "identifier":
                 return self.get_node_text(child, source)
-            elif child.type == "scoped_use_list":
-                # Handle use path::{a, b, c}
-                base = self._get_use_base(child, source)
-                return base
-            elif child.type == "use_wildcard":
-                # Handle use path::*
+            elif ctype == "scoped_use_list" or ctype == "use_wildcard":
+                # Handle use path::{a, b, c} and use path::*
                 return self._get_use_base(child, source)
         return ""
 
-    def _get_use_base(self, node, source: bytes) -> str:
+    def _get_use_base(self, node, source: Source) -> str:
         """Get the base path from a scoped_use_list or use_wildcard."""
         for child in node.children:
-            if child.type == "scoped_identifier":
+            ctype = child.type
+            if ctype == "scoped_identifier":
                 return self._flatten_scoped_identifier(child, source)
-            elif child.type == "identifier":
+            elif ctype == "identifier":
                 return self.get_node_text(child, source)
         return ""
 
-    def _flatten_scoped_identifier(self, node, source: bytes) -> str:
-        """Recursively flatten a scoped_identifier to a :: path."""
-        parts = []
-        for child in node.children:
-            if child.type == "scoped_identifier":
-                parts.append(self._flatten_scoped_identifier(child, source))
-            elif child.type == "identifier":
-                parts.append(self.get_node_text(child, source))
-            elif child.type in ("crate", "super", "self"):
-                parts.append(self.get_node_text(child, source))
-            elif child.type == "type_identifier":
-                parts.append(self.get_node_text(child, source))
+    def _flatten_scoped_identifier(self, node, source: Source) -> str:
+        """Flatten a scoped_identifier to a :: path."""
+        parts: list[str] = []
+        self._collect_scoped_parts(node, source, parts)
         return "::".join(parts)
 
-    def _process_class_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _collect_scoped_parts(self, node, source: Source, parts: list[str]) -> None:
+        """Append path segments depth-first into one shared list.
+
+        Nested scopes used to be joined at every level and then re-joined by
+        the caller; sharing the list makes flattening linear in path length.
+        """
+        get_text = self.get_node_text
+        for child in node.children:
+            ctype = child.type
+            if ctype == "scoped_identifier":
+                self._collect_scoped_parts(child, source, parts)
+            elif ctype in _SCOPED_ATOMS:
+                parts.append(get_text(child, source))
+
+    def _process_class_captures(self, captures: Captures, source: Source) -> list[dict]:
         results = []
-        seen = set()
+        append = results.append
+        get_text = self.get_node_text
+        seen: set[tuple[int, str]] = set()
 
         for node, capture_name in captures:
-            if capture_name == "name":
-                name = self.get_node_text(node, source)
-                key = f"{node.start_point[0]}:{name}"
+            if capture_name == "type_name":
+                name = get_text(node, source)
+                key = (node.start_point[0], name)
                 if key in seen:
                     continue
                 seen.add(key)
 
+                # The enclosing item gives the line span; the name node is
+                # the fallback for a parentless capture
                 parent = node.parent
-                node_type = NodeType.CLASS
-
                 if parent:
-                    if parent.type == "trait_item":
-                        node_type = NodeType.INTERFACE
-                    elif parent.type == "enum_item":
-                        node_type = NodeType.CLASS
-                    elif parent.type == "impl_item":
-                        node_type = NodeType.CLASS
-
-                results.append(
+                    span = parent
+                    node_type = _PARENT_NODE_TYPES.get(parent.type, NodeType.CLASS)
+                else:
+                    span = node
+                    node_type = NodeType.CLASS
+
+                append(
                     {
                         "name": name,
-                        "start_line": parent.start_point[0] + 1
-                        if parent
-                        else node.start_point[0] + 1,
-                        "end_line": parent.end_point[0] + 1
-                        if parent
-                        else node.end_point[0] + 1,
+                        "start_line": span.start_point[0] + 1,
+                        "end_line": span.end_point[0] + 1,
                         "node_type": node_type,
                     }
                 )
 
         return results
 
-    def _process_function_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_function_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         results = []
-        seen = set()
+        append = results.append
+        get_text = self.get_node_text
+        seen: set[tuple[int, str]] = set()
 
         for node, capture_name in captures:
-            if capture_name == "name":
-                name = self.get_node_text(node, source)
-                key = f"{node.start_point[0]}:{name}"
+            if capture_name == "fn_name":
+                name = get_text(node, source)
+                key = (node.start_point[0], name)
                 if key in seen:
                     continue
                 seen.add(key)
 
-                parent = node.parent
-                results.append(
+                span = node.parent or node
+                append(
                     {
                         "name": name,
-                        "start_line": parent.start_point[0] + 1
-                        if parent
-                        else node.start_point[0] + 1,
-                        "end_line": parent.end_point[0] + 1
-                        if parent
-                        else node.end_point[0] + 1,
+                        "start_line": span.start_point[0] + 1,
+                        "end_line": span.end_point[0] + 1,
                     }
                 )
 
         return results
 
     def _path_to_module_id(self, path: Path) -> str:
-        name = path.stem
-        if name in ("mod", "lib", "main"):
-            return str(path.parent).replace("/", "::").replace("\\", "::")
-        return str(path.with_suffix("")).replace("/", "::").replace("\\", "::")
+        if path.stem in _MODULE_ROOT_STEMS:
+            return os.fspath(path.parent).translate(_SEP_TABLE)
+        module = os.fspath(path)
+        suffix = path.suffix
+        if suffix:
+            module = module[: -len(suffix)]
+        return module.translate(_SEP_TABLE)
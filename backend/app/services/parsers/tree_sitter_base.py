@@ -1,10 +1,145 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import sys
+import threading
+import zlib
 from abc import abstractmethod
+from collections.abc import Iterable, Iterator
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 
-from tree_sitter import Query, QueryCursor
+from tree_sitter import Language, Node, Query, QueryCursor
 from tree_sitter_language_pack import SupportedLanguage, get_language, get_parser
 
-from app.services.parsers.base import BaseParser
+from app.core import get_logger
+from app.core.config import settings
+from app.services.parsers.base import BaseParser, ParsedFile, ParsedNode
+from app.utils.atomic_write import write_atomic
+
+logger = get_logger(__name__)
+
+# (captured node, capture name) pairs in match order
+Captures = Iterable[tuple[Node, str]]
+
+# File contents as read by ``read_source``: bytes, or a read-only mmap for
+# large files
+Source = bytes | mmap.mmap
+
+# Compiled queries keyed by (grammar, query source). Query objects are
+# immutable and the grammar set is bounded, so the cache is held strongly.
+_QUERY_CACHE: dict[tuple[Language, str], Query] = {}
+
+# Bump when the shape of extracted imports/classes/functions changes
+PARSE_CACHE_FORMAT = 2
+
+# Node texts shorter than this many bytes (module names, identifiers) are
+# interned so the many repeats across a project share one object and
+# hash/compare by identity
+_INTERN_MAX_LEN = 64
+
+# Decoded short texts keyed by their source bytes, so a repeated identifier
+# costs a dict lookup instead of a decode. Stops growing once full.
+_TEXT_CACHE: dict[bytes, str] = {}
+_TEXT_CACHE_MAX = 16384
+
+# Files at least this large are memory-mapped rather than copied into a bytes
+# object; below it the extra mmap syscalls cost more than the copy they save
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def compile_query(language: Language, source: str) -> Query:
+    """Compile a query once per process and reuse it for every parser."""
+    key = (language, source)
+    query = _QUERY_CACHE.get(key)
+    if query is None:
+        query = _QUERY_CACHE[key] = Query(language, source)
+    return query
+
+
+def _pack_payload(payload: dict) -> bytes:
+    """Serialize an extraction payload as zlib-compressed positional JSON.
+
+    Row dicts become ``[schema, *values]`` lists, where ``schema`` indexes a
+    shared table of key tuples, so key names are stored once per entry.
+    """
+    schemas: dict[tuple[str, ...], int] = {}
+    packed = {}
+    for section, value in payload.items():
+        if isinstance(value, list):
+            rows = []
+            for row in value:
+                schema = schemas.setdefault(tuple(row), len(schemas))
+                rows.append([schema, *row.values()])
+            value = rows
+        packed[section] = value
+    document = json.dumps({"k": list(schemas), "p": packed}, separators=(",", ":"))
+    return zlib.compress(document.encode("utf-8"), 3)
+
+
+def _unpack_payload(data: bytes) -> dict:
+    document = json.loads(zlib.decompress(data))
+    schemas = document["k"]
+    return {
+        section: [dict(zip(schemas[row[0]], row[1:])) for row in value]
+        if isinstance(value, list)
+        else value
+        for section, value in document["p"].items()
+    }
+
+
+def _grammar_version() -> str:
+    try:
+        return version("tree-sitter-language-pack")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ParseCache:
+    """On-disk cache of per-file extraction results keyed by source SHA-256.
+
+    Entries live at ``{root}/parse/{language}/{digest[:2]}/{digest[2:]}.jz`` as
+    compressed positional JSON (see ``_pack_payload``).
+    Each language directory carries a ``version`` file; when the grammar or
+    cache format changes, the directory is wiped on first use. Raises
+    ``OSError`` if the directory cannot be initialized.
+    """
+
+    def __init__(self, root: Path, language_name: str, grammar_version: str):
+        self.directory = Path(root) / "parse" / language_name
+        self.version = f"{PARSE_CACHE_FORMAT}:{grammar_version}:{language_name}"
+        self._ensure_version()
+
+    def _ensure_version(self) -> None:
+        marker = self.directory / "version"
+        try:
+            if marker.read_text(encoding="utf-8") == self.version:
+                return
+        except OSError:
+            pass
+        shutil.rmtree(self.directory, ignore_errors=True)
+        write_atomic(marker, self.version.encode())
+
+    def _entry(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest[2:]}.jz"
+
+    def load(self, digest: str) -> dict | None:
+        try:
+            with open(self._entry(digest), "rb") as f:
+                return _unpack_payload(f.read())
+        except (OSError, ValueError, zlib.error, LookupError, TypeError):
+            return None
+
+    def store(self, digest: str, payload: dict) -> None:
+        """Write an entry atomically; failures only cost a future cache miss."""
+        entry = self._entry(digest)
+        try:
+            write_atomic(entry, _pack_payload(payload))
+        except OSError as e:
+            logger.debug("Could not write parse cache entry %s: %s", entry, e)
 
 
 class TreeSitterParser(BaseParser):
@@ -12,72 +147,208 @@ class TreeSitterParser(BaseParser):
     IMPORT_QUERY: str = ""
     CLASS_QUERY: str = ""
     FUNCTION_QUERY: str = ""
+    # Matches a token the queries need to find anything; sources it does not
+    # match skip tree-sitter. None means always parse.
+    DECLARATION_PATTERN: re.Pattern[bytes] | None = None
 
     def __init__(self):
         self.ts_language = get_language(self.language_name)
         self.parser = get_parser(self.language_name)
+        # tree-sitter parsers are stateful; each thread gets its own
+        self._local = threading.local()
+        self._local.parser = self.parser
         self._import_query = None
         self._class_query = None
         self._function_query = None
         self._compile_queries()
+        self._parse_cache: ParseCache | None = None
+        if settings.parse_cache_dir:
+            self.set_parse_cache(Path(settings.parse_cache_dir))
 
     def _compile_queries(self):
         if self.IMPORT_QUERY:
-            self._import_query = Query(self.ts_language, self.IMPORT_QUERY)
+            self._import_query = self._compile(self.IMPORT_QUERY)
         if self.CLASS_QUERY:
-            self._class_query = Query(self.ts_language, self.CLASS_QUERY)
+            self._class_query = self._compile(self.CLASS_QUERY)
         if self.FUNCTION_QUERY:
-            self._function_query = Query(self.ts_language, self.FUNCTION_QUERY)
+            self._function_query = self._compile(self.FUNCTION_QUERY)
 
-    def _run_query(self, query: Query, node) -> list[tuple]:
-        """Run a query and return captures in the legacy format (node, capture_name)."""
-        cursor = QueryCursor(query)
-        captures = []
-        for _pattern_idx, capture_dict in cursor.matches(node):
+    def _compile(self, source: str) -> Query:
+        return compile_query(self.ts_language, source)
+
+    def _iter_captures(self, query: Query, node: Node) -> Iterator[tuple[Node, str]]:
+        """Yield (node, capture_name) pairs in match order without building a list."""
+        for _pattern_idx, capture_dict in QueryCursor(query).matches(node):
             for capture_name, nodes in capture_dict.items():
                 for captured_node in nodes:
-                    captures.append((captured_node, capture_name))
-        return captures
+                    yield captured_node, capture_name
+
+    def set_parse_cache(self, root: Path | None) -> None:
+        """Enable the on-disk parse cache under ``root``, or disable it with None.
+
+        A cache directory that cannot be initialized leaves the cache disabled.
+        """
+        self._parse_cache = None
+        if root is None:
+            return
+        try:
+            self._parse_cache = ParseCache(root, self.language_name, _grammar_version())
+        except OSError as e:
+            logger.debug("Could not initialize parse cache under %s: %s", root, e)
+
+    def parse_file(self, path: Path, content: str | None = None) -> ParsedFile:
+        return self._build_parsed_file(path, self.extract_cached(path, content))
+
+    def parse_module(self, path: Path, content: str | None = None) -> ParsedNode:
+        """Parse just the module node, running only the queries it needs."""
+        extracted = self.extract_cached(path, content, module_only=True)
+        return self._build_parsed_file(path, extracted).module
+
+    @abstractmethod
+    def _build_parsed_file(self, path: Path, extracted: dict) -> ParsedFile:
+        """Build the file's nodes from an ``extract_cached`` payload."""
+
+    def extract_cached(
+        self, path: Path, content: str | None = None, module_only: bool = False
+    ) -> dict:
+        """Parse a file and run the extraction queries, reusing cached results.
 
-    def parse_source(self, source: bytes):
-        return self.parser.parse(source)
+        Returns ``{"imports", "classes", "functions", "end_line"}``. With the
+        parse cache enabled, unchanged sources skip tree-sitter entirely.
+        ``module_only`` skips the class and function queries, leaving those
+        lists empty; with the cache enabled it is ignored, since only full
+        results are cached and a hit beats any query.
+        """
+        source = content.encode("utf-8") if content else self.read_source(path)
+
+        pattern = self.DECLARATION_PATTERN
+        if pattern is not None and pattern.search(source) is None:
+            text = source if isinstance(source, bytes) else bytes(source)
+            return {
+                "imports": [],
+                "classes": [],
+                "functions": [],
+                "end_line": text.count(b"\n") + 1,
+            }
+
+        cache = self._parse_cache
+        digest = ""
+        if cache is not None:
+            digest = hashlib.sha256(source).hexdigest()
+            cached = cache.load(digest)
+            if cached is not None:
+                return cached
+
+        tree = self.parse_source(source)
+        if module_only and cache is None:
+            return self.extract_module(tree, source)
+
+        payload = self.extract_all(tree, source)
+        if cache is not None:
+            cache.store(digest, payload)
+        return payload
+
+    def parse_source(self, source: Source):
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = get_parser(self.language_name)
+        # tree-sitter reads any buffer, but its stubs only name bytes-likes
+        return parser.parse(source if isinstance(source, bytes) else memoryview(source))
+
+    def read_source(self, path: Path) -> Source:
+        """Read a source file with a single fstat-sized os.read.
+
+        Large files are returned as a read-only mmap, which tree-sitter, hashlib
+        and ``get_node_text`` slicing accept in place of bytes. The mapping is
+        released once the last reference to it (usually the source) goes away.
+        """
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            size = os.fstat(fd).st_size
+            if size >= _MMAP_MIN_SIZE:
+                return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            data = os.read(fd, size) if size else b""
+            while len(data) < size:
+                chunk = os.read(fd, size - len(data))
+                if not chunk:
+                    break
+                data += chunk
+            return data
+        finally:
+            os.close(fd)
 
     def parse_file_tree(self, path: Path, content: str | None = None):
         if content is not None:
             source = content.encode("utf-8")
         else:
-            source = path.read_bytes()
+            source = self.read_source(path)
         return self.parse_source(source)
 
-    def extract_imports(self, tree, source: bytes) -> list[dict]:
+    def extract_module(self, tree, source: Source) -> dict:
+        """Run the extractions the module node needs, leaving members empty.
+
+        Subclasses that record more about the module (exports, hints) extend this.
+        """
+        return {
+            "imports": self.extract_imports(tree, source),
+            "classes": [],
+            "functions": [],
+            "end_line": tree.root_node.end_point[0] + 1,
+        }
+
+    def extract_all(self, tree, source: Source) -> dict:
+        """Run every extraction over a parsed tree.
+
+        Subclasses whose queries can share one traversal override this.
+        """
+        extracted = self.extract_module(tree, source)
+        extracted["classes"] = self.extract_classes(tree, source)
+        extracted["functions"] = self.extract_functions(tree, source)
+        return extracted
+
+    def extract_imports(self, tree, source: Source) -> list[dict]:
         if not self._import_query:
             return []
-        captures = self._run_query(self._import_query, tree.root_node)
+        captures = self._iter_captures(self._import_query, tree.root_node)
         return self._process_import_captures(captures, source)
 
-    def extract_classes(self, tree, source: bytes) -> list[dict]:
+    def extract_classes(self, tree, source: Source) -> list[dict]:
         if not self._class_query:
             return []
-        captures = self._run_query(self._class_query, tree.root_node)
+        captures = self._iter_captures(self._class_query, tree.root_node)
         return self._process_class_captures(captures, source)
 
-    def extract_functions(self, tree, source: bytes) -> list[dict]:
+    def extract_functions(self, tree, source: Source) -> list[dict]:
         if not self._function_query:
             return []
-        captures = self._run_query(self._function_query, tree.root_node)
+        captures = self._iter_captures(self._function_query, tree.root_node)
         return self._process_function_captures(captures, source)
 
-    def get_node_text(self, node, source: bytes) -> str:
-        return source[node.start_byte : node.end_byte].decode("utf-8")
+    def get_node_text(self, node, source: Source) -> str:
+        start = node.start_byte
+        end = node.end_byte
+        if end - start >= _INTERN_MAX_LEN:
+            return source[start:end].decode("utf-8")
+        raw = source[start:end]
+        text = _TEXT_CACHE.get(raw)
+        if text is None:
+            text = sys.intern(raw.decode("utf-8"))
+            if len(_TEXT_CACHE) < _TEXT_CACHE_MAX:
+                _TEXT_CACHE[raw] = text
+        return text
 
     @abstractmethod
-    def _process_import_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_import_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         pass
 
     @abstractmethod
-    def _process_class_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_class_captures(self, captures: Captures, source: Source) -> list[dict]:
         pass
 
     @abstractmethod
-    def _process_function_captures(self, captures: list, source: bytes) -> list[dict]:
+    def _process_function_captures(
+        self, captures: Captures, source: Source
+    ) -> list[dict]:
         pass
@@ -0,0 +1,71 @@
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from app.core.models import PerformanceSeverity
+
+# Package roots a module path is taken from, in order of preference
+_PACKAGE_ROOTS = ("app", "src", "lib")
+
+# Modules below this share of total time (%) are not worth reporting as
+# bottlenecks
+SIGNIFICANT_TIME_PERCENTAGE = 0.5
+
+# Lower bounds (% of total time) of the low/medium/high/critical severities;
+# anything below the first is "normal"
+_SEVERITY_THRESHOLDS = (1.0, 5.0, 10.0, 20.0)
+_SEVERITY_LABELS: tuple[PerformanceSeverity, ...] = (
+    "normal",
+    "low",
+    "medium",
+    "high",
+    "critical",
+)
+
+
+@dataclass(slots=True)
+class FileAggregate:
+    """Per-file totals and raw function rows grouped by a profile parser."""
+
+    total_time: float = 0.0
+    self_time: float = 0.0
+    calls: int = 0
+    funcs: list[tuple] = field(default_factory=list)
+
+
+def severity_for(time_percentage: float) -> PerformanceSeverity:
+    """Classify a module's share of total time (%) into a severity label."""
+    return _SEVERITY_LABELS[bisect_right(_SEVERITY_THRESHOLDS, time_percentage)]
+
+
+@lru_cache(maxsize=8192)
+def module_from_filename(filename: str) -> str:
+    """Map a source path to a dotted module path, once per distinct file.
+
+    Shared by the cProfile and py-spy parsers, which both see the same
+    filename once per function or frame.
+
+    Example: /home/user/project/app/services/metrics_service.py
+    -> app.services.metrics_service
+    """
+    if os.altsep:
+        filename = filename.replace(os.altsep, os.sep)
+    parts = [part for part in filename.split(os.sep) if part and part != "."]
+    if not parts:
+        return ""
+    name = parts[-1]
+    # Nearly every profiled file is a .py; splitext only for anything else
+    stem = (
+        name[:-3]
+        if len(name) > 3 and name.endswith(".py")
+        else os.path.splitext(name)[0]
+    )
+
+    # Take the path from the first common Python package root onwards
+    for root in _PACKAGE_ROOTS:
+        if root in parts:
+            return ".".join([*parts[parts.index(root) : -1], stem])
+
+    # Fallback: use the file stem (filename without extension)
+    return stem
@@ -1,18 +1,138 @@
-import pstats
-from collections import defaultdict
+import hashlib
+import marshal
+import os
+import shutil
+import zlib
 from pathlib import Path
 
+import numpy as np
+from pydantic import BaseModel, ValidationError
+
+from app.core import get_logger
+from app.core.config import settings
 from app.core.models import (
     FunctionProfile,
     ModulePerformance,
     ProfilerType,
 )
+from app.services.profiling.common import (
+    SIGNIFICANT_TIME_PERCENTAGE,
+    FileAggregate,
+    module_from_filename,
+    severity_for,
+)
+from app.utils.atomic_write import write_atomic
+
+logger = get_logger(__name__)
+
+# Bump whenever the cache entry layout or the parsing results change
+PROFILE_CACHE_FORMAT = 3
+
+
+class _ProfileCacheEntry(BaseModel):
+    """Contents of one profile cache entry."""
+
+    total_time: float
+    modules: dict[str, ModulePerformance]
+
+
+class ProfileCache:
+    """On-disk cache of parsed cProfile results keyed by the dump's BLAKE2b digest.
+
+    Entries live at ``{root}/profile/{digest}.jz`` as zlib-compressed JSON of
+    ``total_time`` and ``module_performance``, validated again on load, so an
+    entry that no longer fits the models is a miss. Keying on content rather
+    than path and mtime also hits for re-uploads of the same dump. Like
+    ``ParseCache``, the directory carries a ``version`` file and is wiped when
+    the cache format changes.
+
+    Unlike source files, uploaded dumps rarely repeat, so the directory is
+    capped at ``max_entries``: each store evicts the least recently used
+    entries beyond it, going by mtime, which a hit refreshes.
+    """
+
+    def __init__(self, root: Path, max_entries: int):
+        self.directory = Path(root) / "profile"
+        self.version = str(PROFILE_CACHE_FORMAT)
+        self.max_entries = max_entries
+        self._ensure_version()
+
+    def _ensure_version(self) -> None:
+        marker = self.directory / "version"
+        try:
+            if marker.read_text(encoding="utf-8") == self.version:
+                return
+        except OSError:
+            pass
+        shutil.rmtree(self.directory, ignore_errors=True)
+        try:
+            write_atomic(marker, self.version.encode())
+        except OSError as e:
+            logger.debug("Could not initialize profile cache %s: %s", marker, e)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    def _entry(self, digest: str) -> Path:
+        return self.directory / f"{digest}.jz"
+
+    def load(self, digest: str) -> tuple[float, dict[str, ModulePerformance]] | None:
+        try:
+            with open(self._entry(digest), "rb") as f:
+                entry = _ProfileCacheEntry.model_validate_json(
+                    zlib.decompress(f.read())
+                )
+        except (OSError, zlib.error, ValidationError):
+            return None
+        try:
+            os.utime(self._entry(digest))
+        except OSError:
+            pass
+        return entry.total_time, entry.modules
+
+    def store(
+        self, digest: str, result: tuple[float, dict[str, ModulePerformance]]
+    ) -> None:
+        """Write an entry atomically; failures only cost a future cache miss."""
+        total_time, modules = result
+        payload = _ProfileCacheEntry(total_time=total_time, modules=modules)
+        entry = self._entry(digest)
+        try:
+            write_atomic(entry, zlib.compress(payload.model_dump_json().encode(), 1))
+        except OSError as e:
+            logger.debug("Could not write profile cache entry %s: %s", entry, e)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries beyond ``max_entries``."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if item.name.endswith(".jz"):
+                        try:
+                            entries.append((item.stat().st_mtime_ns, item.path))
+                        except OSError:
+                            continue
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _mtime, path in entries[: len(entries) - self.max_entries]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
 
 
 class CProfileParser:
     """Parser for cProfile profiling data (.prof files).
 
-    Uses Python's pstats module to extract function-level timing and call data.
+    Loads the raw stats dict that cProfile marshals into the dump with
+    ``marshal.loads`` and extracts function-level timing and call data from it.
     """
 
     def __init__(self, profile_path: str | Path):
@@ -25,10 +145,30 @@ class CProfileParser:
         if not self.profile_path.exists():
             raise FileNotFoundError(f"Profile file not found: {profile_path}")
 
-        stats = pstats.Stats(str(self.profile_path))
-        # Use typed get_stats_profile() API (Python 3.9+) instead of untyped .stats dict
-        self.stats_profile = stats.get_stats_profile()
-        self.total_time = self.stats_profile.total_tt
+        data = self.profile_path.read_bytes()
+
+        # A dump parsed before (e.g. uploaded again) comes straight from the cache
+        self._cache_entry: tuple[ProfileCache, str] | None = None
+        self._cached_result: dict[str, ModulePerformance] | None = None
+        # Modules at or above SIGNIFICANT_TIME_PERCENTAGE, set by parse()
+        self.significant_modules: list[str] = []
+        if settings.parse_cache_dir:
+            cache = ProfileCache(
+                Path(settings.parse_cache_dir), settings.profile_cache_max_entries
+            )
+            digest = ProfileCache.digest(data)
+            self._cache_entry = (cache, digest)
+            cached = cache.load(digest)
+            if cached is not None:
+                self.total_time, self._cached_result = cached
+                self._raw_stats = {}
+                return
+
+        # cProfile dumps its raw {(file, line, name): (primitive calls, total
+        # calls, tottime, cumtime, callers)} dict with marshal; load it as is
+        # rather than through pstats.Stats, which also builds indexes we never read
+        self._raw_stats = marshal.loads(data)
+        self.total_time = float(sum(row[2] for row in self._raw_stats.values()))
 
     def parse(self) -> dict[str, ModulePerformance]:
         """Parse cProfile data and return module-level performance metrics.
@@ -36,144 +176,153 @@ class CProfileParser:
         Returns:
             Dictionary mapping module paths to ModulePerformance objects
         """
-        # Extract function-level data
-        function_profiles = self._extract_function_profiles()
+        if self._cached_result is not None:
+            self.significant_modules = [
+                module_path
+                for module_path, perf in self._cached_result.items()
+                if perf.time_percentage >= SIGNIFICANT_TIME_PERCENTAGE
+            ]
+            return self._cached_result
 
-        # Aggregate by module
-        module_performance = self._aggregate_by_module(function_profiles)
+        # One pass over the stats groups rows and sums module totals
+        modules = self._group_function_rows()
 
-        return module_performance
-
-    @staticmethod
-    def _parse_ncalls(ncalls: str) -> tuple[int, int]:
-        """Parse pstats ncalls string to (total_calls, primitive_calls).
+        # Function and module models are only built once, at the end
+        module_performance = self._aggregate_by_module(modules)
 
-        Args:
-            ncalls: String like "6/1" (total/primitive) or "1" (both equal)
+        if self._cache_entry is not None:
+            cache, digest = self._cache_entry
+            cache.store(digest, (self.total_time, module_performance))
 
-        Returns:
-            Tuple of (total_calls, primitive_calls)
-        """
-        if "/" in ncalls:
-            total, primitive = ncalls.split("/")
-            return int(total), int(primitive)
-        count = int(ncalls)
-        return count, count
+        return module_performance
 
-    def _extract_function_profiles(self) -> list[FunctionProfile]:
-        """Extract function-level profiles from pstats.
+    def _group_function_rows(self) -> dict[str, FileAggregate]:
+        """Group Python function rows by file, summing module totals as we go.
 
         Returns:
-            List of FunctionProfile objects
+            Dictionary mapping filenames to their summed ``total_time``,
+            ``self_time`` and ``calls`` plus the raw ``funcs`` rows, each
+            (name, lineno, primitive calls, total calls, tottime, cumtime)
         """
-        profiles = []
-
-        # Iterate through typed func_profiles from get_stats_profile()
-        for function_name, fp in self.stats_profile.func_profiles.items():
-            filename = fp.file_name
-            lineno = fp.line_number
+        modules: dict[str, FileAggregate] = {}
 
+        for (filename, lineno, function_name), row in self._raw_stats.items():
             # Skip built-in functions and non-Python files
             if not filename.endswith(".py"):
                 continue
 
-            # Extract module path from filename
-            module = self._extract_module_from_filename(filename)
+            # Call counts are already ints: total calls and non-recursive calls
+            primitive_calls, total_calls, tottime, cumtime, _callers = row
+
+            # Group by filename, the key used for matching with the dependency graph
+            agg = modules.get(filename)
+            if agg is None:
+                agg = modules[filename] = FileAggregate()
+            agg.total_time += tottime
+            agg.self_time += tottime
+            agg.calls += total_calls
+            agg.funcs.append(
+                (function_name, lineno, primitive_calls, total_calls, tottime, cumtime)
+            )
 
-            # Parse ncalls string (e.g., "6/1" -> total=6, primitive=1)
-            total_calls, primitive_calls = self._parse_ncalls(fp.ncalls)
+        return modules
 
-            # Calculate time percentage
-            time_percentage = (
-                (fp.tottime / self.total_time * 100) if self.total_time > 0 else 0
-            )
+    def _build_function_profiles(
+        self, filename: str, funcs: list[tuple]
+    ) -> list[FunctionProfile]:
+        """Materialize FunctionProfile objects for one module's rows.
 
-            # Calculate average time per call
-            avg_time = fp.tottime / total_calls if total_calls > 0 else 0
-
-            profile = FunctionProfile(
-                function_name=function_name,
-                module=module,
-                filename=filename,
-                lineno=lineno,
-                total_time=fp.tottime,
-                self_time=fp.tottime,  # pstats tottime is time in function (excluding subcalls)
-                cumulative_time=fp.cumtime,  # cumtime includes subcalls
-                avg_time_per_call=avg_time,
-                time_percentage=time_percentage,
-                call_count=total_calls,
-                primitive_calls=primitive_calls,
-                memory_usage_mb=None,  # cProfile doesn't track memory
-                memory_peak_mb=None,
-            )
+        Args:
+            filename: Source file the rows belong to
+            funcs: Rows collected by ``_group_function_rows``
 
-            profiles.append(profile)
+        Returns:
+            List of FunctionProfile objects
+        """
+        # Extract module path from filename
+        module = self._extract_module_from_filename(filename)
+        total = self.total_time
+
+        # Validated: values come from the uploaded profile
+        profiles = []
+        for row in funcs:
+            function_name, lineno, primitive_calls, total_calls, tottime, cumtime = row
+            profiles.append(
+                FunctionProfile(
+                    function_name=function_name,
+                    module=module,
+                    filename=filename,
+                    lineno=lineno,
+                    total_time=tottime,
+                    self_time=tottime,  # pstats tottime is time in function (excluding subcalls)
+                    cumulative_time=cumtime,  # cumtime includes subcalls
+                    avg_time_per_call=tottime / total_calls if total_calls > 0 else 0.0,
+                    time_percentage=(tottime / total * 100) if total > 0 else 0.0,
+                    call_count=total_calls,
+                    primitive_calls=primitive_calls,
+                    memory_usage_mb=None,  # cProfile doesn't track memory
+                    memory_peak_mb=None,
+                )
+            )
 
         return profiles
 
     def _aggregate_by_module(
-        self, function_profiles: list[FunctionProfile]
+        self, modules: dict[str, FileAggregate]
     ) -> dict[str, ModulePerformance]:
-        """Aggregate function profiles by module.
+        """Build module-level performance objects from grouped rows.
 
         Args:
-            function_profiles: List of FunctionProfile objects
+            modules: Per-file aggregates from ``_group_function_rows``
 
         Returns:
             Dictionary mapping module paths to ModulePerformance objects
         """
-        # Group functions by module
-        modules: dict[str, list[FunctionProfile]] = defaultdict(list)
-        for profile in function_profiles:
-            # Use the filename as the module key for matching with dependency graph
-            modules[profile.filename].append(profile)
+        if not modules:
+            self.significant_modules = []
+            return {}
+
+        aggs = list(modules.values())
+        total_times = np.fromiter(
+            (agg.total_time for agg in aggs), dtype=np.float64, count=len(aggs)
+        )
+
+        if self.total_time > 0:
+            # Clamp float rounding in the per-module sums to the 100% ceiling
+            time_percentages = np.minimum(total_times / self.total_time * 100, 100.0)
+        else:
+            time_percentages = np.zeros(len(aggs))
+
+        # Classify bottleneck type (CPU-focused for cProfile)
+        # Use heuristics: top 10% time consumers are potential bottlenecks
+        is_cpu_bottleneck = (time_percentages >= 10.0).tolist()
+        is_significant = (time_percentages >= SIGNIFICANT_TIME_PERCENTAGE).tolist()
+        time_percentages = time_percentages.tolist()
+
+        self.significant_modules = [
+            module_path
+            for module_path, significant in zip(modules, is_significant)
+            if significant
+        ]
 
-        # Create ModulePerformance objects
         module_performance = {}
-        for module_path, functions in modules.items():
-            # Calculate aggregated metrics
-            total_time = sum(f.total_time for f in functions)
-            self_time = sum(f.self_time for f in functions)
-            total_calls = sum(f.call_count for f in functions)
-
-            # Calculate time percentage
-            time_percentage = (
-                (total_time / self.total_time * 100) if self.total_time > 0 else 0
-            )
-
-            # Classify bottleneck type (CPU-focused for cProfile)
-            # Use heuristics: top 10% time consumers are potential bottlenecks
-            is_cpu_bottleneck = time_percentage >= 10.0
-
-            # Determine severity based on time percentage
-            if time_percentage >= 20.0:
-                severity = "critical"
-            elif time_percentage >= 10.0:
-                severity = "high"
-            elif time_percentage >= 5.0:
-                severity = "medium"
-            elif time_percentage >= 1.0:
-                severity = "low"
-            else:
-                severity = "normal"
-
-            module_perf = ModulePerformance(
+        for i, (module_path, agg) in enumerate(modules.items()):
+            functions = self._build_function_profiles(module_path, agg.funcs)
+            module_performance[module_path] = ModulePerformance(
                 module_path=module_path,
-                total_execution_time=total_time,
-                self_execution_time=self_time,
-                time_percentage=time_percentage,
-                total_calls=total_calls,
+                total_execution_time=agg.total_time,
+                self_execution_time=agg.self_time,
+                time_percentage=time_percentages[i],
+                total_calls=agg.calls,
                 unique_functions=len(functions),
                 total_memory_mb=None,  # Not available in cProfile
                 functions=functions,
-                is_cpu_bottleneck=is_cpu_bottleneck,
+                is_cpu_bottleneck=is_cpu_bottleneck[i],
                 is_memory_bottleneck=False,
                 is_io_bottleneck=False,
-                performance_severity=severity,
+                performance_severity=severity_for(time_percentages[i]),
             )
 
-            module_performance[module_path] = module_perf
-
         return module_performance
 
     def _extract_module_from_filename(self, filename: str) -> str:
@@ -185,29 +334,7 @@ class CProfileParser:
         Returns:
             Module path (e.g., 'app.services.metrics_service')
         """
-        # Try to extract module path from filename
-        # Example: /home/user/project/app/services/metrics_service.py
-        # -> app.services.metrics_service
-
-        path = Path(filename)
-
-        # If it's in the current working directory structure, extract module path
-        try:
-            # Try to get relative path from common Python package roots
-            for parent in ["app", "src", "lib"]:
-                if parent in path.parts:
-                    idx = path.parts.index(parent)
-                    module_parts = path.parts[idx:]
-                    # Remove .py extension
-                    module_parts = list(module_parts[:-1]) + [
-                        path.stem
-                    ]  # stem removes extension
-                    return ".".join(module_parts)
-        except (ValueError, IndexError):
-            pass
-
-        # Fallback: use the file stem (filename without extension)
-        return path.stem
+        return module_from_filename(filename)
 
     def get_profiler_type(self) -> ProfilerType:
         """Get the profiler type.
@@ -1,15 +1,94 @@
+import os
+from collections import defaultdict
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Literal
+from itertools import product
+from typing import Literal, get_args
+
+import numpy as np
 
 from app.core.models import (
     DependencyGraph,
     ModulePerformance,
+    Node,
     PerformanceAnalysisResult,
     PerformanceBottleneck,
     PriorityWeights,
     ProfilerType,
 )
+from app.services.profiling.common import SIGNIFICANT_TIME_PERCENTAGE
+
+BottleneckType = Literal["cpu", "memory", "io", "combined"]
+
+
+def _build_recommendation(
+    bottleneck_type: BottleneckType,
+    is_slow: bool,
+    is_circular: bool,
+    is_high_coupling: bool,
+    is_high_complexity: bool,
+    is_hot_zone: bool,
+) -> str:
+    """Assemble the recommendation for one combination of bottleneck traits."""
+    recommendations = []
+
+    # Performance-based recommendations
+    if bottleneck_type == "cpu":
+        recommendations.append("Optimize CPU-intensive operations")
+        if is_slow:
+            recommendations.append("Consider caching or algorithmic improvements")
+    elif bottleneck_type == "memory":
+        recommendations.append("Reduce memory allocations")
+    elif bottleneck_type == "io":
+        recommendations.append("Optimize I/O operations with async or batching")
+
+    # Architectural recommendations
+    if is_circular:
+        recommendations.append("Break circular dependency first")
+
+    if is_high_coupling:
+        recommendations.append("High coupling - refactor to reduce dependencies")
+
+    if is_high_complexity:
+        recommendations.append("High complexity - simplify logic before optimizing")
+
+    if is_hot_zone:
+        recommendations.append(
+            "⚠️ HOT ZONE: Both complex and highly coupled - high-risk, high-reward target"
+        )
+
+    if not recommendations:
+        recommendations.append("Profile deeper to identify specific hotspots")
+
+    return "; ".join(recommendations)
+
+
+# Every recommendation, keyed by (type, time >= 15%, circular, coupling > 15,
+# complexity > 20, hot zone); there are only 4 x 2^5 combinations
+_RECOMMENDATIONS: dict[tuple[BottleneckType, bool, bool, bool, bool, bool], str] = {
+    (
+        bottleneck_type,
+        is_slow,
+        is_circular,
+        is_high_coupling,
+        is_high_complexity,
+        is_hot_zone,
+    ): _build_recommendation(
+        bottleneck_type,
+        is_slow,
+        is_circular,
+        is_high_coupling,
+        is_high_complexity,
+        is_hot_zone,
+    )
+    for bottleneck_type in get_args(BottleneckType)
+    for (
+        is_slow,
+        is_circular,
+        is_high_coupling,
+        is_high_complexity,
+        is_hot_zone,
+    ) in product((False, True), repeat=5)
+}
 
 
 class PerformanceAnalyzer:
@@ -33,6 +112,7 @@ class PerformanceAnalyzer:
         total_execution_time: float,
         total_samples: int | None = None,
         weights: PriorityWeights | None = None,
+        significant_modules: list[str] | None = None,
     ):
         """Initialize analyzer.
 
@@ -43,6 +123,8 @@ class PerformanceAnalyzer:
             total_execution_time: Total program execution time
             total_samples: Number of samples (for sampling profilers)
             weights: Custom priority weights (uses defaults if None)
+            significant_modules: Modules at or above the reporting threshold, as
+                collected by the parser (filtered here if None)
         """
         self.module_performance = module_performance
         self.graph = dependency_graph
@@ -50,16 +132,31 @@ class PerformanceAnalyzer:
         self.total_execution_time = total_execution_time
         self.total_samples = total_samples
         self.weights = weights or PriorityWeights()
+        if significant_modules is None:
+            significant_modules = [
+                module_path
+                for module_path, perf in module_performance.items()
+                if perf.time_percentage >= SIGNIFICANT_TIME_PERCENTAGE
+            ]
+        self.significant_modules = significant_modules
 
         # Build filename -> node mapping for matching
         self._build_module_mapping()
 
     def _build_module_mapping(self):
-        """Build mapping from module paths to graph nodes."""
-        self.module_to_node = {}
-        for node in self.graph.nodes:
-            # Match by node.id (which is the module path)
-            self.module_to_node[node.id] = node
+        """Build mapping from module paths to graph nodes, and reverse edges."""
+        # Match by node.id (which is the module path)
+        self.module_to_node = {node.id: node for node in self.graph.nodes}
+
+        # First node per file name, for the fuzzy fallback in _find_matching_node
+        self.basename_to_node: dict[str, Node] = {}
+        for node_id, node in self.module_to_node.items():
+            self.basename_to_node.setdefault(os.path.basename(node_id), node)
+
+        # Importers of each module, so dependents are a lookup, not an edge scan
+        self.reverse_adj: dict[str, list[str]] = defaultdict(list)
+        for edge in self.graph.edges:
+            self.reverse_adj[edge.target].append(edge.source)
 
     def analyze(self) -> PerformanceAnalysisResult:
         """Perform complete performance analysis.
@@ -109,10 +206,9 @@ class PerformanceAnalyzer:
         """
         bottlenecks = []
 
-        for module_path, perf in self.module_performance.items():
-            # Skip modules with negligible performance impact
-            if perf.time_percentage < 0.5:
-                continue
+        # Modules with negligible performance impact were already filtered out
+        for module_path in self.significant_modules:
+            perf = self.module_performance[module_path]
 
             # Try to find matching node in dependency graph
             node = self._find_matching_node(module_path)
@@ -133,9 +229,7 @@ class PerformanceAnalyzer:
                 is_hot_zone = False
 
             # Determine bottleneck type
-            bottleneck_type: Literal["cpu", "memory", "io", "combined"] = (
-                self._classify_bottleneck_type(perf)
-            )
+            bottleneck_type: BottleneckType = self._classify_bottleneck_type(perf)
 
             # Create bottleneck object (priority_score calculated later)
             bottleneck = PerformanceBottleneck(
@@ -165,7 +259,7 @@ class PerformanceAnalyzer:
 
         return bottlenecks
 
-    def _find_matching_node(self, module_path: str):
+    def _find_matching_node(self, module_path: str) -> Node | None:
         """Find node in dependency graph matching module path.
 
         Args:
@@ -175,20 +269,14 @@ class PerformanceAnalyzer:
             Node object or None if not found
         """
         # Try direct match
-        if module_path in self.module_to_node:
-            return self.module_to_node[module_path]
+        node = self.module_to_node.get(module_path)
+        if node is not None:
+            return node
 
         # Try fuzzy match (e.g., matching by filename)
-        module_filename = Path(module_path).name
-        for node_id, node in self.module_to_node.items():
-            if Path(node_id).name == module_filename:
-                return node
-
-        return None
+        return self.basename_to_node.get(os.path.basename(module_path))
 
-    def _classify_bottleneck_type(
-        self, perf: ModulePerformance
-    ) -> Literal["cpu", "memory", "io", "combined"]:
+    def _classify_bottleneck_type(self, perf: ModulePerformance) -> BottleneckType:
         """Classify bottleneck type based on metrics.
 
         Args:
@@ -221,11 +309,8 @@ class PerformanceAnalyzer:
         Returns:
             List of module paths that depend on this node
         """
-        affected = []
-        for edge in self.graph.edges:
-            if edge.target == node_id:
-                affected.append(edge.source)
-        return affected
+        # Copy, so bottlenecks matched to the same node don't share one list
+        return list(self.reverse_adj.get(node_id, ()))
 
     def _calculate_priority_scores(
         self, bottlenecks: list[PerformanceBottleneck]
@@ -250,45 +335,47 @@ class PerformanceAnalyzer:
         if not bottlenecks:
             return bottlenecks
 
-        # Find max values for normalization
-        max_time = max(b.execution_time for b in bottlenecks)
-        max_coupling = max(b.coupling_score for b in bottlenecks) or 1
-        max_complexity = max(b.complexity_score for b in bottlenecks) or 1
-        max_memory = max(
-            (b.memory_usage_mb for b in bottlenecks if b.memory_usage_mb is not None),
-            default=1,
+        # One row of raw factors per bottleneck: time, coupling, complexity,
+        # memory (unknown counts as 0) and calls
+        factors = np.array(
+            [
+                (
+                    b.execution_time,
+                    b.coupling_score,
+                    b.complexity_score,
+                    b.memory_usage_mb or 0.0,
+                    b.call_count,
+                )
+                for b in bottlenecks
+            ],
+            dtype=np.float64,
         )
-        max_calls = max(b.call_count for b in bottlenecks) or 1
 
-        for bottleneck in bottlenecks:
-            # Normalize factors to [0, 1]
-            time_score = bottleneck.execution_time / max_time if max_time > 0 else 0
-            coupling_score = bottleneck.coupling_score / max_coupling
-            complexity_score = bottleneck.complexity_score / max_complexity
-            memory_score = (
-                (bottleneck.memory_usage_mb / max_memory)
-                if bottleneck.memory_usage_mb
-                else 0
-            )
-            call_score = bottleneck.call_count / max_calls
-
-            # Calculate weighted priority (0-1 range)
-            priority = (
-                self.weights.execution_time * time_score
-                + self.weights.coupling * coupling_score
-                + self.weights.complexity * complexity_score
-                + self.weights.memory_usage * memory_score
-                + self.weights.call_frequency * call_score
-            )
+        # Normalize factors to [0, 1] by their column max; an all-zero column
+        # scores 0 throughout
+        maxes = factors.max(axis=0)
+        maxes[maxes == 0] = 1.0
+        normalized = factors / maxes
+
+        # Calculate weighted priority (0-1 range), term by term in the same
+        # order as the formula above
+        priority = (
+            self.weights.execution_time * normalized[:, 0]
+            + self.weights.coupling * normalized[:, 1]
+            + self.weights.complexity * normalized[:, 2]
+            + self.weights.memory_usage * normalized[:, 3]
+            + self.weights.call_frequency * normalized[:, 4]
+        )
+
+        # Apply boosters
+        priority[[b.is_circular for b in bottlenecks]] *= 1.2
+        priority[[b.is_hot_zone for b in bottlenecks]] *= 1.3
 
-            # Apply boosters
-            if bottleneck.is_circular:
-                priority *= 1.2
-            if bottleneck.is_hot_zone:
-                priority *= 1.3
+        # Scale to 0-100
+        scores = np.clip(priority * 100, 0, 100).tolist()
 
-            # Scale to 0-100
-            bottleneck.priority_score = min(max(priority * 100, 0), 100)
+        for bottleneck, score in zip(bottlenecks, scores):
+            bottleneck.priority_score = score
 
             # Estimate impact
             bottleneck.estimated_impact = self._estimate_impact(bottleneck)
@@ -354,34 +441,13 @@ class PerformanceAnalyzer:
         Returns:
             Recommendation string
         """
-        recommendations = []
-
-        # Performance-based recommendations
-        if bottleneck.bottleneck_type == "cpu":
-            recommendations.append("Optimize CPU-intensive operations")
-            if bottleneck.time_percentage >= 15:
-                recommendations.append("Consider caching or algorithmic improvements")
-        elif bottleneck.bottleneck_type == "memory":
-            recommendations.append("Reduce memory allocations")
-        elif bottleneck.bottleneck_type == "io":
-            recommendations.append("Optimize I/O operations with async or batching")
-
-        # Architectural recommendations
-        if bottleneck.is_circular:
-            recommendations.append("Break circular dependency first")
-
-        if bottleneck.coupling_score > 15:
-            recommendations.append("High coupling - refactor to reduce dependencies")
-
-        if bottleneck.complexity_score > 20:
-            recommendations.append("High complexity - simplify logic before optimizing")
-
-        if bottleneck.is_hot_zone:
-            recommendations.append(
-                "⚠️ HOT ZONE: Both complex and highly coupled - high-risk, high-reward target"
+        return _RECOMMENDATIONS[
+            (
+                bottleneck.bottleneck_type,
+                bottleneck.time_percentage >= 15,
+                bottleneck.is_circular,
+                bottleneck.coupling_score > 15,
+                bottleneck.complexity_score > 20,
+                bottleneck.is_hot_zone,
             )
-
-        if not recommendations:
-            recommendations.append("Profile deeper to identify specific hotspots")
-
-        return "; ".join(recommendations)
+        ]
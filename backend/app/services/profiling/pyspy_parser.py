@@ -1,12 +1,50 @@
 import json
-from collections import defaultdict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, reduce
+from itertools import chain
 from pathlib import Path
 
+import numpy as np
+
 from app.core.models import (
     FunctionProfile,
     ModulePerformance,
     ProfilerType,
 )
+from app.services.profiling.common import (
+    SIGNIFICANT_TIME_PERCENTAGE,
+    FileAggregate,
+    module_from_filename,
+    severity_for,
+)
+
+# Smallest slice of stack entries worth a thread of its own; below this the
+# whole reduction runs in one bincount
+_PARALLEL_MIN_ENTRIES = 1 << 20
+
+
+def _bincount(
+    indices: np.ndarray, weights: np.ndarray | None, minlength: int
+) -> np.ndarray:
+    """np.bincount, split across threads for very large inputs.
+
+    bincount releases the GIL, so per-slice counts over contiguous chunks run
+    in parallel and are summed afterwards.
+    """
+    workers = min(os.cpu_count() or 1, len(indices) // _PARALLEL_MIN_ENTRIES)
+    if workers <= 1:
+        return np.bincount(indices, weights=weights, minlength=minlength)
+
+    bounds = np.linspace(0, len(indices), workers + 1, dtype=np.intp).tolist()
+
+    def count_slice(i: int) -> np.ndarray:
+        lo, hi = bounds[i], bounds[i + 1]
+        w = None if weights is None else weights[lo:hi]
+        return np.bincount(indices[lo:hi], weights=w, minlength=minlength)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return reduce(np.add, pool.map(count_slice, range(workers)))
 
 
 class PySpyParser:
@@ -26,20 +64,32 @@ class PySpyParser:
         if not self.profile_path.exists():
             raise FileNotFoundError(f"Profile file not found: {profile_path}")
 
-        with open(self.profile_path, "r") as f:
-            self.data = json.load(f)
+        # One binary read handed straight to the C decoder; text mode would
+        # add an incremental decode and newline translation over the whole file
+        self.data = json.loads(self.profile_path.read_bytes())
 
         # Extract frames and samples
         self.frames = self.data.get("shared", {}).get("frames", [])
         self.profiles = self.data.get("profiles", [])
 
+        # Modules at or above SIGNIFICANT_TIME_PERCENTAGE, set by parse()
+        self.significant_modules: list[str] = []
+
         # Calculate total time from first profile
         if self.profiles:
             profile = self.profiles[0]
             self.total_time = profile.get("endValue", 0) - profile.get("startValue", 0)
             self.samples = profile.get("samples", [])
-            self.weights = profile.get("weights", [])
             self.total_samples = len(self.samples)
+
+            # Align weights with samples once: a sample without a weight
+            # counts as 0 and weights past the last sample are dropped
+            weights = profile.get("weights", [])
+            if len(weights) < self.total_samples:
+                weights = weights + [0] * (self.total_samples - len(weights))
+            elif len(weights) > self.total_samples:
+                weights = weights[: self.total_samples]
+            self.weights = weights
         else:
             self.total_time = 0
             self.samples = []
@@ -52,149 +102,208 @@ class PySpyParser:
         Returns:
             Dictionary mapping module paths to ModulePerformance objects
         """
-        # Extract function-level data
-        function_profiles = self._extract_function_profiles()
+        # One pass over the frames groups rows and accumulates module totals
+        modules = self._group_function_rows()
 
-        # Aggregate by module
-        module_performance = self._aggregate_by_module(function_profiles)
+        # Function and module models are only built once, at the end
+        module_performance = self._aggregate_by_module(modules)
 
         return module_performance
 
-    def _extract_function_profiles(self) -> list[FunctionProfile]:
-        """Extract function-level profiles from speedscope samples.
+    def _group_function_rows(self) -> dict[str, FileAggregate]:
+        """Group sampled Python frames by file, accumulating module totals.
 
         Returns:
-            List of FunctionProfile objects
+            Dictionary mapping filenames to their ``total_time`` (max over
+            frames), summed ``self_time`` and ``calls``, and the raw ``funcs``
+            rows, each (name, lineno, total time, self time, sample count)
         """
-        # Count appearances of each frame in samples (weighted by time)
-        frame_time = defaultdict(float)
-        frame_self_time = defaultdict(float)
-        frame_count = defaultdict(int)
+        frame_time, frame_self_time, frame_count, order = self._aggregate_frames()
+        frame_time = frame_time.tolist()
+        frame_self_time = frame_self_time.tolist()
+        frame_count = frame_count.tolist()
 
-        # Process each sample
-        for sample_idx, sample in enumerate(self.samples):
-            weight = self.weights[sample_idx] if sample_idx < len(self.weights) else 0
+        # Skip non-Python files up front, with the frame-table mask
+        order = order[self._python_frames[order]]
 
-            # Process stack from bottom to top
-            for depth, frame_idx in enumerate(sample):
-                if frame_idx >= len(self.frames):
-                    continue
-
-                # Add time for this frame appearing in the stack
-                frame_time[frame_idx] += weight
-                frame_count[frame_idx] += 1
+        # Walk frames in order of first appearance
+        modules: dict[str, FileAggregate] = {}
+        for frame_idx in order.tolist():
+            frame = self.frames[frame_idx]
+            filename = frame["file"]
 
-                # Self time: only the leaf (top of stack)
-                if depth == len(sample) - 1:
-                    frame_self_time[frame_idx] += weight
+            total_time = frame_time[frame_idx]
+            self_time = frame_self_time[frame_idx]
+            count = frame_count[frame_idx]
 
-        # Create FunctionProfile for each frame
-        profiles = []
-        for frame_idx, total_time in frame_time.items():
-            if frame_idx >= len(self.frames):
-                continue
+            agg = modules.get(filename)
+            if agg is None:
+                agg = modules[filename] = FileAggregate()
+            # For sampling profilers: use max total_time (most expensive function)
+            # since total_time includes callees and would be double-counted if summed
+            agg.total_time = max(agg.total_time, total_time)
+            agg.self_time += self_time
+            agg.calls += count
+            agg.funcs.append(
+                (
+                    frame.get("name", "<unknown>"),
+                    frame.get("line", 0) or 1,
+                    total_time,
+                    self_time,
+                    count,
+                )
+            )
 
-            frame = self.frames[frame_idx]
-            filename = frame.get("file", "")
+        return modules
 
-            # Skip non-Python files
-            if not filename.endswith(".py"):
-                continue
+    def _build_function_profiles(
+        self, filename: str, funcs: list[tuple]
+    ) -> list[FunctionProfile]:
+        """Materialize FunctionProfile objects for one module's frames.
 
-            function_name = frame.get("name", "<unknown>")
-            lineno = frame.get("line", 0) or 1
-            self_time = frame_self_time.get(frame_idx, 0)
-            count = frame_count.get(frame_idx, 0)
+        Args:
+            filename: Source file the frames belong to
+            funcs: Rows collected by ``_group_function_rows``
 
-            # Extract module from filename
-            module = self._extract_module_from_filename(filename)
+        Returns:
+            List of FunctionProfile objects
+        """
+        # Extract module from filename
+        module = self._extract_module_from_filename(filename)
+        total = self.total_time
 
-            # Calculate percentages
-            time_percentage = (
-                (total_time / self.total_time * 100) if self.total_time > 0 else 0
-            )
-            avg_time = total_time / count if count > 0 else 0
-
-            profile = FunctionProfile(
-                function_name=function_name,
-                module=module,
-                filename=filename,
-                lineno=lineno,
-                total_time=total_time,
-                self_time=self_time,
-                cumulative_time=total_time,  # For sampling, total ≈ cumulative
-                avg_time_per_call=avg_time,
-                time_percentage=time_percentage,
-                call_count=count,
-                primitive_calls=count,  # Can't distinguish in sampling
-                memory_usage_mb=None,  # Not in standard py-spy output
-                memory_peak_mb=None,
+        # Validated: values come from the uploaded profile
+        profiles = []
+        for function_name, lineno, total_time, self_time, count in funcs:
+            profiles.append(
+                FunctionProfile(
+                    function_name=function_name,
+                    module=module,
+                    filename=filename,
+                    lineno=lineno,
+                    total_time=total_time,
+                    self_time=self_time,
+                    cumulative_time=total_time,  # For sampling, total ≈ cumulative
+                    avg_time_per_call=total_time / count if count > 0 else 0.0,
+                    time_percentage=(total_time / total * 100) if total > 0 else 0.0,
+                    call_count=count,
+                    primitive_calls=count,  # Can't distinguish in sampling
+                    memory_usage_mb=None,  # Not in standard py-spy output
+                    memory_peak_mb=None,
+                )
             )
 
-            profiles.append(profile)
-
         return profiles
 
+    @cached_property
+    def _python_frames(self) -> np.ndarray:
+        """Boolean mask over the frame table: True for frames in .py files."""
+        return np.fromiter(
+            (frame.get("file", "").endswith(".py") for frame in self.frames),
+            dtype=bool,
+            count=len(self.frames),
+        )
+
+    @cached_property
+    def _stacks(self) -> tuple[np.ndarray, np.ndarray]:
+        """Samples in CSR form: frame indices of all stacks, and offsets.
+
+        Stack ``i`` is ``indices[indptr[i]:indptr[i + 1]]``. Built once per
+        parser so the ragged list-of-lists is only walked a single time.
+        """
+        samples = self.samples
+        indptr = np.zeros(len(samples) + 1, dtype=np.intp)
+        np.cumsum(
+            np.fromiter(map(len, samples), dtype=np.intp, count=len(samples)),
+            out=indptr[1:],
+        )
+        indices = np.fromiter(
+            chain.from_iterable(samples), dtype=np.int64, count=int(indptr[-1])
+        )
+        return indices, indptr
+
+    def _aggregate_frames(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Sum sample weights per frame with numpy reductions.
+
+        Over the CSR view of the stacks, total time and sample counts are a
+        bincount over all frame indices and self time a bincount over each
+        stack's leaf; very large traces are counted in parallel slices.
+        Frame indices outside the frame table are ignored.
+
+        Returns:
+            Per-frame (total time, self time, sample count) arrays indexed by
+            frame id, and the ids of frames that appear, in first-seen order
+        """
+        n_frames = len(self.frames)
+        flat, indptr = self._stacks
+        lengths = np.diff(indptr)
+
+        weights = np.asarray(self.weights, dtype=np.float64)
+
+        # A frame's time is the weight of every sample whose stack contains it
+        flat_weights = np.repeat(weights, lengths)
+        valid = (flat >= 0) & (flat < n_frames)
+        frames = flat[valid]
+        frame_time = _bincount(frames, flat_weights[valid], n_frames)
+        frame_count = _bincount(frames, None, n_frames)
+
+        # Self time: only the leaf (top of stack) of each non-empty sample
+        has_leaf = lengths > 0
+        leaves = flat[indptr[1:][has_leaf] - 1]
+        leaf_weights = weights[has_leaf]
+        valid_leaf = (leaves >= 0) & (leaves < n_frames)
+        frame_self_time = _bincount(
+            leaves[valid_leaf], leaf_weights[valid_leaf], n_frames
+        )
+
+        seen, first = np.unique(frames, return_index=True)
+        order = seen[np.argsort(first, kind="stable")]
+        return frame_time, frame_self_time, frame_count, order
+
     def _aggregate_by_module(
-        self, function_profiles: list[FunctionProfile]
+        self, modules: dict[str, FileAggregate]
     ) -> dict[str, ModulePerformance]:
-        """Aggregate function profiles by module.
+        """Build module-level performance objects from grouped frames.
 
         Args:
-            function_profiles: List of FunctionProfile objects
+            modules: Per-file aggregates from ``_group_function_rows``
 
         Returns:
             Dictionary mapping module paths to ModulePerformance objects
         """
-        # Group functions by module (using filename as key)
-        modules: dict[str, list[FunctionProfile]] = defaultdict(list)
-        for profile in function_profiles:
-            modules[profile.filename].append(profile)
-
-        # Create ModulePerformance objects
         module_performance = {}
-        for module_path, functions in modules.items():
-            # Calculate aggregated metrics
-            # For sampling profilers: use max total_time (most expensive function)
-            # since total_time includes callees and would be double-counted if summed
-            total_time = max((f.total_time for f in functions), default=0)
-            self_time = sum(f.self_time for f in functions)
-            total_calls = sum(f.call_count for f in functions)
+        self.significant_modules = []
+        for module_path, agg in modules.items():
+            total_time = agg.total_time
+            functions = self._build_function_profiles(module_path, agg.funcs)
 
             # Calculate time percentage
             time_percentage = (
-                (total_time / self.total_time * 100) if self.total_time > 0 else 0
+                (total_time / self.total_time * 100) if self.total_time > 0 else 0.0
             )
 
+            if time_percentage >= SIGNIFICANT_TIME_PERCENTAGE:
+                self.significant_modules.append(module_path)
+
             # Classify bottleneck type (CPU-focused for py-spy)
             # Use heuristics: top 10% time consumers are potential bottlenecks
             is_cpu_bottleneck = time_percentage >= 10.0
 
-            # Determine severity based on time percentage
-            if time_percentage >= 20.0:
-                severity = "critical"
-            elif time_percentage >= 10.0:
-                severity = "high"
-            elif time_percentage >= 5.0:
-                severity = "medium"
-            elif time_percentage >= 1.0:
-                severity = "low"
-            else:
-                severity = "normal"
-
             module_perf = ModulePerformance(
                 module_path=module_path,
                 total_execution_time=total_time,
-                self_execution_time=self_time,
+                self_execution_time=agg.self_time,
                 time_percentage=time_percentage,
-                total_calls=total_calls,
+                total_calls=agg.calls,
                 unique_functions=len(functions),
                 total_memory_mb=None,  # Not available in standard py-spy
                 functions=functions,
                 is_cpu_bottleneck=is_cpu_bottleneck,
                 is_memory_bottleneck=False,
                 is_io_bottleneck=False,
-                performance_severity=severity,
+                performance_severity=severity_for(time_percentage),
             )
 
             module_performance[module_path] = module_perf
@@ -210,20 +319,7 @@ class PySpyParser:
         Returns:
             Module path (e.g., 'app.services.metrics_service')
         """
-        # Same logic as cProfile parser
-        path = Path(filename)
-
-        try:
-            for parent in ["app", "src", "lib"]:
-                if parent in path.parts:
-                    idx = path.parts.index(parent)
-                    module_parts = path.parts[idx:]
-                    module_parts = list(module_parts[:-1]) + [path.stem]
-                    return ".".join(module_parts)
-        except (ValueError, IndexError):
-            pass
-
-        return path.stem
+        return module_from_filename(filename)
 
     def get_profiler_type(self) -> ProfilerType:
         """Get the profiler type.
@@ -68,9 +68,9 @@ class DiffService:
     @staticmethod
     async def perform_diff(
         request: DiffRequest, tracker: ProgressTracker
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Perform diff analysis between two repository versions."""
-        yield await tracker.emit_step(0)
+        yield tracker.emit_step(0)
         github_service = GitHubService()
         repo_url = f"https://github.com/{request.repo}"
 
@@ -78,19 +78,19 @@ class DiffService:
             repo_url, request.ref1, github_service
         )
 
-        yield await tracker.emit_step(1)
+        yield tracker.emit_step(1)
         files2 = await DiffService.fetch_version_files(
             repo_url, request.ref2, github_service
         )
 
-        yield await tracker.emit_step(2)
+        yield tracker.emit_step(2)
         graph1 = await DiffService.analyze_and_build_graph(files1, request.repo)
 
-        yield await tracker.emit_step(3)
+        yield tracker.emit_step(3)
         graph2 = await DiffService.analyze_and_build_graph(files2, request.repo)
 
-        yield await tracker.emit_step(4)
+        yield tracker.emit_step(4)
         diff_result = DiffService.compare_graphs(graph1, graph2)
 
-        yield await tracker.emit_step(5)
-        yield await tracker.emit_result(diff_result.model_dump())
+        yield tracker.emit_step(5)
+        yield tracker.emit_result(diff_result.model_dump())
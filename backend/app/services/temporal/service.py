@@ -1,5 +1,7 @@
-import uuid
+import asyncio
+import hashlib
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import statistics
 
@@ -9,6 +11,7 @@ from app.core.models import (
     ChurnHeatmapData,
     ChurnHeatmapEntry,
     CircularDependencyTimelineEvent,
+    FileInput,
     NodeMetrics,
     Position3D,
     TemporalAnalysisResponse,
@@ -20,12 +23,16 @@ from app.core.models import (
     TemporalSnapshotData,
     TemporalSnapshotMetrics,
 )
-from app.services.analysis.analyzer import analyze_files
+from app.services.analysis.analyzer import analyze_files_sync
 from app.services.analysis.metrics import MetricsCalculator
 from app.services.graph.layout import apply_layout
 from app.services.graph.service import build_graph
 from app.services.infrastructure.github import GitHubService
 
+# Each commit fetch already runs up to 100 file downloads in parallel, so
+# keep the number of commits in flight small
+_MAX_CONCURRENT_COMMITS = 4
+
 
 class TemporalAnalysisService:
     """Service for analyzing dependency evolution over git history."""
@@ -36,6 +43,11 @@ class TemporalAnalysisService:
         self.snapshots_cache: TTLCache[str, TemporalAnalysisResponse] = TTLCache(
             maxsize=50, ttl=3600
         )
+        # Snapshots are built one at a time: each build already parses on a
+        # cpu_count-sized pool, and the parser caches are process-wide
+        self._snapshot_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="temporal-snapshot"
+        )
 
     async def analyze_repository_history_streaming(
         self,
@@ -49,13 +61,10 @@ class TemporalAnalysisService:
 
         Yields progress events during analysis.
         """
-        # Generate analysis ID
-        analysis_id = str(
-            uuid.uuid5(
-                uuid.NAMESPACE_URL,
-                f"{repo_url}_{start_date}_{end_date}_{sample_strategy}",
-            )
-        )
+        # Generate analysis ID; fields are joined with a unit separator so
+        # underscores in the URL can't make two requests share a key
+        key = "\x1f".join(map(str, (repo_url, start_date, end_date, sample_strategy)))
+        analysis_id = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
 
         yield {
             "type": "progress",
@@ -98,24 +107,54 @@ class TemporalAnalysisService:
             "total": 6,
         }
 
-        # Analyze each commit with progress updates
+        # Commits are fetched concurrently and their snapshots built in one
+        # worker thread; only the diff against the previous snapshot depends
+        # on order
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_COMMITS)
+        # Most files are unchanged between sampled commits; download each
+        # distinct file version once for the whole analysis
+        blob_cache: dict[str, str] = {}
+
+        async def analyze(commit: dict) -> tuple[dict, TemporalSnapshotData | None]:
+            async with semaphore:
+                return commit, await self._analyze_commit(repo_url, commit, blob_cache)
+
+        tasks = [asyncio.create_task(analyze(commit)) for commit in sampled_commits]
+        try:
+            for done, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                commit, _ = await next_done
+                yield {
+                    "type": "progress",
+                    "message": f"Analyzed commit {done}/{len(sampled_commits)}: {commit['sha'][:7]}",
+                    "step": 3,
+                    "total": 6,
+                    "current": done,
+                    "total_commits": len(sampled_commits),
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+
         snapshots: list[TemporalSnapshotData] = []
         previous_snapshot: TemporalSnapshotData | None = None
 
-        for idx, commit in enumerate(sampled_commits):
-            yield {
-                "type": "progress",
-                "message": f"Analyzing commit {idx + 1}/{len(sampled_commits)}: {commit['sha'][:7]}",
-                "step": 3,
-                "total": 6,
-                "current": idx + 1,
-                "total_commits": len(sampled_commits),
-            }
-
-            snapshot = await self._analyze_commit(repo_url, commit, previous_snapshot)
-            if snapshot:
-                snapshots.append(snapshot)
-                previous_snapshot = snapshot
+        for task in tasks:
+            _, snapshot = task.result()
+            if not snapshot:
+                continue
+            if previous_snapshot:
+                snapshot.changes = self._calculate_changes(
+                    previous_snapshot,
+                    snapshot.dependencies,
+                    snapshot.node_count,
+                    snapshot.edge_count,
+                    snapshot.circular_count,
+                )
+                self._share_unchanged_graph(
+                    previous_snapshot.graph_snapshot, snapshot.graph_snapshot
+                )
+            snapshots.append(snapshot)
+            previous_snapshot = snapshot
 
         yield {
             "type": "progress",
@@ -198,21 +237,40 @@ class TemporalAnalysisService:
         return sampled
 
     async def _analyze_commit(
-        self,
-        repo_url: str,
-        commit: dict,
-        previous_snapshot: TemporalSnapshotData | None,
+        self, repo_url: str, commit: dict, blob_cache: dict[str, str] | None = None
     ) -> TemporalSnapshotData | None:
-        """Analyze dependencies at a specific commit."""
+        """
+        Analyze dependencies at a specific commit.
+
+        The snapshot's ``changes`` are left unset; they depend on the
+        previous snapshot and are filled in once all commits are analyzed.
+        """
         result = await self.github_service.fetch_repository_at_commit(
-            repo_url, commit["sha"]
+            repo_url, commit["sha"], blob_cache=blob_cache
         )
 
         if not result.files:
             return None
 
         project_name = repo_url.split("/")[-1]
-        dependency_data = await analyze_files(result.files, project_name)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._snapshot_executor,
+            self._build_snapshot,
+            commit,
+            result.files,
+            project_name,
+        )
+
+    def _build_snapshot(
+        self, commit: dict, files: list[FileInput], project_name: str
+    ) -> TemporalSnapshotData:
+        """Analyze fetched files into a snapshot.
+
+        Parsing, graph building, metrics and layout are all CPU-bound, so this
+        runs on the snapshot executor to keep the event loop free for other
+        commits' downloads.
+        """
+        dependency_data = analyze_files_sync(files, project_name)
 
         # Build graph
         graph = build_graph(dependency_data)
@@ -242,17 +300,6 @@ class TemporalAnalysisService:
             if graph.nodes[node_id].get("metrics", {}).get("is_circular", False)
         ]
 
-        # Calculate changes from previous snapshot
-        changes: TemporalSnapshotChanges | None = None
-        if previous_snapshot:
-            changes = self._calculate_changes(
-                previous_snapshot,
-                dependencies,
-                node_count,
-                edge_count,
-                len(circular_nodes),
-            )
-
         coupling_values = [
             graph.nodes[node_id].get("metrics", {}).get("afferent_coupling", 0)
             + graph.nodes[node_id].get("metrics", {}).get("efferent_coupling", 0)
@@ -318,10 +365,34 @@ class TemporalAnalysisService:
                 avg_afferent_coupling=global_metrics.avg_afferent_coupling,
                 avg_efferent_coupling=global_metrics.avg_efferent_coupling,
             ),
-            changes=changes,
             graph_snapshot=graph_snapshot,
         )
 
+    def _share_unchanged_graph(
+        self, previous: TemporalGraphSnapshot, current: TemporalGraphSnapshot
+    ) -> None:
+        """
+        Point unchanged nodes and edges at the previous snapshot's objects.
+
+        Consecutive commits usually differ in a handful of modules, so the
+        cached analysis then holds one object per distinct node/edge state
+        instead of a full copy of the graph per commit. Both models are frozen,
+        so a shared object cannot be edited through one snapshot; replace it
+        (``model_copy(update=...)``) instead.
+        """
+        previous_nodes = {node.id: node for node in previous.nodes}
+        current.nodes = [
+            shared if (shared := previous_nodes.get(node.id)) == node else node
+            for node in current.nodes
+        ]
+        previous_edges = {(edge.source, edge.target): edge for edge in previous.edges}
+        current.edges = [
+            shared
+            if (shared := previous_edges.get((edge.source, edge.target))) == edge
+            else edge
+            for edge in current.edges
+        ]
+
     def _calculate_changes(
         self,
         previous_snapshot: TemporalSnapshotData,
@@ -1,4 +1,5 @@
 from app.utils.ast_parser import filepath_to_module, parse_file
+from app.utils.atomic_write import write_atomic
 from app.utils.cycle_detector import detect_cycles, get_nodes_in_cycles
 from app.utils.import_resolver import (
     ImportResolver,
@@ -14,4 +15,5 @@ __all__ = [
     "get_nodes_in_cycles",
     "is_standard_library",
     "parse_file",
+    "write_atomic",
 ]
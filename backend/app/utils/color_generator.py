@@ -35,8 +35,11 @@ def generate_module_color(module_name: str, depth: int = 0) -> str:
     Returns:
         Hex color string
     """
-    # Hash the module name to get a consistent hue
-    hash_value = int(hashlib.md5(module_name.encode()).hexdigest(), 16)
+    # Hash the module name to get a consistent hue; not a security use, which
+    # keeps MD5 available on FIPS-enabled builds
+    hash_value = int(
+        hashlib.md5(module_name.encode(), usedforsecurity=False).hexdigest(), 16
+    )
     hue = hash_value % 360
 
     # Vary lightness based on depth (submodules get lighter)
@@ -1,8 +1,12 @@
+import json
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
+from app.api.routes import temporal
 from app.core.config import settings
+from app.core.exceptions import BadRequestError
 from app.main import app
 
 
@@ -61,3 +65,29 @@ async def test_validation_error_payload(async_client: AsyncClient) -> None:
     assert payload["detail"] == "Request validation failed"
     assert payload["status_code"] == 422
     assert isinstance(payload["details"], list)
+
+
+@pytest.mark.asyncio
+async def test_temporal_analysis_streams_error_frame(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def failing_stream(request):
+        raise BadRequestError("Repository not found")
+        yield
+
+    monkeypatch.setattr(
+        temporal.temporal_orchestrator, "start_temporal_analysis", failing_stream
+    )
+
+    response = await async_client.post(
+        "/api/temporal-analysis",
+        json={"repository_url": "https://github.com/owner/repo"},
+    )
+
+    assert response.status_code == 200
+    (frame,) = [line for line in response.text.splitlines() if line]
+    assert frame.startswith("data: ")
+    payload = json.loads(frame[len("data: ") :])
+    assert payload["type"] == "error"
+    assert payload["error"]["error"] == "BadRequest"
+    assert payload["error"]["detail"] == "Repository not found"
@@ -339,8 +339,8 @@ class TestAnalysisOrchestratorService:
         request = ImportAnalyzeRequest(source="import", data=data)
 
         mock_tracker = MagicMock()
-        mock_tracker.emit_step = AsyncMock(return_value="step")
-        mock_tracker.emit_result = AsyncMock(return_value="result")
+        mock_tracker.emit_step = MagicMock(return_value=b"step")
+        mock_tracker.emit_result = MagicMock(return_value=b"result")
 
         events = []
         async for event in AnalysisOrchestratorService.perform_analysis(
@@ -360,8 +360,8 @@ class TestAnalysisOrchestratorService:
         request = LocalAnalyzeRequest(source="local", files=files)
 
         mock_tracker = MagicMock()
-        mock_tracker.emit_step = AsyncMock(return_value="step")
-        mock_tracker.emit_result = AsyncMock(return_value="result")
+        mock_tracker.emit_step = MagicMock(return_value=b"step")
+        mock_tracker.emit_result = MagicMock(return_value=b"result")
 
         events = []
         async for event in AnalysisOrchestratorService.perform_analysis(
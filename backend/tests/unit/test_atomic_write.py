@@ -0,0 +1,30 @@
+import pytest
+
+from app.utils import atomic_write
+from app.utils.atomic_write import write_atomic
+
+
+def test_write_atomic_creates_parents_and_replaces(tmp_path):
+    target = tmp_path / "a" / "b" / "entry.bin"
+
+    write_atomic(target, b"first")
+    write_atomic(target, b"second")
+
+    assert target.read_bytes() == b"second"
+    assert [p.name for p in target.parent.iterdir()] == ["entry.bin"]
+
+
+def test_write_atomic_failure_leaves_no_temp_file(tmp_path, monkeypatch):
+    target = tmp_path / "entry.bin"
+    target.write_bytes(b"old")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(atomic_write.os, "replace", fail)
+
+    with pytest.raises(OSError):
+        write_atomic(target, b"new")
+
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["entry.bin"]
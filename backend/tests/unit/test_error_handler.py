@@ -31,7 +31,7 @@ async def test_stream_with_error_handling_domain_error() -> None:
         yield {"event": "progress", "data": {"step": 1}}
         raise BadRequestError("Boom")
 
-    async def on_error(payload):
+    def on_error(payload):
         return {"event": "error", "data": payload.model_dump()}
 
     events = []
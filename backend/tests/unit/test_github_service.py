@@ -293,9 +293,51 @@ class TestGitHubService:
             )
 
             mock_fetch.assert_called_once_with(
-                "https://github.com/owner/repo", ref="abc123", token="token"
+                "https://github.com/owner/repo",
+                ref="abc123",
+                token="token",
+                blob_cache=None,
             )
 
+    @pytest.mark.asyncio
+    async def test_fetch_repository_reuses_cached_blobs(self, service):
+        tree = [
+            {"path": "a.py", "type": "blob", "sha": "blob-a", "size": 10},
+            {"path": "b.py", "type": "blob", "sha": "blob-b", "size": 10},
+        ]
+        blob_cache = {"blob-a": "import b"}
+
+        with (
+            patch.object(
+                service,
+                "_get_repository_tree",
+                new_callable=AsyncMock,
+                return_value=tree,
+            ),
+            patch.object(
+                service,
+                "_fetch_file_content",
+                new_callable=AsyncMock,
+                return_value="x = 1",
+            ) as mock_content,
+        ):
+            result = await service.fetch_repository(
+                "https://github.com/owner/repo", ref="abc123", blob_cache=blob_cache
+            )
+            again = await service.fetch_repository(
+                "https://github.com/owner/repo", ref="def456", blob_cache=blob_cache
+            )
+
+        assert mock_content.await_count == 1
+        assert mock_content.await_args.args[3] == "b.py"
+        assert blob_cache == {"blob-a": "import b", "blob-b": "x = 1"}
+        for fetched in (result, again):
+            assert [(f.path, f.content) for f in fetched.files] == [
+                ("a.py", "import b"),
+                ("b.py", "x = 1"),
+            ]
+            assert fetched.failed_count == 0
+
     def test_skip_dirs_contains_common_dirs(self):
         expected_dirs = {
             "node_modules",
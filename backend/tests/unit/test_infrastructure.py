@@ -14,13 +14,12 @@ class TestProgressTracker:
         """Create tracker instance."""
         return ProgressTracker()
 
-    @pytest.mark.asyncio
-    async def test_emit_step_valid_index(self, tracker):
+    def test_emit_step_valid_index(self, tracker):
         """Emit step for valid index produces SSE event."""
-        result = await tracker.emit_step(0)
+        result = tracker.emit_step(0)
 
-        assert result.startswith("data: ")
-        assert result.endswith("\n\n")
+        assert result.startswith(b"data: ")
+        assert result.endswith(b"\n\n")
 
         # Parse the JSON data
         json_str = result[6:-2]  # Remove "data: " prefix and "\n\n" suffix
@@ -29,35 +28,42 @@ class TestProgressTracker:
         assert "progress" in data
         assert data["progress"] == 10
 
-    @pytest.mark.asyncio
-    async def test_emit_step_invalid_index(self, tracker):
-        """Emit step for invalid index returns empty string."""
-        result = await tracker.emit_step(100)
-        assert result == ""
+    def test_emit_step_reuses_prebuilt_frame(self, tracker):
+        """Step frames are serialized once and reused on every emit."""
+        first = tracker.emit_step(3)
+        second = tracker.emit_step(3)
 
-    @pytest.mark.asyncio
-    async def test_emit_step_negative_index(self, tracker):
-        """Emit step for negative index returns empty string."""
-        result = await tracker.emit_step(-1)
-        assert result == ""
+        assert first is second
+        assert json.loads(first[6:-2]) == {
+            "message": "Building dependency graph...",
+            "progress": 70,
+        }
 
-    @pytest.mark.asyncio
-    async def test_emit_result(self, tracker):
+    def test_emit_step_invalid_index(self, tracker):
+        """Emit step for invalid index returns an empty frame."""
+        result = tracker.emit_step(100)
+        assert result == b""
+
+    def test_emit_step_negative_index(self, tracker):
+        """Emit step for negative index returns an empty frame."""
+        result = tracker.emit_step(-1)
+        assert result == b""
+
+    def test_emit_result(self, tracker):
         """Emit result produces correct SSE event."""
         test_data = {"key": "value", "count": 42}
-        result = await tracker.emit_result(test_data)
+        result = tracker.emit_result(test_data)
 
-        assert result.startswith("data: ")
+        assert result.startswith(b"data: ")
         json_str = result[6:-2]
         data = json.loads(json_str)
 
         assert data["type"] == "result"
         assert data["data"] == test_data
 
-    @pytest.mark.asyncio
-    async def test_emit_error(self, tracker):
+    def test_emit_error(self, tracker):
         """Emit error produces correct SSE event."""
-        result = await tracker.emit_error("Something went wrong")
+        result = tracker.emit_error("Something went wrong")
 
         json_str = result[6:-2]
         data = json.loads(json_str)
@@ -65,13 +71,12 @@ class TestProgressTracker:
         assert data["type"] == "error"
         assert data["message"] == "Something went wrong"
 
-    @pytest.mark.asyncio
-    async def test_emit_error_response(self, tracker):
+    def test_emit_error_response(self, tracker):
         """Emit error response from ErrorResponse model."""
         error = ErrorResponse(
             error="BadRequest", detail="Validation failed", status_code=400
         )
-        result = await tracker.emit_error_response(error)
+        result = tracker.emit_error_response(error)
 
         json_str = result[6:-2]
         data = json.loads(json_str)
@@ -2,6 +2,7 @@ import pytest
 
 from app.core.models import FileInput, Language, NodeType
 from app.services.analysis.multi_language import MultiLanguageAnalyzer
+from app.services.parsers import ParserRegistry
 
 
 class TestMultiLanguageAnalyzer:
@@ -33,6 +34,16 @@ class TestMultiLanguageAnalyzer:
         assert "app.utils" in result.modules
         assert len(result.dependencies) > 0
 
+    def test_analyze_leaves_shared_parser_untouched(self, analyzer):
+        files = [
+            FileInput(path="app/main.py", content="from app.utils import helper"),
+            FileInput(path="app/utils.py", content="def helper():\n    return 42"),
+        ]
+
+        analyzer.analyze(files, "test_project")
+
+        assert ParserRegistry.get_parser(Language.PYTHON)._project_modules == set()
+
     def test_analyze_javascript_files(self, analyzer):
         files = [
             FileInput(
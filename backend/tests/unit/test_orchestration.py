@@ -15,8 +15,10 @@ from app.core.models import (
     GlobalMetrics,
     Node,
     Position3D,
+    TemporalAnalysisRequest,
 )
 from app.services.orchestration.fitness import FitnessOrchestratorService
+from app.services.orchestration.temporal import TemporalOrchestratorService
 
 
 class TestFitnessOrchestratorService:
@@ -288,3 +290,35 @@ class TestFitnessOrchestratorService:
         assert summary["pass_rate"] == 50.0
         assert summary["avg_errors"] == 1.0
         assert summary["avg_warnings"] == 0.5
+
+
+class TestTemporalOrchestratorService:
+    @pytest.mark.asyncio
+    async def test_start_temporal_analysis_yields_sse_frames(self):
+        events = [
+            {"type": "progress", "progress": 10, "message": "Cloning"},
+            {"type": "complete", "analysis_id": "abc"},
+        ]
+
+        async def fake_stream(**kwargs):
+            for event in events:
+                yield event
+
+        orchestrator = TemporalOrchestratorService()
+        request = TemporalAnalysisRequest(
+            repository_url="https://github.com/owner/repo"
+        )
+        with patch.object(
+            orchestrator.temporal_service,
+            "analyze_repository_history_streaming",
+            side_effect=fake_stream,
+        ):
+            frames = [
+                frame async for frame in orchestrator.start_temporal_analysis(request)
+            ]
+
+        assert all(isinstance(frame, bytes) for frame in frames)
+        assert all(
+            frame.startswith(b"data: ") and frame.endswith(b"\n\n") for frame in frames
+        )
+        assert [json.loads(frame[len(b"data: ") :]) for frame in frames] == events
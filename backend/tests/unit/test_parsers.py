@@ -1,5 +1,5 @@
 import pytest
-from pathlib import Path
+from pathlib import Path, PureWindowsPath
 
 from app.core.models import Language, NodeType
 from app.services.parsers.base import ParsedImport
@@ -257,6 +257,186 @@ fn private_func() { println!("private"); }
 
         assert func_names == {"add", "private_func"}
 
+    def test_parse_large_file_from_disk(self, rust_parser, tmp_path):
+        """Large files are memory-mapped and parse the same as in-memory source."""
+        code = "use std::io;\n" + "fn f() {}\n// padding\n" * 4000
+        path = tmp_path / "big.rs"
+        path.write_text(code)
+
+        assert path.stat().st_size >= 64 * 1024
+        assert rust_parser.parse_file(path) == rust_parser.parse_file(path, code)
+
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            (Path("src/net/client.rs"), "src::net::client"),
+            (Path("src/net/mod.rs"), "src::net"),
+            (Path("src/lib.rs"), "src"),
+            (PureWindowsPath("src\\net\\client.rs"), "src::net::client"),
+            (PureWindowsPath("src\\main.rs"), "src"),
+        ],
+        ids=["file", "mod_rs", "lib_rs", "windows_file", "windows_main_rs"],
+    )
+    def test_path_to_module_id(self, rust_parser, path, expected):
+        """Both separator styles map to '::' and crate roots name their directory."""
+        assert rust_parser._path_to_module_id(path) == expected
+
+    def test_member_nodes_built_lazily(self, rust_parser):
+        """Reading the module node does not build type or function nodes."""
+        import pickle
+
+        parsed = rust_parser.parse_file(Path("lib.rs"), "use std::io;\nfn f() {}")
+
+        assert parsed[0].imports[0].module == "std::io"
+        assert parsed._nodes is None
+        assert [n.name for n in parsed] == ["lib", "f"]
+        assert pickle.loads(pickle.dumps(parsed)) == parsed
+
+    def test_declaration_free_file_skips_tree_sitter(self, rust_parser):
+        """Files with no declaration keywords yield just the module node."""
+
+        def fail(_source):
+            raise AssertionError("tree-sitter should not run")
+
+        rust_parser.parse_source = fail
+        nodes = rust_parser.parse_file(
+            Path("gen.rs"), "// generated\n\nconst X: u8 = 1;\n"
+        )
+
+        assert [n.node_type for n in nodes] == [NodeType.MODULE]
+        assert nodes[0].end_line == 4
+
+    def test_keywords_inside_identifiers_skip_tree_sitter(self, rust_parser):
+        """Keyword substrings in identifiers and words do not force a parse."""
+
+        def fail(_source):
+            raise AssertionError("tree-sitter should not run")
+
+        rust_parser.parse_source = fail
+        nodes = rust_parser.parse_file(
+            Path("rates.rs"),
+            "// reused by the refund model\nconst DEFN_IMPL: u8 = 1;\n"
+            "static enumerated_traits: [u8; 0] = [];\n",
+        )
+
+        assert [n.node_type for n in nodes] == [NodeType.MODULE]
+
+    def test_declaration_keyword_runs_tree_sitter(self, rust_parser):
+        """A whole-token keyword still parses the file."""
+        nodes = rust_parser.parse_file(Path("lib.rs"), "const X: u8 = 1;\nfn f() {}\n")
+
+        assert [n.name for n in nodes] == ["lib", "f"]
+
+    def test_repeated_identifiers_share_one_string(self, rust_parser):
+        """Short node texts decoded from different sources are the same object."""
+        first = rust_parser.parse_file(Path("a.rs"), "struct Config;")
+        second = rust_parser.parse_file(Path("b.rs"), "fn f() {}\nstruct Config;")
+        (type_a,) = [n for n in first if n.node_type == NodeType.CLASS]
+        (type_b,) = [n for n in second if n.node_type == NodeType.CLASS]
+
+        assert type_a.name is type_b.name
+
+    def test_single_pass_matches_separate_queries(self, rust_parser):
+        """The combined query extracts exactly what the per-kind queries do."""
+        source = b"""
+use crate::a::B;
+mod inner;
+mod block { fn hidden() {} }
+struct S;
+trait T { fn t(&self); }
+impl T for S { fn t(&self) {} }
+fn free() {}
+"""
+        tree = rust_parser.parse_source(source)
+
+        assert rust_parser.extract_all(tree, source) == {
+            "imports": rust_parser.extract_imports(tree, source),
+            "classes": rust_parser.extract_classes(tree, source),
+            "functions": rust_parser.extract_functions(tree, source),
+            "end_line": tree.root_node.end_point[0] + 1,
+        }
+
+    def test_parse_files_preserves_order(self, rust_parser, tmp_path):
+        """Batch parsing returns one result per path in input order."""
+        paths = []
+        for i, body in enumerate(["fn a() {}", "struct B;" * 50, "trait C {}"]):
+            path = tmp_path / f"m{i}.rs"
+            path.write_text(body)
+            paths.append(path)
+
+        results = rust_parser.parse_files([(p, None) for p in paths], workers=2)
+
+        assert results == [rust_parser.parse_file(p) for p in paths]
+
+    def test_parse_files_return_exceptions(self, rust_parser, tmp_path):
+        """A failing file yields its exception without aborting the batch."""
+        files = [(tmp_path / "missing.rs", None), (Path("lib.rs"), "fn a() {}")]
+
+        with pytest.raises(FileNotFoundError):
+            rust_parser.parse_files(files, workers=2)
+
+        missing, parsed = rust_parser.parse_files(
+            files, workers=2, return_exceptions=True
+        )
+        assert isinstance(missing, FileNotFoundError)
+        assert parsed == rust_parser.parse_file(Path("lib.rs"), "fn a() {}")
+
+    def test_parse_cache_hit_skips_tree_sitter(self, rust_parser, tmp_path):
+        """Unchanged sources are served from the on-disk parse cache."""
+        code = """
+use std::io;
+trait Shape {}
+fn area() {}
+"""
+        rust_parser.set_parse_cache(tmp_path)
+        first = rust_parser.parse_file(Path("src/shape.rs"), code)
+
+        def fail(_source):
+            raise AssertionError("tree-sitter should not run on a cache hit")
+
+        rust_parser.parse_source = fail
+        second = rust_parser.parse_file(Path("src/shape.rs"), code)
+
+        assert second == first
+        assert any(n.node_type == NodeType.INTERFACE for n in second)
+
+    def test_parse_cache_version_mismatch_wipes(self, tmp_path):
+        """A grammar version change discards existing cache entries."""
+        from app.services.parsers.tree_sitter_base import ParseCache
+
+        cache = ParseCache(tmp_path, "rust", "1.0")
+        cache.store("ab" * 32, {"imports": []})
+
+        assert ParseCache(tmp_path, "rust", "1.0").load("ab" * 32) is not None
+        assert ParseCache(tmp_path, "rust", "2.0").load("ab" * 32) is None
+
+    def test_parse_cache_unusable_root_disables_cache(self, rust_parser, tmp_path):
+        """A cache root that is not a directory leaves parsing uncached."""
+        root = tmp_path / "not-a-dir"
+        root.write_text("")
+
+        rust_parser.set_parse_cache(root / "cache")
+
+        assert rust_parser._parse_cache is None
+        assert rust_parser.parse_file(Path("src/lib.rs"), "fn a() {}")
+
+    def test_parse_cache_round_trips_mixed_rows(self, tmp_path):
+        """Rows with different key sets survive the positional encoding."""
+        from app.services.parsers.tree_sitter_base import ParseCache
+
+        payload = {
+            "imports": [
+                {"type": "use", "path": "std::io", "line": 1, "is_relative": False},
+                {"module": "os", "names": ["path"], "level": 0},
+            ],
+            "classes": [],
+            "end_line": 3,
+        }
+        cache = ParseCache(tmp_path, "rust", "1.0")
+        cache.store("cd" * 32, payload)
+
+        assert cache.load("cd" * 32) == payload
+
 
 class TestRustImportResolver:
     """Tests for Rust import resolver."""
@@ -288,6 +468,43 @@ class TestRustImportResolver:
         """Test that crate name is loaded from Cargo.toml."""
         assert rust_resolver.crate_name == "my_crate"
 
+    def test_resolution_memoized(self, rust_resolver):
+        """Repeated use paths share a single resolution object."""
+        import_stmt = ParsedImport(module="self::utils", names=[], is_relative=True)
+
+        first = rust_resolver.resolve(import_stmt, Path("a.rs"))
+        second = rust_resolver.resolve(import_stmt, Path("b.rs"))
+
+        assert first is second
+        assert first.is_internal is True
+
+    def test_crate_name_malformed_cargo_toml(self, tmp_path):
+        """Unparseable Cargo.toml falls back to the line scanner."""
+        from app.services.parsers.rust import RustImportResolver
+
+        (tmp_path / "Cargo.toml").write_text(
+            '[package]\nname = "fallback_crate"\n[dependencies\n'
+        )
+
+        assert RustImportResolver(tmp_path).crate_name == "fallback_crate"
+
+    def test_parser_reuses_resolver_per_root(self, rust_parser, tmp_path):
+        """Alternating project roots reuse each root's resolver."""
+        roots = [tmp_path / "a", tmp_path / "b"]
+        for root in roots:
+            root.mkdir()
+            (root / "Cargo.toml").write_text(f'[package]\nname = "{root.name}"\n')
+        import_stmt = ParsedImport(module="crate::x", names=[], is_relative=True)
+
+        rust_parser.resolve_import(import_stmt, Path("lib.rs"), roots[0])
+        first = rust_parser._resolver
+        rust_parser.resolve_import(import_stmt, Path("lib.rs"), roots[1])
+        assert rust_parser._resolver.crate_name == "b"
+        rust_parser.resolve_import(import_stmt, Path("lib.rs"), roots[0])
+
+        assert rust_parser._resolver is first
+        assert first.crate_name == "a"
+
 
 # =============================================================================
 # JavaScript/TypeScript Parser Tests
@@ -455,6 +672,26 @@ async def fetch_data(url: str) -> dict:
         assert "add" in func_names
         assert "fetch_data" in func_names
 
+    def test_parse_file_from_disk(self, python_parser, tmp_path):
+        """Files are read from disk when no content is passed."""
+        source = tmp_path / "mod.py"
+        source.write_text("import json\n\nclass Loader:\n    pass\n")
+
+        nodes = python_parser.parse_file(source)
+
+        assert [imp.module for imp in nodes[0].imports] == ["json"]
+        assert any(n.name == "Loader" for n in nodes)
+
+    def test_queries_shared_across_instances(self, python_parser):
+        """Compiled queries are built once per parser class."""
+        from app.services.parsers.python import PythonParser
+
+        other = PythonParser()
+
+        assert other._import_query is python_parser._import_query
+        assert other._class_query is python_parser._class_query
+        assert other._function_query is python_parser._function_query
+
 
 class TestPythonImportResolver:
     """Tests for Python import resolver."""
@@ -478,6 +715,32 @@ class TestPythonImportResolver:
         assert result.is_stdlib == is_stdlib
         assert result.is_external == is_external
 
+    def test_resolutions_shared(self, python_resolver):
+        """Identical resolutions reuse one cached instance."""
+        import_stmt = ParsedImport(module="requests.api", names=[], is_relative=False)
+
+        first = python_resolver.resolve(import_stmt, Path("a.py"))
+        second = python_resolver.resolve(import_stmt, Path("b.py"))
+
+        assert first is second
+        assert first.package_name == "requests"
+
+    @pytest.mark.parametrize(
+        "module,expected",
+        [
+            ("os.path", True),
+            ("xml.etree.ElementTree", True),
+            ("", False),
+            ("myos.path", False),
+        ],
+        ids=["dotted", "deep", "empty", "prefix_lookalike"],
+    )
+    def test_is_stdlib_top_level(self, module, expected):
+        """Only the top-level package decides stdlib membership."""
+        from app.services.parsers.python.import_resolver import is_stdlib
+
+        assert is_stdlib(module) is expected
+
     def test_relative_import(self, tmp_path):
         """Test resolving relative imports."""
         from app.services.parsers.python import PythonImportResolver
@@ -494,3 +757,223 @@ class TestPythonImportResolver:
         )
 
         assert result.is_internal is True
+
+    @pytest.mark.parametrize(
+        "from_file,level,module,expected",
+        [
+            ("a/b/c/mod.py", 1, "x", "a.b.x"),
+            ("a/b/c/mod.py", 1, "", "a.b"),
+            ("a/mod.py", 1, "x", "x"),
+            ("a/b/c/mod.py", 2, "x", "a.x"),
+        ],
+        ids=["nested", "bare_dot", "top_level", "two_dots"],
+    )
+    def test_resolve_relative_levels(self, from_file, level, module, expected):
+        """Relative imports trim one directory per level."""
+        from app.services.parsers.python import PythonImportResolver
+
+        resolver = PythonImportResolver(Path("."))
+        import_stmt = ParsedImport(
+            module=module, names=[], is_relative=True, level=level
+        )
+
+        assert resolver._resolve_relative(import_stmt, Path(from_file)) == expected
+
+    def test_sibling_import_from_relative_root(self):
+        """Bare sibling imports resolve against enclosing packages."""
+        from app.services.parsers.python import PythonImportResolver
+
+        resolver = PythonImportResolver(
+            Path("."), project_modules={"app.core.models", "app.core.config"}
+        )
+
+        import_stmt = ParsedImport(module="core.models", names=[], is_relative=False)
+        result = resolver.resolve(import_stmt, Path("app/services/user.py"))
+
+        assert result.is_internal is True
+        assert result.resolved_path == "app.core.models"
+
+    @pytest.mark.parametrize(
+        "module,expected",
+        [
+            ("pkg", "pkg"),
+            ("pkg.sub.models.User", "pkg.sub.models"),
+            ("pkgx", None),
+        ],
+        ids=["package_of_modules", "longest_prefix", "lookalike_name"],
+    )
+    def test_find_internal_prefix_matching(self, module, expected):
+        """Package and prefix matches use the sorted module index."""
+        from app.services.parsers.python import PythonImportResolver
+
+        resolver = PythonImportResolver(
+            Path("."), project_modules={"pkg.sub", "pkg.sub.models", "pkg.util"}
+        )
+
+        assert resolver._find_internal(module, Path("main.py")) == expected
+
+    def test_find_internal_prefers_longest_package_prefix(self):
+        """The deepest project package that prefixes an import wins."""
+        from app.services.parsers.python import PythonImportResolver
+
+        resolver = PythonImportResolver(
+            Path("."), project_modules={"app", "app.core", "app.core.models"}
+        )
+        import_stmt = ParsedImport(module="app.core.models.User", is_relative=False)
+
+        assert resolver.resolve(import_stmt, Path("main.py")).resolved_path == (
+            "app.core.models"
+        )
+
+    def test_project_modules_cannot_go_stale(self):
+        """The module set is frozen; reassigning it refreshes the prefix index."""
+        from app.services.parsers.python import PythonImportResolver
+
+        modules = {"pkg.util"}
+        resolver = PythonImportResolver(Path("."), project_modules=modules)
+        modules.add("lib.models")
+
+        assert isinstance(resolver.project_modules, frozenset)
+        assert resolver._find_internal("lib", Path("main.py")) is None
+
+        resolver.project_modules = resolver.project_modules | {"lib.models"}
+        assert resolver._find_internal("lib", Path("main.py")) == "lib"
+
+    def test_file_outside_root_is_external(self, tmp_path):
+        """Files outside the project root skip the package walk."""
+        from app.services.parsers.python import PythonImportResolver
+
+        resolver = PythonImportResolver(
+            tmp_path / "project", project_modules={"pkg.models"}
+        )
+
+        import_stmt = ParsedImport(module="models", names=[], is_relative=False)
+        result = resolver.resolve(import_stmt, tmp_path / "other" / "pkg" / "a.py")
+
+        assert result.is_external is True
+
+
+# =============================================================================
+# Parse Cache Tests
+# =============================================================================
+
+
+class TestParseCacheAllLanguages:
+    """Every tree-sitter parser serves unchanged sources from the parse cache."""
+
+    @pytest.mark.parametrize(
+        "fixture,path,code",
+        [
+            (
+                "python_parser",
+                "pkg/mod.py",
+                "import os\nclass A:\n    def f(self): pass\n",
+            ),
+            (
+                "go_parser",
+                "main.go",
+                'package main\nimport "fmt"\ntype S interface {}\n',
+            ),
+            ("java_parser", "A.java", "import java.util.List;\ninterface A {}\n"),
+            (
+                "js_parser",
+                "useThing.js",
+                "import x from './x';\nexport function useThing() {}\n",
+            ),
+            (
+                "ts_parser",
+                "App.tsx",
+                "import React from 'react';\nexport default class App {}\n",
+            ),
+        ],
+        ids=["python", "go", "java", "javascript", "typescript"],
+    )
+    def test_cache_hit_matches_fresh_parse(
+        self, request, tmp_path, fixture, path, code
+    ):
+        """A cache hit rebuilds the same nodes without running tree-sitter."""
+        parser = request.getfixturevalue(fixture)
+        parser.set_parse_cache(tmp_path)
+        first = parser.parse_file(Path(path), code)
+
+        def fail(_source):
+            raise AssertionError("tree-sitter should not run on a cache hit")
+
+        parser.parse_source = fail
+        second = parser.parse_file(Path(path), code)
+
+        assert list(second) == list(first)
+        assert second[0].imports
+
+
+class TestParsedFileAllLanguages:
+    """Every parser returns a ParsedFile whose member nodes are built lazily."""
+
+    @pytest.mark.parametrize(
+        "fixture,path,code",
+        [
+            ("python_parser", "pkg/mod.py", "import os\nclass A: pass\n"),
+            ("go_parser", "main.go", 'package main\nimport "fmt"\nfunc F() {}\n'),
+            ("java_parser", "A.java", "import java.util.List;\nclass A {}\n"),
+            ("js_parser", "a.js", "import x from './x';\nfunction f() {}\n"),
+            ("ts_parser", "a.ts", "import x from './x';\nclass A {}\n"),
+            ("rust_parser", "lib.rs", "use std::io;\nfn f() {}\n"),
+        ],
+        ids=["python", "go", "java", "javascript", "typescript", "rust"],
+    )
+    def test_module_first_members_lazy(self, request, fixture, path, code):
+        """The module node carries the imports; members wait for iteration."""
+        from app.services.parsers import ParsedFile
+
+        parsed = request.getfixturevalue(fixture).parse_file(Path(path), code)
+
+        assert isinstance(parsed, ParsedFile)
+        assert parsed[0] is parsed.module
+        assert parsed.module.node_type == NodeType.MODULE
+        assert parsed.module.imports
+        assert parsed._nodes is None
+        assert len(parsed) == 2
+        with pytest.raises(TypeError):
+            hash(parsed)
+
+    @pytest.mark.parametrize(
+        "fixture,path,code",
+        [
+            ("python_parser", "pkg/mod.py", "import os\nclass A: pass\n"),
+            ("go_parser", "main.go", 'package main\nimport "fmt"\nfunc F() {}\n'),
+            ("java_parser", "A.java", "import java.util.List;\nclass A {}\n"),
+            ("js_parser", "useA.js", "import x from './x';\nexport function f() {}\n"),
+            ("rust_parser", "lib.rs", "use std::io;\nfn f() {}\n"),
+        ],
+        ids=["python", "go", "java", "javascript", "rust"],
+    )
+    def test_parse_module_skips_member_queries(
+        self, request, fixture, path, code, monkeypatch
+    ):
+        """parse_module matches parse_file's module node without member queries."""
+        parser = request.getfixturevalue(fixture)
+        expected = parser.parse_file(Path(path), code).module
+
+        def fail(*_args):
+            raise AssertionError("member queries should not run")
+
+        monkeypatch.setattr(parser, "extract_classes", fail)
+        monkeypatch.setattr(parser, "extract_functions", fail)
+        monkeypatch.setattr(parser, "extract_all", fail)
+
+        assert parser.parse_module(Path(path), code) == expected
+
+    def test_parse_module_uses_full_cache_entries(self, rust_parser, tmp_path):
+        """With the parse cache on, a module-only parse stores and reuses full results."""
+        rust_parser.set_parse_cache(tmp_path)
+        code = "use std::io;\nfn f() {}\n"
+        module = rust_parser.parse_module(Path("lib.rs"), code)
+
+        def fail(_source):
+            raise AssertionError("tree-sitter should not run on a cache hit")
+
+        rust_parser.parse_source = fail
+        parsed = rust_parser.parse_file(Path("lib.rs"), code)
+
+        assert parsed.module == module
+        assert [n.name for n in parsed] == ["lib", "f"]
@@ -1,7 +1,11 @@
 import cProfile
 import json
+import marshal
+import os
+import zlib
 
 import pytest
+from pydantic import ValidationError
 
 from app.core.models import (
     DependencyGraph,
@@ -13,6 +17,12 @@ from app.core.models import (
     Position3D,
     PriorityWeights,
 )
+from app.services.profiling import (
+    cprofile_parser,
+    performance_analyzer,
+    pyspy_parser,
+)
+from app.services.profiling.common import severity_for
 from app.services.profiling.cprofile_parser import CProfileParser
 from app.services.profiling.performance_analyzer import PerformanceAnalyzer
 from app.services.profiling.pyspy_parser import PySpyParser
@@ -56,6 +66,30 @@ class TestCProfileParser:
             assert isinstance(key, str)
             assert isinstance(value, ModulePerformance)
 
+    def test_parse_output_passes_validation(self, profile_file):
+        for module in CProfileParser(profile_file).parse().values():
+            validated = ModulePerformance.model_validate(module.model_dump())
+            assert validated.model_dump_json() == module.model_dump_json()
+
+    @pytest.mark.parametrize(
+        "row",
+        [
+            (1, 1, -0.5, 0.1, {}),  # negative tottime
+            (1, 1, 0.1, -0.5, {}),  # negative cumtime
+            (-1, 1, 0.1, 0.1, {}),  # negative primitive calls
+        ],
+    )
+    def test_crafted_dump_rejected(self, tmp_path, row):
+        profile_path = tmp_path / "crafted.prof"
+        stats = {
+            ("/p/app/a.py", 1, "run"): row,
+            ("/p/app/b.py", 1, "ok"): (1, 1, 1.0, 1.0, {}),
+        }
+        profile_path.write_bytes(marshal.dumps(stats))
+
+        with pytest.raises(ValidationError):
+            CProfileParser(profile_path).parse()
+
     def test_get_profiler_type(self, profile_file):
         parser = CProfileParser(profile_file)
         assert parser.get_profiler_type() == "cprofile"
@@ -68,19 +102,103 @@ class TestCProfileParser:
         parser = CProfileParser(profile_file)
         assert parser.get_total_samples() is None
 
+    def test_recursive_call_counts(self, tmp_path):
+        profile_path = tmp_path / "recursive.prof"
+
+        def countdown(n):
+            return n if n == 0 else countdown(n - 1)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        countdown(5)
+        profiler.disable()
+        profiler.dump_stats(str(profile_path))
+
+        result = CProfileParser(profile_path).parse()
+        profiles = [f for module in result.values() for f in module.functions]
+        (profile,) = [p for p in profiles if p.function_name == "countdown"]
+
+        assert profile.call_count == 6
+        assert profile.primitive_calls == 1
+
+    def test_same_name_in_different_files_kept(self, profile_file):
+        parser = CProfileParser(profile_file)
+        parser._raw_stats = {
+            ("/p/app/a.py", 1, "run"): (1, 1, 0.1, 0.1, {}),
+            ("/p/app/b.py", 1, "run"): (2, 2, 0.2, 0.2, {}),
+        }
+        parser.total_time = 0.3
+
+        result = parser.parse()
+
+        assert [m.functions[0].module for m in result.values()] == ["app.a", "app.b"]
+
+    def test_profile_cache_hit_skips_parsing(self, profile_file, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            cprofile_parser.settings, "parse_cache_dir", str(tmp_path / "cache")
+        )
+        expected = CProfileParser(profile_file).parse()
+        assert list((tmp_path / "cache" / "profile").rglob("*.jz"))
+
+        def fail(data):
+            raise AssertionError("cache hit should not unmarshal the dump")
+
+        monkeypatch.setattr(cprofile_parser.marshal, "loads", fail)
+        cached = CProfileParser(profile_file)
+
+        assert cached.parse() == expected
+        assert cached.get_total_execution_time() > 0
+
     @pytest.mark.parametrize(
-        "ncalls,expected",
+        "entry",
         [
-            ("1", (1, 1)),
-            ("10", (10, 10)),
-            ("6/1", (6, 1)),
-            ("100/5", (100, 5)),
+            b"not zlib",
+            zlib.compress(b"not json"),
+            zlib.compress(b"[]"),
+            zlib.compress(b'{"total_time": 1.0, "modules": {"m": {"renamed": 1}}}'),
         ],
-        ids=["single", "multi", "recursive_6_1", "recursive_100_5"],
     )
-    def test_parse_ncalls(self, ncalls, expected):
-        result = CProfileParser._parse_ncalls(ncalls)
-        assert result == expected
+    def test_profile_cache_bad_entry_is_a_miss(
+        self, profile_file, tmp_path, monkeypatch, entry
+    ):
+        monkeypatch.setattr(
+            cprofile_parser.settings, "parse_cache_dir", str(tmp_path / "cache")
+        )
+        expected = CProfileParser(profile_file).parse()
+        (cached_entry,) = (tmp_path / "cache" / "profile").rglob("*.jz")
+        cached_entry.write_bytes(entry)
+
+        assert CProfileParser(profile_file).parse() == expected
+
+    def test_profile_cache_wiped_when_format_changes(
+        self, profile_file, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            cprofile_parser.settings, "parse_cache_dir", str(tmp_path / "cache")
+        )
+        CProfileParser(profile_file).parse()
+        assert list((tmp_path / "cache" / "profile").rglob("*.jz"))
+
+        monkeypatch.setattr(
+            cprofile_parser,
+            "PROFILE_CACHE_FORMAT",
+            cprofile_parser.PROFILE_CACHE_FORMAT + 1,
+        )
+        parser = CProfileParser(profile_file)
+
+        assert parser._cached_result is None
+        assert not list((tmp_path / "cache" / "profile").rglob("*.jz"))
+
+    def test_profile_cache_evicts_least_recently_used(self, tmp_path):
+        cache = cprofile_parser.ProfileCache(tmp_path, max_entries=2)
+        for age, digest in enumerate(["a" * 40, "b" * 40]):
+            cache.store(digest, (1.0, {}))
+            os.utime(cache._entry(digest), ns=(age, age))
+
+        assert cache.load("a" * 40) is not None
+        cache.store("c" * 40, (1.0, {}))
+
+        assert sorted(p.stem[0] for p in cache.directory.glob("*.jz")) == ["a", "c"]
 
     def test_extract_module_from_filename_app(self, profile_file):
         parser = CProfileParser(profile_file)
@@ -101,6 +219,49 @@ class TestCProfileParser:
         result = parser._extract_module_from_filename("/some/random/path/file.py")
         assert result == "file"
 
+    def test_extract_module_from_filename_non_py_stem(self, profile_file):
+        parser = CProfileParser(profile_file)
+        result = parser._extract_module_from_filename("/p/app/ext/speedups.pyx")
+        assert result == "app.ext.speedups"
+
+    def test_aggregate_by_module(self, profile_file):
+        parser = CProfileParser(profile_file)
+        parser._raw_stats = {
+            ("a.py", 1, "f"): (3, 3, 1.5, 1.5, {}),
+            ("b.py", 1, "f"): (1, 1, 0.05, 0.05, {}),
+            ("a.py", 9, "g"): (2, 2, 1.0, 1.0, {}),
+            ("~", 0, "<built-in method len>"): (4, 4, 0.5, 0.5, {}),
+        }
+        parser.total_time = 10.0
+
+        result = parser.parse()
+
+        assert list(result) == ["a.py", "b.py"]
+        assert result["a.py"].total_execution_time == pytest.approx(2.5)
+        assert result["a.py"].total_calls == 5
+        assert result["a.py"].unique_functions == 2
+        assert [f.lineno for f in result["a.py"].functions] == [1, 9]
+        assert result["a.py"].performance_severity == "critical"
+        assert result["a.py"].is_cpu_bottleneck
+        assert result["b.py"].performance_severity == "normal"
+        assert parser.significant_modules == ["a.py", "b.py"]
+
+    @pytest.mark.parametrize(
+        "time_percentage,expected",
+        [
+            (0.0, "normal"),
+            (0.99, "normal"),
+            (1.0, "low"),
+            (5.0, "medium"),
+            (10.0, "high"),
+            (19.99, "high"),
+            (20.0, "critical"),
+            (100.0, "critical"),
+        ],
+    )
+    def test_severity_thresholds(self, time_percentage, expected):
+        assert severity_for(time_percentage) == expected
+
 
 class TestPySpyParser:
     @pytest.fixture
@@ -152,6 +313,19 @@ class TestPySpyParser:
         assert parser.total_time == 0
         assert parser.total_samples == 0
 
+    @pytest.mark.parametrize(
+        "weights,expected",
+        [([5, 6], [5, 6, 0, 0]), ([1, 2, 3, 4, 5, 6], [1, 2, 3, 4])],
+    )
+    def test_init_aligns_weights_with_samples(self, speedscope_file, weights, expected):
+        data = json.loads(speedscope_file.read_text())
+        data["profiles"][0]["weights"] = weights
+        speedscope_file.write_text(json.dumps(data))
+
+        parser = PySpyParser(speedscope_file)
+
+        assert parser.weights == expected
+
     def test_parse_returns_dict(self, speedscope_file):
         parser = PySpyParser(speedscope_file)
         result = parser.parse()
@@ -168,6 +342,27 @@ class TestPySpyParser:
         for module_path in result.keys():
             assert module_path.endswith(".py")
 
+    def test_parse_output_passes_validation(self, speedscope_file):
+        for module in PySpyParser(speedscope_file).parse().values():
+            validated = ModulePerformance.model_validate(module.model_dump())
+            assert validated.model_dump_json() == module.model_dump_json()
+
+    @pytest.mark.parametrize(
+        "line,weights",
+        [
+            (-3, [100, 200, 300, 400]),  # negative line number
+            (10, [1000, 2000, 3000, 4000]),  # weights exceed endValue - startValue
+        ],
+    )
+    def test_crafted_profile_rejected(self, speedscope_file, line, weights):
+        data = json.loads(speedscope_file.read_text())
+        data["shared"]["frames"][0]["line"] = line
+        data["profiles"][0]["weights"] = weights
+        speedscope_file.write_text(json.dumps(data))
+
+        with pytest.raises(ValidationError):
+            PySpyParser(speedscope_file).parse()
+
     def test_get_profiler_type(self, speedscope_file):
         parser = PySpyParser(speedscope_file)
         assert parser.get_profiler_type() == "pyspy"
@@ -185,6 +380,38 @@ class TestPySpyParser:
         result = parser._extract_module_from_filename("/app/services/metrics.py")
         assert result == "app.services.metrics"
 
+    def test_extract_module_prefers_app_root(self, speedscope_file):
+        parser = PySpyParser(speedscope_file)
+        result = parser._extract_module_from_filename(
+            "/usr/lib/python3/site/app/services/metrics.py"
+        )
+        assert result == "app.services.metrics"
+
+    def test_frame_times_from_samples(self, speedscope_file):
+        parser = PySpyParser(speedscope_file)
+        profiles = {
+            f.function_name: f
+            for module in parser.parse().values()
+            for f in module.functions
+        }
+
+        assert list(profiles) == ["main", "helper", "external"]
+        assert profiles["main"].total_time == 600
+        assert profiles["main"].self_time == 500
+        assert profiles["main"].call_count == 3
+        assert profiles["helper"].total_time == 400
+        assert profiles["helper"].self_time == 100
+
+    def test_frame_times_in_parallel_slices(self, speedscope_file, monkeypatch):
+        serial = PySpyParser(speedscope_file)._aggregate_frames()
+        monkeypatch.setattr(pyspy_parser, "_PARALLEL_MIN_ENTRIES", 2)
+        monkeypatch.setattr(pyspy_parser.os, "cpu_count", lambda: 4)
+
+        parallel = PySpyParser(speedscope_file)._aggregate_frames()
+
+        for expected, actual in zip(serial, parallel):
+            assert actual.tolist() == expected.tolist()
+
 
 class TestPerformanceAnalyzer:
     @pytest.fixture
@@ -298,6 +525,22 @@ class TestPerformanceAnalyzer:
             ],
         )
 
+    def test_find_matching_node_by_file_name(self, sample_dependency_graph):
+        first, second = sample_dependency_graph.nodes
+        first.id = "pkg/a/util.py"
+        second.id = "pkg/b/util.py"
+
+        analyzer = PerformanceAnalyzer(
+            module_performance={},
+            dependency_graph=sample_dependency_graph,
+            profiler_type="cprofile",
+            total_execution_time=1.0,
+        )
+
+        assert analyzer._find_matching_node("pkg/b/util.py") is second
+        assert analyzer._find_matching_node("/abs/other/util.py") is first
+        assert analyzer._find_matching_node("/abs/other/main.py") is None
+
     def test_analyze_returns_result(
         self, sample_module_performance, sample_dependency_graph
     ):
@@ -374,6 +617,68 @@ class TestPerformanceAnalyzer:
 
         assert result.weights_used == weights
 
+    def test_priority_scores_with_zero_factors(
+        self, sample_module_performance, sample_dependency_graph
+    ):
+        for perf in sample_module_performance.values():
+            perf.total_execution_time = 0.0
+            perf.total_calls = 0
+            perf.total_memory_mb = None
+
+        analyzer = PerformanceAnalyzer(
+            module_performance=sample_module_performance,
+            dependency_graph=sample_dependency_graph,
+            profiler_type="cprofile",
+            total_execution_time=20.0,
+        )
+
+        result = analyzer.analyze()
+
+        assert result.bottlenecks
+        for bottleneck in result.bottlenecks:
+            assert 0 <= bottleneck.priority_score <= 100
+
+    def test_priority_score_normalizes_by_column_max(self, sample_dependency_graph):
+        perf = {
+            "/nowhere.py": ModulePerformance(
+                module_path="/nowhere.py",
+                total_execution_time=2.0,
+                self_execution_time=2.0,
+                time_percentage=10.0,
+                total_calls=3,
+                unique_functions=1,
+                total_memory_mb=12.0,
+            )
+        }
+
+        analyzer = PerformanceAnalyzer(
+            module_performance=perf,
+            dependency_graph=sample_dependency_graph,
+            profiler_type="cprofile",
+            total_execution_time=20.0,
+        )
+
+        (bottleneck,) = analyzer.analyze().bottlenecks
+
+        # No graph node: coupling and complexity are 0, the rest are their max
+        assert bottleneck.priority_score == pytest.approx((0.40 + 0.10 + 0.05) * 100)
+
+    def test_analyze_only_significant_modules(
+        self, sample_module_performance, sample_dependency_graph
+    ):
+        analyzer = PerformanceAnalyzer(
+            module_performance=sample_module_performance,
+            dependency_graph=sample_dependency_graph,
+            profiler_type="cprofile",
+            total_execution_time=20.0,
+            significant_modules=["/app/utils/helper.py"],
+        )
+
+        result = analyzer.analyze()
+
+        assert [b.module_path for b in result.bottlenecks] == ["/app/utils/helper.py"]
+        assert result.total_modules_profiled == len(sample_module_performance)
+
     def test_analyze_empty_performance(self, sample_dependency_graph):
         analyzer = PerformanceAnalyzer(
             module_performance={},
@@ -401,6 +706,33 @@ class TestPerformanceAnalyzer:
         for bottleneck in result.bottlenecks:
             assert bottleneck.recommendation != ""
 
+    @pytest.mark.parametrize(
+        "key,expected",
+        [
+            (
+                ("cpu", True, True, False, False, False),
+                (
+                    "Optimize CPU-intensive operations; "
+                    "Consider caching or algorithmic improvements; "
+                    "Break circular dependency first"
+                ),
+            ),
+            (
+                ("memory", True, False, True, False, False),
+                (
+                    "Reduce memory allocations; "
+                    "High coupling - refactor to reduce dependencies"
+                ),
+            ),
+            (
+                ("combined", False, False, False, False, False),
+                "Profile deeper to identify specific hotspots",
+            ),
+        ],
+    )
+    def test_recommendation_table(self, key, expected):
+        assert performance_analyzer._RECOMMENDATIONS[key] == expected
+
     @pytest.mark.parametrize(
         "time_pct,expected_impact",
         [
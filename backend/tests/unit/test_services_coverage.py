@@ -3,6 +3,7 @@ import pytest
 from jinja2 import Environment, FileSystemLoader
 
 import app.services.export.documentation as doc_module
+import app.services.fitness.refactoring as refactoring_module
 from app.core.models import (
     ComplexityMetrics,
     DependencyAnalysis,
@@ -412,6 +413,19 @@ class TestDocumentationService:
         assert "## Circular Dependencies" in md
         assert "## Third-Party Library Usage" in md
 
+    def test_generate_markdown_adjacency_sections(self, doc_graph, doc_metrics):
+        """Import counts, mutual dependencies and library usage come from edges."""
+        doc_graph.add_edge("app.utils", "app.main")
+        doc_graph.nodes["app.main"]["metrics"]["is_circular"] = True
+
+        service = DocumentationService(doc_graph, doc_metrics, "TestProject")
+        md = service.generate_markdown()
+
+        assert "| `app.main` | 2 | 1 | 2 |" in md
+        assert "| `requests` | 0 | 1 | 0 |" in md
+        assert "- `app.main`\n  - `app.utils` (mutual dependency)" in md
+        assert "| `requests` | `app.main` | 1 |" in md
+
     def test_generate_html(self, doc_graph, doc_metrics, tmp_path):
         """Generate HTML documentation."""
         # Create minimal template for testing
@@ -482,6 +496,29 @@ class TestRefactoringService:
         patterns = [s.pattern for s in suggestions]
         assert "God Object" in patterns
 
+    def test_god_object_skips_dependencies_without_module(self):
+        """Dependencies with a missing or empty module are left out of details."""
+        graph = nx.DiGraph()
+        graph.add_node("god", type="internal", module="app")
+        graph.add_node("named", type="internal", module="pkg")
+        graph.add_edge("god", "named")
+        for i in range(15):
+            dep = f"dep{i}"
+            if i % 2:
+                graph.add_node(dep, type="internal", module="")
+            else:
+                graph.add_node(dep, type="third_party")
+            graph.add_edge("god", dep)
+
+        service = RefactoringService(graph)
+        (god,) = [
+            s
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "God Object"
+        ]
+
+        assert god.details.endswith("Affected modules: pkg")
+
     def test_detect_inappropriate_intimacy(self):
         """Detect bidirectional dependencies."""
         graph = nx.DiGraph()
@@ -496,6 +533,88 @@ class TestRefactoringService:
         patterns = [s.pattern for s in suggestions]
         assert "Inappropriate Intimacy" in patterns
 
+    def test_inappropriate_intimacy_reported_once_per_pair(self):
+        """Each bidirectional pair yields one suggestion from the first node."""
+        graph = nx.DiGraph()
+        graph.add_node("a", type="internal", module="app")
+        graph.add_node("b", type="internal", module="app")
+        graph.add_node("ext", type="third_party")
+        graph.add_edge("a", "b", imports=["x", "y"])
+        graph.add_edge("b", "a", imports=["z"])
+        graph.add_edge("b", "ext")
+        graph.add_edge("ext", "b")
+
+        service = RefactoringService(graph)
+        intimacy = [
+            s
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "Inappropriate Intimacy"
+        ]
+
+        assert [(s.module, s.metrics.coupled_module) for s in intimacy] == [
+            ("a", "b"),
+            ("b", "ext"),
+        ]
+        assert intimacy[0].metrics.forward_imports == 2
+        assert intimacy[0].metrics.backward_imports == 1
+
+    def test_suggestion_details_serialized(self):
+        """Details are plain strings carried in every serialized suggestion."""
+        graph = nx.DiGraph()
+        graph.add_node("a", type="internal", module="app")
+        graph.add_node("b", type="internal", module="app")
+        graph.add_edge("a", "b", imports=["x"])
+        graph.add_edge("b", "a", imports=["y", "z"])
+
+        service = RefactoringService(graph)
+        dumped = [s.model_dump() for s in service.analyze_refactoring_opportunities()]
+
+        assert dumped
+        assert all(isinstance(d["details"], str) for d in dumped)
+        assert "Backward imports: 2" in dumped[0]["details"]
+
+    def test_feature_envy_even_split_reports_both_modules(self):
+        """A 50/50 split between two modules flags both, in first-seen order."""
+        graph = nx.DiGraph()
+        graph.add_node("src", type="internal", module="app")
+        for i in range(5):
+            graph.add_node(f"x{i}", type="internal", module="pkg_x")
+            graph.add_node(f"y{i}", type="internal", module="pkg_y")
+            graph.add_edge("src", f"x{i}")
+            graph.add_edge("src", f"y{i}")
+
+        service = RefactoringService(graph)
+        envy = [
+            s
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "Feature Envy"
+        ]
+
+        assert [s.metrics.target_module for s in envy] == ["pkg_x", "pkg_y"]
+        assert all(s.metrics.dependency_ratio == 0.5 for s in envy)
+
+    @pytest.mark.parametrize("others", [0, 4])
+    def test_feature_envy_small_fan_out(self, others):
+        """Five dependencies on one module are enough, even with < 10 total."""
+        graph = nx.DiGraph()
+        graph.add_node("src", type="internal", module="app")
+        for i in range(5):
+            graph.add_node(f"x{i}", type="internal", module="pkg_x")
+            graph.add_edge("src", f"x{i}")
+        for i in range(others):
+            graph.add_node(f"o{i}", type="internal", module=f"other{i}")
+            graph.add_edge("src", f"o{i}")
+
+        service = RefactoringService(graph)
+        (envy,) = [
+            s
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "Feature Envy"
+        ]
+
+        assert envy.metrics.target_module == "pkg_x"
+        assert envy.metrics.total_dependencies == 5 + others
+
     def test_detect_circular_dependency(self):
         """Detect circular dependency pattern."""
         graph = nx.DiGraph()
@@ -511,6 +630,77 @@ class TestRefactoringService:
         patterns = [s.pattern for s in suggestions]
         assert "Circular Dependency" in patterns
 
+    def test_circular_dependency_per_component(self):
+        """Cycles in separate components are each reported; cycles through
+        third-party nodes are not."""
+        graph = nx.DiGraph()
+        for node in ["a", "b", "c", "d", "e"]:
+            graph.add_node(node, type="internal", module="app")
+        graph.add_node("ext", type="third_party")
+        graph.add_edges_from([("a", "b"), ("b", "a"), ("c", "d"), ("d", "c")])
+        graph.add_edges_from([("b", "c"), ("e", "ext"), ("ext", "e")])
+
+        service = RefactoringService(graph)
+        cycles = [
+            sorted(s.metrics.modules_in_cycle)
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "Circular Dependency"
+        ]
+
+        assert sorted(cycles) == [["a", "b"], ["c", "d"]]
+
+    def test_circular_dependency_skips_long_cycles(self):
+        """Cycles longer than five modules are not reported."""
+        graph = nx.DiGraph()
+        ring = [f"r{i}" for i in range(6)]
+        for node in ring + ["a", "b", "c"]:
+            graph.add_node(node, type="internal", module="app")
+        nx.add_cycle(graph, ring)
+        nx.add_cycle(graph, ["a", "b", "c"])
+
+        service = RefactoringService(graph)
+        cycles = [
+            s.metrics.cycle_length
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "Circular Dependency"
+        ]
+
+        assert cycles == [3]
+
+    def test_circular_dependency_suggestions_capped(self):
+        """Only a bounded number of cycles is turned into suggestions."""
+        graph = nx.DiGraph()
+        for i in range(60):
+            graph.add_node(f"a{i}", type="internal", module="app")
+            graph.add_node(f"b{i}", type="internal", module="app")
+            nx.add_cycle(graph, [f"a{i}", f"b{i}"])
+
+        service = RefactoringService(graph)
+        cycles = [
+            s
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "Circular Dependency"
+        ]
+
+        assert len(cycles) == refactoring_module._MAX_CYCLE_SUGGESTIONS
+
+    def test_acyclic_graph_skips_cycle_enumeration(self, monkeypatch):
+        """An acyclic graph is never split into components."""
+
+        def fail(graph):
+            raise AssertionError("cycle enumeration should be skipped")
+
+        monkeypatch.setattr(nx, "strongly_connected_components", fail)
+        graph = nx.DiGraph()
+        for node in ["a", "b", "c"]:
+            graph.add_node(node, type="internal", module="app")
+        graph.add_edges_from([("a", "b"), ("b", "c"), ("a", "c")])
+
+        service = RefactoringService(graph)
+        suggestions = service.analyze_refactoring_opportunities()
+
+        assert "Circular Dependency" not in [s.pattern for s in suggestions]
+
     def test_detect_hub_module(self):
         """Detect hub module pattern."""
         graph = nx.DiGraph()
@@ -541,6 +731,58 @@ class TestRefactoringService:
         patterns = [s.pattern for s in suggestions]
         assert "Potential Dead Code" in patterns
 
+    def test_detect_unstable_dependency(self):
+        """Stable module depending on a much less stable one is flagged."""
+        graph = nx.DiGraph()
+        for node in ["stable", "volatile", "a", "b", "c", "x", "y", "z"]:
+            graph.add_node(node, type="internal", module="app")
+        for importer in ["a", "b", "c"]:
+            graph.add_edge(importer, "stable")
+        graph.add_edge("stable", "volatile")
+        for dep in ["x", "y", "z"]:
+            graph.add_edge("volatile", dep)
+
+        service = RefactoringService(graph)
+        suggestions = service.analyze_refactoring_opportunities()
+
+        (unstable,) = [s for s in suggestions if s.pattern == "Unstable Dependency"]
+        assert unstable.module == "stable"
+        assert unstable.metrics.module_instability == 0.25
+        assert unstable.metrics.worst_dependency == "volatile"
+        assert unstable.metrics.worst_dependency_instability == 0.75
+
+    def test_unstable_dependency_reports_first_worst_violation(self):
+        """Worst violation is the first most unstable dependency; all count."""
+        graph = nx.DiGraph()
+        for node in ["stable", "mid", "top1", "top2"]:
+            graph.add_node(node, type="internal", module="app")
+        graph.add_node("ext", type="third_party")
+        for i in range(6):
+            graph.add_node(f"imp{i}", type="internal", module="app")
+            graph.add_edge(f"imp{i}", "stable")
+        for dep in ["mid", "top1", "top2", "ext"]:
+            graph.add_edge("stable", dep)
+        # mid: I = 3/4; top1, top2: I = 4/5
+        for i in range(4):
+            graph.add_node(f"leaf{i}", type="internal", module="app")
+            graph.add_edge("top1", f"leaf{i}")
+            graph.add_edge("top2", f"leaf{i}")
+            if i < 3:
+                graph.add_edge("mid", f"leaf{i}")
+
+        service = RefactoringService(graph)
+        unstable = [
+            s
+            for s in service.analyze_refactoring_opportunities()
+            if s.pattern == "Unstable Dependency" and s.module == "stable"
+        ]
+
+        (suggestion,) = unstable
+        assert suggestion.metrics.module_instability == 0.4
+        assert suggestion.metrics.worst_dependency == "top1"
+        assert suggestion.metrics.worst_dependency_instability == 0.8
+        assert suggestion.metrics.violation_count == 3
+
     def test_get_summary_stats(self):
         """Get summary statistics."""
         graph = nx.DiGraph()
@@ -556,6 +798,60 @@ class TestRefactoringService:
         assert summary.total_suggestions >= 0
         assert "critical" in summary.by_severity
 
+    def test_summary_counts_by_severity_and_pattern(self):
+        """Counts cover every suggestion; unused severities are reported as 0."""
+        graph = nx.DiGraph()
+        for node in ["a", "b", "c"]:
+            graph.add_node(node, type="internal", module="app")
+        nx.add_cycle(graph, ["a", "b", "c"])
+
+        service = RefactoringService(graph)
+        summary = service.get_summary_stats()
+
+        assert summary.by_severity == {"critical": 1, "warning": 0, "info": 0}
+        assert summary.by_pattern == {"Circular Dependency": 1}
+        assert summary.total_suggestions == 1
+
+    def test_analysis_runs_once_per_service(self, monkeypatch):
+        """Summary stats reuse the suggestions computed by the first analysis."""
+        graph = nx.DiGraph()
+        graph.add_node("a", type="internal", module="app")
+        graph.add_node("b", type="internal", module="app")
+        graph.add_node("ext", type="third_party")
+        graph.add_edge("a", "b")
+        graph.add_edge("b", "a")
+
+        service = RefactoringService(graph)
+        suggestions = service.analyze_refactoring_opportunities()
+
+        def fail():
+            raise AssertionError("analysis re-ran")
+
+        monkeypatch.setattr(service, "_build_node_index", fail)
+        summary = service.get_summary_stats()
+        again = service.analyze_refactoring_opportunities()
+
+        assert again == suggestions
+        assert again is not suggestions
+        assert summary.total_suggestions == len(suggestions)
+        assert summary.modules_analyzed == 2
+
+    def test_cached_suggestions_unaffected_by_caller_mutation(self):
+        """Callers get their own list; the memoized result stays intact."""
+        graph = nx.DiGraph()
+        graph.add_node("a", type="internal", module="app")
+        graph.add_node("b", type="internal", module="app")
+        graph.add_edge("a", "b")
+        graph.add_edge("b", "a")
+
+        service = RefactoringService(graph)
+        first = service.analyze_refactoring_opportunities()
+        expected = list(first)
+        first.clear()
+
+        assert service.analyze_refactoring_opportunities() == expected
+        assert service.get_summary_stats().total_suggestions == len(expected)
+
     def test_no_suggestions_clean_graph(self):
         """Clean graph produces no/minimal suggestions."""
         graph = nx.DiGraph()
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import networkx as nx
 import pytest
 
+import app.services.infrastructure.session as session_module
 from app.core.models import (
     DiffEdge,
     DiffEdgeChange,
@@ -87,6 +88,53 @@ class TestSessionService:
 
         assert token is None
 
+    def test_get_expired_session(self, service, sample_user, sample_repos, monkeypatch):
+        created = service.create("token", sample_user, sample_repos)
+        clock = session_module.time.monotonic() + service._ttl
+        monkeypatch.setattr(session_module.time, "monotonic", lambda: clock)
+
+        assert service.get(created.session_id) is None
+        assert service.delete(created.session_id) is False
+
+    def test_create_evicts_oldest_when_full(
+        self, service, sample_user, sample_repos, monkeypatch
+    ):
+        monkeypatch.setattr(service, "_max_count", 2)
+        first = service.create("t1", sample_user, sample_repos)
+        second = service.create("t2", sample_user, sample_repos)
+        third = service.create("t3", sample_user, sample_repos)
+
+        assert service.get(first.session_id) is None
+        assert service.get_token(second.session_id) == "t2"
+        assert service.get_token(third.session_id) == "t3"
+
+    def test_create_drops_expired_before_evicting(
+        self, service, sample_user, sample_repos, monkeypatch
+    ):
+        monkeypatch.setattr(service, "_max_count", 2)
+        clock = [1000.0]
+        monkeypatch.setattr(session_module.time, "monotonic", lambda: clock[0])
+        stale = service.create("stale", sample_user, sample_repos)
+        clock[0] += service._ttl / 2
+        live = service.create("live", sample_user, sample_repos)
+        clock[0] += service._ttl / 2
+        new = service.create("new", sample_user, sample_repos)
+
+        assert service.get(stale.session_id) is None
+        assert service.get_token(live.session_id) == "live"
+        assert service.get_token(new.session_id) == "new"
+
+    def test_deleted_sessions_do_not_block_creation(
+        self, service, sample_user, sample_repos, monkeypatch
+    ):
+        monkeypatch.setattr(service, "_max_count", 2)
+        for _ in range(10):
+            service.delete(service.create("t", sample_user, sample_repos).session_id)
+        kept = service.create("kept", sample_user, sample_repos)
+
+        assert service.get_token(kept.session_id) == "kept"
+        assert len(service._expiry_heap) <= 5
+
 
 class TestSession:
     def test_session_dataclass(self):
@@ -1,17 +1,28 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from pydantic import ValidationError
 
 from app.core.models import (
     ChurnHeatmapData,
     CircularDependencyTimelineEvent,
+    FileInput,
+    NodeMetrics,
+    Position3D,
     TemporalAnalysisResponse,
     TemporalDependencyChange,
     TemporalSnapshotChanges,
     TemporalSnapshotData,
     TemporalSnapshotMetrics,
+    TemporalGraphEdge,
+    TemporalGraphNode,
     TemporalGraphSnapshot,
 )
+from app.services.analysis.analyzer import analyze_files_sync
 from app.services.temporal.service import TemporalAnalysisService
 
 
@@ -140,6 +151,47 @@ class TestTemporalAnalysisService:
         assert result.edge_count_delta == 1
         assert result.circular_count_delta == -1
 
+    def test_share_unchanged_graph(self, service):
+        def node(node_id, afferent=0):
+            return TemporalGraphNode(
+                id=node_id,
+                type="internal",
+                label=node_id,
+                module="app",
+                position=Position3D(x=0, y=0, z=0),
+                metrics=NodeMetrics(
+                    afferent_coupling=afferent, efferent_coupling=0, instability=0.0
+                ),
+            )
+
+        def edge(source, target, weight=1):
+            return TemporalGraphEdge(
+                source=source, target=target, imports=[], weight=weight
+            )
+
+        previous = TemporalGraphSnapshot(
+            nodes=[node("a"), node("b")], edges=[edge("a", "b")]
+        )
+        current = TemporalGraphSnapshot(
+            nodes=[node("a"), node("b", afferent=1), node("c")],
+            edges=[edge("a", "b"), edge("c", "b", weight=2)],
+        )
+        expected = current.model_dump()
+
+        service._share_unchanged_graph(previous, current)
+
+        assert current.model_dump() == expected
+        assert current.nodes[0] is previous.nodes[0]
+        assert current.nodes[1] is not previous.nodes[1]
+        assert current.edges[0] is previous.edges[0]
+
+        # Shared objects are frozen, so one snapshot cannot edit another's
+        with pytest.raises(ValidationError):
+            current.nodes[0].label = "renamed"
+        with pytest.raises(ValidationError):
+            current.edges[0].weight = 5
+        assert previous.nodes[0].label == "a"
+
     def test_calculate_churn_empty(self, service):
         result = service._calculate_churn([])
 
@@ -327,6 +379,184 @@ class TestTemporalAnalysisService:
                 progress_events = [e for e in events if e.get("type") == "progress"]
                 assert len(progress_events) > 0
 
+    @pytest.mark.asyncio
+    async def test_analyze_repository_history_streaming_concurrent_commits(
+        self, service, sample_snapshot
+    ):
+        commits = [
+            {
+                "sha": f"sha{i}",
+                "message": f"Commit {i}",
+                "author": "User",
+                "date": f"2024-01-{i + 1:02d}T00:00:00Z",
+            }
+            for i in range(6)
+        ]
+        in_flight = 0
+        peak = 0
+
+        async def analyze_commit(repo_url, commit, blob_cache):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            index = int(commit["sha"][3:])
+            # Later commits finish first
+            await asyncio.sleep(0.001 * (6 - index))
+            in_flight -= 1
+            return sample_snapshot.model_copy(
+                update={
+                    "commit_sha": commit["sha"],
+                    "node_count": index,
+                    "dependencies": {"a": [f"m{index}"]},
+                }
+            )
+
+        with (
+            patch.object(
+                service.github_service,
+                "fetch_commit_history",
+                new_callable=AsyncMock,
+                return_value=commits,
+            ),
+            patch.object(service, "_analyze_commit", side_effect=analyze_commit),
+        ):
+            events = [
+                event
+                async for event in service.analyze_repository_history_streaming(
+                    "https://github.com/test/repo"
+                )
+            ]
+
+        assert 1 < peak <= 4
+        assert [e["current"] for e in events if "current" in e] == [1, 2, 3, 4, 5, 6]
+        snapshots = events[-1]["data"]["snapshots"]
+        assert [s["commit_sha"] for s in snapshots] == [c["sha"] for c in commits]
+        assert snapshots[0]["changes"] is None
+        for index, snapshot in enumerate(snapshots[1:], start=1):
+            changes = snapshot["changes"]
+            assert changes["node_count_delta"] == 1
+            assert changes["modified_dependencies"] == [
+                {"node": "a", "added": [f"m{index}"], "removed": [f"m{index - 1}"]}
+            ]
+
+    @pytest.mark.asyncio
+    async def test_analyze_commit_builds_snapshot_off_event_loop(self, service):
+        files = [
+            FileInput(path="pkg/a.py", content="import pkg.b\n"),
+            FileInput(path="pkg/b.py", content="x = 1\n"),
+        ]
+        commit = {
+            "sha": "abc123",
+            "message": "Initial",
+            "author": "User",
+            "date": "2024-01-01T00:00:00Z",
+        }
+        threads = []
+
+        def analyze(files, project_name):
+            threads.append(threading.get_ident())
+            return analyze_files_sync(files, project_name)
+
+        with (
+            patch.object(
+                service.github_service,
+                "fetch_repository_at_commit",
+                new_callable=AsyncMock,
+                return_value=SimpleNamespace(files=files),
+            ),
+            patch(
+                "app.services.temporal.service.analyze_files_sync",
+                side_effect=analyze,
+            ),
+        ):
+            snapshot = await service._analyze_commit(
+                "https://github.com/owner/pkg", commit
+            )
+
+        assert threads and threads[0] != threading.get_ident()
+        assert snapshot.commit_sha == "abc123"
+        assert snapshot.dependencies == {"pkg.a": ["pkg.b"]}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_builds_run_one_at_a_time(self, service):
+        files = [FileInput(path="pkg/a.py", content="x = 1\n")]
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def analyze(files, project_name):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return analyze_files_sync(files, project_name)
+
+        commits = [
+            {"sha": f"sha{i}", "message": "m", "author": "User", "date": "2024-01-01"}
+            for i in range(4)
+        ]
+        with (
+            patch.object(
+                service.github_service,
+                "fetch_repository_at_commit",
+                new_callable=AsyncMock,
+                return_value=SimpleNamespace(files=files),
+            ),
+            patch(
+                "app.services.temporal.service.analyze_files_sync",
+                side_effect=analyze,
+            ),
+        ):
+            snapshots = await asyncio.gather(
+                *(
+                    service._analyze_commit("https://github.com/owner/pkg", commit)
+                    for commit in commits
+                )
+            )
+
+        assert peak == 1
+        assert [s.commit_sha for s in snapshots] == [c["sha"] for c in commits]
+
+    @pytest.mark.asyncio
+    async def test_analysis_id_is_stable_and_unambiguous(self, service):
+        async def analysis_id(repo_url, start_date):
+            events = [
+                event
+                async for event in service.analyze_repository_history_streaming(
+                    repo_url, start_date=start_date
+                )
+            ]
+            return events[-1]["data"]["analysis_id"]
+
+        commit = {
+            "sha": "abc123",
+            "message": "Initial",
+            "author": "User",
+            "date": "2024-01-01T00:00:00Z",
+        }
+        with (
+            patch.object(
+                service.github_service,
+                "fetch_commit_history",
+                new_callable=AsyncMock,
+                return_value=[commit],
+            ),
+            patch.object(
+                service, "_analyze_commit", new_callable=AsyncMock, return_value=None
+            ),
+        ):
+            first = await analysis_id("https://github.com/owner/repo_2024", "01")
+            again = await analysis_id("https://github.com/owner/repo_2024", "01")
+            shifted = await analysis_id("https://github.com/owner/repo", "2024_01")
+
+        assert first == again
+        assert first != shifted
+        assert len(first) == 32
+        assert service.get_cached_analysis(first) is not None
+
     def test_sample_commits_unknown_strategy_defaults_to_daily(self, service):
         commits = [
             {
@@ -1,5 +1,6 @@
 import networkx as nx
 import pytest
+from pathlib import Path
 
 from app.core.models import Language
 from app.services.analysis.complexity import ComplexityService
@@ -197,6 +198,21 @@ class TestParserRegistry:
         parser = ParserRegistry.get_parser(Language.PYTHON)
         assert parser.language == Language.PYTHON
 
+    def test_get_parser_cached_per_language(self):
+        """Repeated lookups reuse a single parser instance."""
+        first = ParserRegistry.get_parser(Language.PYTHON)
+        second = ParserRegistry.get_parser_for_file(Path("pkg/module.py"))
+
+        assert first is second
+
+    def test_create_parser_returns_fresh_instance(self):
+        """create_parser never hands out the shared instance."""
+        shared = ParserRegistry.get_parser(Language.PYTHON)
+        fresh = ParserRegistry.create_parser(Language.PYTHON)
+
+        assert fresh is not shared
+        assert fresh is not ParserRegistry.create_parser(Language.PYTHON)
+
     def test_get_parser_unregistered_raises(self):
         """Unregistered language raises ValueError."""
         # Temporarily remove a parser to test error handling
@@ -219,6 +235,23 @@ class TestParserRegistry:
         assert parser is not None
         assert parser.language == Language.PYTHON
 
+    @pytest.mark.parametrize(
+        "path,language",
+        [
+            ("src/App.TSX", Language.TYPESCRIPT),
+            ("types/index.d.ts", Language.TYPESCRIPT),
+            ("lib/main.rs", Language.RUST),
+            ("pkg.py/README", None),
+            ("src/.py", None),
+        ],
+        ids=["uppercase", "double_suffix", "rust", "dir_suffix", "dotfile"],
+    )
+    def test_get_parser_for_file_str_path(self, path, language):
+        """Plain string paths dispatch on the file name suffix."""
+        parser = ParserRegistry.get_parser_for_file(path)
+
+        assert (parser.language if parser else None) == language
+
     def test_get_parser_for_file_unknown_extension(self, tmp_path):
         """Unknown extension returns None."""
         txt_file = tmp_path / "test.txt"
@@ -264,6 +297,17 @@ class TestParserRegistry:
         assert Language.GO in languages
         assert Language.RUST in languages
 
+    def test_detect_languages_nested_and_skips_vendored(self, tmp_path):
+        """Nested sources are found; vendored directories are ignored."""
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "Main.java").touch()
+        (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+        (tmp_path / "node_modules" / "dep" / "index.js").touch()
+
+        languages = ParserRegistry.detect_languages(tmp_path)
+
+        assert languages == [Language.JAVA]
+
 
 # =============================================================================
 # Complexity Service Tests